@@ -0,0 +1,36 @@
+# engines.py
+import os
+import streamlit as st
+from libs.wsprops import get_engines
+from libs.wetairprops import calc_props
+from libs.calcdryairstate import calc_dryair_state
+from libs.memo import Memo, CachedProps, DiskCache, props_version
+
+# Файл кэша результатов на диске (сохраняется между перезапусками); пустая строка - кэш на диске не используется.
+# Результаты читаются из pickle, поэтому файл и его каталог не должны быть доступны для записи другим пользователям.
+# Записи прежних версий расчётных модулей не используются; удаление - DiskCache.clear(stale=True)
+PROPS_CACHE_PATH = os.environ.get("PROPS_CACHE_PATH", ".cache/props.sqlite3")
+
+
+@st.cache_resource
+def get_shared_engines():
+    """
+    Общий для всех сессий набор расчётных объектов воды и пара (создаётся и прогревается один раз за процесс).
+    Расчёт и чтение результатов выполнять под блокировкой engines.lock
+    """
+    engines = get_engines()
+    # Прогрев расчёта свойств влажного и сухого воздуха
+    calc_props(20., RH=0.5)
+    calc_dryair_state(20.)
+    return engines
+
+
+@st.cache_resource
+def get_cached_props():
+    """
+    Общий для всех сессий набор мемоизированных функций расчёта свойств (повторные расчёты одних и тех же
+    состояний берутся из кэша, в том числе из кэша на диске PROPS_CACHE_PATH, общего для процессов
+    и перезапусков приложения). Результаты неизменяемые (словари - MappingProxyType)
+    """
+    store = DiskCache(PROPS_CACHE_PATH, props_version()) if PROPS_CACHE_PATH else None
+    return CachedProps(get_shared_engines(), Memo(maxsize=4096, store=store))
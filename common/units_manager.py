@@ -1,90 +1,140 @@
 # units_manager.py
+import numpy as np
+
+
 class UnitManager:
-    """Централизованный менеджер единиц измерения для Streamlit приложения"""
-    
+    """
+    Централизованный менеджер единиц измерения для Streamlit приложения.
+    Каждая единица хранится в виде пары (scale, offset): значение_СИ = значение * scale + offset
+    """
+
     _instance = None
-    
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance._initialize_units()
         return cls._instance
-    
+
     def _initialize_units(self):
         """Инициализация всех единиц измерения"""
-        # Базовые определения
+        # Базовые определения: единица -> (scale, offset)
         self._base_units = {
             "pressure": {
-                "Па": lambda x: x,
-                "кПа": lambda x: x * 1000,
-                "МПа": lambda x: x * 1e6,
-                "бар": lambda x: x * 1e5,
-                "атм": lambda x: x * 101325,
-                "мм.рт.ст.": lambda x: x * 133.322,
-                "psi": lambda x: x * 6894.76,
+                "Па": (1., 0.),
+                "кПа": (1000., 0.),
+                "МПа": (1e6, 0.),
+                "бар": (1e5, 0.),
+                "атм": (101325., 0.),
+                "мм.рт.ст.": (133.322, 0.),
+                "psi": (6894.76, 0.),
             },
             "temperature": {
-                "°C": lambda x: x,
-                "K": lambda x: x - 273.15,
-                "°F": lambda x: (x - 32) * 5/9,
+                "°C": (1., 0.),
+                "K": (1., -273.15),
+                "°F": (5 / 9, -32 * 5 / 9),
             },
             "volume_flow": {
-                "м³/с": lambda x: x,
-                "л/с": lambda x: x * 0.001,
-                "м³/ч": lambda x: x / 3600,
-                "л/мин": lambda x: x * 0.001 / 60,
-                "л/ч": lambda x: x * 0.001 / 3600,
+                "м³/с": (1., 0.),
+                "л/с": (0.001, 0.),
+                "м³/ч": (1 / 3600, 0.),
+                "л/мин": (0.001 / 60, 0.),
+                "л/ч": (0.001 / 3600, 0.),
             },
             "mass_flow": {
-                "кг/с": lambda x: x,
-                "кг/ч": lambda x: x / 3600,
-                "т/ч": lambda x: x * 1000 / 3600,
+                "кг/с": (1., 0.),
+                "кг/ч": (1 / 3600, 0.),
+                "т/ч": (1000 / 3600, 0.),
             },
             "density": {
-                "кг/м³": lambda x: x,
-                "г/см³": lambda x: x * 1000,
-                "т/м³": lambda x: x * 1000,
+                "кг/м³": (1., 0.),
+                "г/см³": (1000., 0.),
+                "т/м³": (1000., 0.),
             },
             "length": {
-                "мм": lambda x: x * 0.001,
-                "см": lambda x: x * 0.01,
-                "м": lambda x: x,
-                "дюйм": lambda x: x * 0.0254,
-                "фут": lambda x: x * 0.3048,
+                "мм": (0.001, 0.),
+                "см": (0.01, 0.),
+                "м": (1., 0.),
+                "дюйм": (0.0254, 0.),
+                "фут": (0.3048, 0.),
             },
             "enthalpy": {
-                "кДж/кг": lambda x: x * 1000,
-                "Дж/кг": lambda x: x,
-                "ккал/кг": lambda x: x * 4186.8,
+                "кДж/кг": (1000., 0.),
+                "Дж/кг": (1., 0.),
+                "ккал/кг": (4186.8, 0.),
             },
             "percent": {
-                "%": lambda x: x / 100.,
-                "Доли": lambda x: x,
+                "%": (0.01, 0.),
+                "Доли": (1., 0.),
             },
             "mass_content": {
-                "г/кг": lambda x: x,
-                "г/г": lambda x: x * 1000,
-                "кг/кг": lambda x: x * 1000,
+                "г/кг": (1., 0.),
+                "г/г": (1000., 0.),
+                "кг/кг": (1000., 0.),
             },
         }
-        
+
         # Создаем объединенную категорию flow (объёмный и массовый расходы)
         self._base_units["flow"] = {**self._base_units["volume_flow"], **self._base_units["mass_flow"]}
-        
+
         # Кэш для быстрого доступа
         self._units_cache = {category: list(units.keys()) for category, units in self._base_units.items()}
         self._mass_flow_units = set(self._base_units["mass_flow"].keys())
-    
+
+        # Таблица прямого пересчёта единица -> единица: (категория, из, в) -> (scale, offset).
+        # Для объединённой категории flow пары строятся отдельно для объёмного и массового расходов:
+        # пересчёт между ними требует плотности
+        kinds = {category: [category] for category in self._base_units if category != "flow"}
+        kinds["flow"] = ["volume_flow", "mass_flow"]
+        self._conversion_table = {
+            (category, unit_from, unit_to): (scale_from / scale_to, (offset_from - offset_to) / scale_to)
+            for category, kind_list in kinds.items()
+            for kind in kind_list
+            for unit_from, (scale_from, offset_from) in self._base_units[kind].items()
+            for unit_to, (scale_to, offset_to) in self._base_units[kind].items()
+        }
+
     def get_units(self, category: str) -> list:
         """Получить список единиц измерения для категории"""
         return self._units_cache.get(category, [])
-    
-    def to_si(self, value: float, unit: str, category: str) -> float:
-        """Преобразовать значение в СИ"""
+
+    def get_affine(self, unit: str, category: str) -> tuple[float, float]:
+        """Получить пару (scale, offset) пересчёта единицы в СИ: значение_СИ = значение * scale + offset"""
         if category in self._base_units and unit in self._base_units[category]:
-            return self._base_units[category][unit](value)
+            return self._base_units[category][unit]
         raise ValueError(f"Неизвестная единица '{unit}' для категории '{category}'")
-    
+
+    def to_si(self, value, unit: str, category: str):
+        """Преобразовать значение (число или массив numpy) в СИ"""
+        scale, offset = self.get_affine(unit, category)
+        return self._affine(value, scale, offset)
+
+    def from_si(self, value, unit: str, category: str):
+        """Преобразовать значение (число или массив numpy) из СИ в заданную единицу"""
+        scale, offset = self.get_affine(unit, category)
+        if isinstance(value, (list, tuple)):
+            value = np.asarray(value, dtype=float)
+        return (value - offset) / scale
+
+    def convert(self, value, unit_from: str, unit_to: str, category: str):
+        """Преобразовать значение (число или массив numpy) из одной единицы в другую без промежуточного перевода в СИ"""
+        affine = self._conversion_table.get((category, unit_from, unit_to))
+        if affine is None:
+            for unit in (unit_from, unit_to):
+                self.get_affine(unit, category)
+            raise ValueError(f"Пересчёт '{unit_from}' в '{unit_to}' (объёмный и массовый расходы) "
+                             "невозможен без плотности")
+        return self._affine(value, *affine)
+
     def is_mass_flow(self, unit: str) -> bool:
         """Проверить, является ли единица измерения массовым расходом"""
-        return unit in self._mass_flow_units
\ No newline at end of file
+        return unit in self._mass_flow_units
+
+    @staticmethod
+    def _affine(value, scale: float, offset: float):
+        """Вычислить value * scale + offset (списки преобразуются в массивы numpy)"""
+        if isinstance(value, (list, tuple)):
+            value = np.asarray(value, dtype=float)
+        if offset == 0.:
+            return value * scale
+        return value * scale + offset
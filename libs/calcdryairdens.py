@@ -5,12 +5,11 @@
 температурах 70-1500 К и давлениях 0,1-100 МПа'
 """
 import numpy as np
-from scipy import optimize
 
 __author__ = "Sergey Medvedev"
 __copyright__ = "Sergey Medvedev, 2020"
 __license__ = "GPL"
-__version__ = "1.0"
+__version__ = "1.2"
 __maintainer__ = "Sergey Medvedev"
 __email__ = "engpython@yandex.ru"
 __status__ = "Production"
@@ -24,8 +23,42 @@ b = [np.array([0.366812, -0.252712, -0.284986e1, 0.360179e1, -0.318665e1, 0.1540
      np.array([-0.636588e-1, -0.105811, -0.345172e-1, 0.429817e-1, 0.631385e-2]),
      np.array([0.116375e-3, 0.361900e-1, -0.195095e-1, -0.379583e-2])]
 
+"""
+Отличие версии 1.1 от 1.0
+Коэффициенты b хранятся также в виде дополненной нулями матрицы B, коэффициент сжимаемости z(omega, tau)
+рассчитывается матричным произведением. Вместо optimize.root_scalar используется метод Ньютона по z,
+выполняемый сразу для всех точек. Добавлена функция calc_dryair_dens_arr, принимающая массивы numpy.
+
+Отличие версии 1.2 от 1.1
+Сходимость метода Ньютона проверяется для каждой точки: для точек, в которых за maxiter итераций
+коэффициент сжимаемости не определён с точностью xtol, calc_z возвращает NaN. В функцию
+calc_dryair_dens_arr добавлен параметр errors (как в модуле wetairprops): при errors='raise' (по умолчанию)
+для недопустимых значений и при отсутствии сходимости генерируется исключение, при errors='nan'
+возвращается NaN и код причины - константа ERR_*.
+"""
+
+"""Матрица коэффициентов b: строка i - множитель omega^(i+1), столбец j - множитель tau^(-j)"""
+B = np.zeros((len(b), max(bi.shape[0] for bi in b)))
+for i, bi in enumerate(b):
+    B[i, :bi.shape[0]] = bi
+
 """Газовая постоянная для сухого воздуха, Дж/кг/К"""
 R = 287.1
+"""Критические температура, К, и удельный объём, м3/кг"""
+T_cr = 132.5
+v_cr = 0.00316
+
+# Коды причин недопустимости значений (errors='nan')
+ERR_OK = 0  # значение рассчитано
+ERR_T = 1  # температура вне диапазона [-100; 1000] С
+ERR_P = 2  # давление вне диапазона [0,1; 20] МПа
+ERR_Z = 3  # метод Ньютона не сошёлся
+ERR_MESSAGES = {
+    ERR_T: 'Температура должна находиться в диапазоне t = [-100; 1000] С',
+    ERR_P: 'Давление должно находиться в диапазоне p = [0,1; 20] МПа',
+    ERR_Z: 'Не удалось определить коэффициент сжимаемости (метод Ньютона не сошёлся)',
+}
+
 
 def calc_dryair_dens(t, p=101325.):
     """
@@ -35,26 +68,97 @@ def calc_dryair_dens(t, p=101325.):
     """
     if not (-100 <= t <= 1000 and 0.1e6 <= p <= 20e6):
         raise ValueError('Параметры должны находиться в диапазонах t = [-100; 1000] С, p = [0,1; 20] МПа')
-    T = t + 273.15
+    dens, z = calc_dryair_dens_arr(t, p)
+    return float(dens), float(z)
+    #Если коэффициент сжимаемости не нужен, то можно его не возвращать
+    #return float(dens)
+
+
+def calc_dryair_dens_arr(t, p=101325., xtol=1e-12, maxiter=50, errors='raise'):
+    """
+    Определение плотности сухого воздуха сразу для массивов значений
+    :param t: температура, С (число или массив numpy)
+    :param p: абсолютное давление, Па (число или массив numpy). По умолчанию - нормальное атмосферное давление
+    :param xtol: допустимая погрешность определения коэффициента сжимаемости
+    :param maxiter: максимальное количество итераций метода Ньютона
+    :param errors: 'raise' - генерация исключения при недопустимых значениях и при отсутствии сходимости,
+                   'nan' - для таких точек возвращается NaN
+    :return: плотность, кг/м3; коэффициент сжимаемости (массивы numpy);
+             при errors='nan' также массив кодов причин ERR_*
+    """
+    t, p = (np.array(a, dtype=float) for a in np.broadcast_arrays(t, p))
+    reason = check_range(t, p, errors)
+    valid = reason == ERR_OK
+    T = np.where(valid, t, 20.) + 273.15
+    z, _, _ = calc_z(T, np.where(valid, p, 101325.), xtol, maxiter)
+    reason = set_not_converged(reason, z, errors)
+    z = np.where(reason == ERR_OK, z, np.nan)
+    dens = p / (z * R * T)
+    if errors == 'raise':
+        return dens, z
+    return dens, z, reason
+
 
+def check_range(t, p, errors, t_max=1000.):
+    """
+    Проверка диапазонов температуры и давления
+    :param t: температура, С (массив numpy)
+    :param p: абсолютное давление, Па (массив numpy той же формы)
+    :param errors: 'raise' - генерация исключения при недопустимых значениях, 'nan' - формирование кодов причин
+    :param t_max: верхняя граница температуры, С
+    :return: массив кодов причин ERR_*
+    """
+    if errors not in ('raise', 'nan'):
+        raise ValueError(f"Недопустимое значение параметра errors: {errors}")
+    bad_t = ~((-100 <= t) & (t <= t_max))
+    bad_p = ~((0.1e6 <= p) & (p <= 20e6))
+    if errors == 'raise' and (bad_t.any() or bad_p.any()):
+        raise ValueError(f'Параметры должны находиться в диапазонах t = [-100; {t_max:g}] С, p = [0,1; 20] МПа')
+    return np.where(bad_t, ERR_T, np.where(bad_p, ERR_P, ERR_OK)).astype(np.int8)
 
-    def calc_z(T, p, v):
-        T_cr = 132.5
-        v_cr = 0.00316
-        om = v_cr / v
-        tau = T / T_cr
-        z = 1.
-        for i in range(len(b)):
-            for j in range(b[i].shape[0]):
-                z += b[i][j] * om ** (i + 1) / tau ** j
-        return z
 
-    def f(z, p, T):
-        v = z * R * T / p
-        return z - calc_z(T, p, v)
+def set_not_converged(reason, z, errors):
+    """
+    Запись кода причины ERR_Z для точек, в которых метод Ньютона не сошёлся (z - NaN)
+    :param reason: массив кодов причин
+    :param z: коэффициент сжимаемости (результат calc_z)
+    :param errors: 'raise' - при наличии таких точек генерируется исключение, 'nan' - код записывается в reason
+    :return: массив кодов причин
+    """
+    bad = np.isnan(z) & (reason == ERR_OK)
+    if bad.any():
+        if errors == 'raise':
+            raise ValueError(ERR_MESSAGES[ERR_Z])
+        reason = np.where(bad, ERR_Z, reason).astype(np.int8)
+    return reason
 
-    sol = optimize.root_scalar(f, args=(p, T), bracket=[0.4, 1.9])
 
-    return 1 / (sol.root * R * T / p), sol.root
-    #Если коэффициент сжимаемости не нужен, то можно его не возвращать
-    #return 1 / (sol.root * R * T / p)
+def calc_z(T, p, xtol=1e-12, maxiter=50):
+    """
+    Определение коэффициента сжимаемости методом Ньютона сразу для массивов значений (без проверки диапазонов)
+    :param T: температура, К (массив numpy)
+    :param p: абсолютное давление, Па (массив numpy той же формы)
+    :param xtol: допустимая погрешность определения коэффициента сжимаемости
+    :param maxiter: максимальное количество итераций метода Ньютона
+    :return: коэффициент сжимаемости (NaN для точек, в которых за maxiter итераций изменение z
+             не стало меньше xtol); omega = v_cr / v; матрица степеней tau^(-j), j = 0...7 (последняя ось)
+    """
+    # z = 1 + sum(C_i * omega^i), C_i = sum(b_ij * tau^(-j)), omega = v_cr / v = k / z
+    tau_n = (T / T_cr)[..., None] ** -np.arange(B.shape[1])
+    C = tau_n @ B.T
+    n = np.arange(1, B.shape[0] + 1)
+    k = v_cr * p / (R * T)
+    z = np.ones_like(T)
+    converged = np.zeros(T.shape, dtype=bool)
+    for _ in range(maxiter):
+        om_n = (k / z)[..., None] ** n
+        g = z - 1 - (C * om_n).sum(axis=-1)  # невязка z - z(omega)
+        dg = 1 + (C * n * om_n).sum(axis=-1) / z  # производная невязки по z
+        z_new = np.clip(z - g / dg, 0.4, 1.9)
+        # Шаг, ограниченный границами [0,4; 1,9], не считается признаком сходимости
+        converged = np.abs(z_new - z) < xtol
+        z = z_new
+        if np.all(converged):
+            break
+    z = np.where(converged, z, np.nan)
+    return z, k / z, tau_n
@@ -0,0 +1,155 @@
+"""
+Определение состояния сухого воздуха для t = [-100; 1000] С,  p = [0,1; 20] МПа за один расчёт:
+плотность, коэффициент сжимаемости, динамическая и кинематическая вязкость, удельные энтальпия,
+энтропия и теплоёмкости.
+Коэффициент сжимаемости определяется один раз (calcdryairdens, СССД 8-79), по тем же степеням omega и tau
+рассчитываются отклонения энтальпии, энтропии и теплоёмкостей от идеального газа (функция Гельмгольца,
+соответствующая уравнению z(omega, tau) СССД 8-79) и вязкость (calcdryairvisc, ГСССД 109-87; t = [-100; 700] С).
+Теплоёмкость идеального газа cp0 рассчитывается не по полиному СССД 8-79, а по аддитивности для смеси N2, O2 и Ar
+(полиномы NASA для N2 и O2 из базы GRI-Mech 3.0, для Ar cp0 = 2.5 * R). Отклонение cp0 от табличных значений
+теплоёмкости воздуха в идеально-газовом состоянии не превышает 0.15% при T = [250; 1000] К
+(погрешность округления табличных значений - 0.05%).
+Начало отсчёта: h = 0 и s = 0 для идеального газа при t = 0 С и p = 101325 Па.
+Отличие версии 1.1 от 1.0: проверка диапазона температуры для вязкости (t = [-100; 700] С) выполняется
+в функции calc_dryair_state (параметр visc), добавлен параметр errors (как в модуле wetairprops).
+Теплоёмкость идеального газа рассчитывается по полиномам NASA вместо модели "жёсткий ротатор - гармонический
+осциллятор" (наибольшее отклонение от табличных значений уменьшено с 0.6% до 0.15%).
+"""
+from collections import namedtuple
+import numpy as np
+from .calcdryairdens import B, R, calc_z, check_range, set_not_converged, ERR_OK, ERR_T, ERR_P, ERR_Z
+from .calcdryairvisc import calc_visc_dens
+
+__author__ = "Sergey Medvedev"
+__copyright__ = "Sergey Medvedev, 2020"
+__license__ = "GPL"
+__version__ = "1.1"
+__maintainer__ = "Sergey Medvedev"
+__email__ = "engpython@yandex.ru"
+__status__ = "Production"
+
+"""
+Состояние сухого воздуха: t - температура, С; p - абсолютное давление, Па; dens - плотность, кг/м3;
+z - коэффициент сжимаемости; dvisc - динамическая вязкость, Па*с; kvisc - кинематическая вязкость, м2/с
+(при t > 700 С вязкость - NaN); h - удельная энтальпия, Дж/кг; s - удельная энтропия, Дж/кг/К;
+cp, cv - удельные изобарная и изохорная теплоёмкости, Дж/кг/К
+"""
+DryAirState = namedtuple('DryAirState', ['t', 'p', 'dens', 'z', 'dvisc', 'kvisc', 'h', 's', 'cp', 'cv'])
+
+"""Начало отсчёта энтальпии и энтропии: температура, К, и давление, Па"""
+T_0 = 273.15
+p_0 = 101325.
+"""Верхние границы применимости уравнения состояния и уравнения вязкости, С"""
+t_max = 1000.
+t_max_visc = 700.
+
+# Коды причин недопустимости значений (errors='nan'); ERR_OK, ERR_T, ERR_P, ERR_Z - см. calcdryairdens
+ERR_VISC = 4  # температура выше границы применимости уравнения вязкости (вязкость не рассчитана)
+ERR_MESSAGES = {
+    ERR_VISC: f'Для расчёта вязкости температура должна находиться в диапазоне t = [-100; {t_max_visc:g}] С',
+}
+
+"""
+Идеальный газ: мольные доли N2, O2, Ar; коэффициенты полиномов NASA cp0 / R = a1 + a2*T + a3*T^2 + a4*T^3 + a5*T^4
+для N2 и O2 (T = [200; 1000] К и T = [1000; 6000] К, GRI-Mech 3.0); T_mid - граница диапазонов, К
+"""
+x_ig = np.array([0.7809, 0.2095, 0.0093]) / 0.9997
+T_mid = 1000.
+a_ig = np.array([
+    [[3.53100528, -1.23660988e-4, -5.02999433e-7, 2.43530612e-9, -1.40881235e-12],  # N2, T < T_mid
+     [3.78245636, -2.99673416e-3, 9.84730201e-6, -9.68129509e-9, 3.24372837e-12]],  # O2, T < T_mid
+    [[2.95257637, 1.39690040e-3, -4.92631603e-7, 7.86010195e-11, -4.60755204e-15],  # N2, T >= T_mid
+     [3.28253784, 1.48308754e-3, -7.57966669e-7, 2.09470555e-10, -2.16717794e-14]],  # O2, T >= T_mid
+])
+"""Коэффициенты полиномов для смеси (Ar: cp0 / R = 2.5) - строки для T < T_mid и T >= T_mid"""
+a_mix = x_ig[:2] @ a_ig
+a_mix[:, 0] += 2.5 * x_ig[2]
+
+
+"""
+Множители членов b_ij * omega^(i+1) * tau^(-j) при расчёте отклонений от идеального газа
+(строка i, столбец j - см. calcdryairdens.B)
+"""
+_i = np.arange(1, B.shape[0] + 1)[:, None]
+_j = np.arange(B.shape[1])[None, :]
+B_s = B * (1 - _j) / _i  # -s_r / R
+B_u = B * _j / _i  # u_r / (R * T)
+B_cv = B * _j * (1 - _j) / _i  # cv_r / R
+B_T = B * _j  # -tau * dz/dtau
+B_om = B * _i  # omega * dz/domega
+
+
+def calc_dryair_state(t, p=101325., visc=True, errors='raise'):
+    """
+    :param t: температура, С (число или массив numpy)
+    :param p: абсолютное давление, Па (число или массив numpy). По умолчанию - нормальное атмосферное давление
+    :param visc: True - рассчитывается вязкость (t = [-100; 700] С), False - вязкость не рассчитывается
+                 (NaN), t = [-100; 1000] С
+    :param errors: 'raise' - генерация исключения при недопустимых значениях,
+                   'nan' - для недопустимых значений возвращается NaN (при t = (700; 1000] С и visc=True -
+                   только для вязкости)
+    :return: именованный кортеж DryAirState (для массивов - кортеж массивов);
+             при errors='nan' - кортеж (DryAirState, код причины ERR_*)
+    """
+    scalar = not (np.ndim(t) or np.ndim(p))
+    t, p = (np.array(a, dtype=float) for a in np.broadcast_arrays(t, p))
+    reason = check_range(t, p, errors, t_max_visc if visc and errors == 'raise' else t_max)
+    valid = reason == ERR_OK
+    # Недопустимые значения заменяются допустимыми, результаты для них - NaN
+    t_in, p_in = np.where(valid, t, 20.), np.where(valid, p, p_0)
+    T = t_in + 273.15
+    z, om, tau_n = calc_z(T, p_in)
+    reason = set_not_converged(reason, z, errors)
+    # Степени omega^(i+1) * tau^(-j), общие для всех рядов
+    om_tau = (om[..., None] ** np.arange(1, B.shape[0] + 1))[..., :, None] * tau_n[..., None, :]
+
+    def series(coef):
+        # sum(coef_ij * omega^(i+1) * tau^(-j))
+        return (om_tau * coef).sum(axis=(-2, -1))
+
+    dens = p_in / (z * R * T)
+    h_ig, s_ig, cp_ig = __calc_ideal_gas(T)
+    h = h_ig + R * T * (series(B_u) + z - 1)
+    s = s_ig - R * np.log(p_in / p_0) + R * (np.log(z) - series(B_s))
+    cv = cp_ig - R + R * series(B_cv)
+    cp = cv + R * (z - series(B_T)) ** 2 / (z + series(B_om))
+    in_visc = visc & (t_in <= t_max_visc)
+    dvisc = np.where(in_visc, calc_visc_dens(np.where(in_visc, T, T_0), dens), np.nan)
+    state = DryAirState(t=t, p=p, dens=dens, z=z, dvisc=dvisc, kvisc=dvisc / dens, h=h, s=s, cp=cp, cv=cv)
+    bad = reason != ERR_OK
+    state = state._replace(**{name: np.where(bad, np.nan, getattr(state, name)) for name in state._fields[2:]})
+    if visc:
+        reason = np.where(valid & ~in_visc, ERR_VISC, reason).astype(np.int8)
+    if scalar:
+        state = DryAirState(*(float(value) for value in state))
+        reason = int(reason)
+    if errors == 'raise':
+        return state
+    return state, reason
+
+
+def __calc_ideal_gas(T):
+    """
+    Энтальпия, энтропия (при p_0) и изобарная теплоёмкость идеального газа (полиномы NASA)
+    :param T: температура, К (массив numpy)
+    :return: h0, Дж/кг; s0, Дж/кг/К; cp0, Дж/кг/К
+    """
+    def integrals(a, T):
+        # cp0 / R, интеграл cp0 / R по T и интеграл cp0 / (R * T) по T (без постоянных)
+        k = np.arange(1, a.shape[-1])
+        T_k = T[..., None] ** k
+        cp = a[0] + T_k @ a[1:]
+        h = a[0] * T + T_k * T[..., None] @ (a[1:] / (k + 1))
+        s = a[0] * np.log(T) + T_k @ (a[1:] / k)
+        return cp, h, s
+
+    # Интегрирование от T_0 до T с переходом через границу диапазонов T_mid
+    low = T < T_mid
+    cp_lo, h_lo, s_lo = integrals(a_mix[0], np.minimum(T, T_mid))
+    _, h_lo_0, s_lo_0 = integrals(a_mix[0], np.array(T_0))
+    cp_hi, h_hi, s_hi = integrals(a_mix[1], np.maximum(T, T_mid))
+    _, h_hi_0, s_hi_0 = integrals(a_mix[1], np.array(T_mid))
+    cp = np.where(low, cp_lo, cp_hi)
+    h = h_lo - h_lo_0 + h_hi - h_hi_0
+    s = s_lo - s_lo_0 + s_hi - s_hi_0
+    return R * h, R * s, R * cp
@@ -10,7 +10,7 @@ from .calcdryairdens import calc_dryair_dens
 __author__ = "Sergey Medvedev"
 __copyright__ = "Sergey Medvedev, 2020"
 __license__ = "GPL"
-__version__ = "1.0"
+__version__ = "1.1"
 __maintainer__ = "Sergey Medvedev"
 __email__ = "engpython@yandex.ru"
 __status__ = "Production"
@@ -24,6 +24,12 @@ T_cr = 132.5
 """Газовая постоянная для сухого воздуха, Дж/кг/К"""
 R = 287.1
 
+"""
+Отличие версии 1.1 от 1.0
+Расчёт вязкости по температуре и плотности вынесен в функцию calc_visc_dens, принимающую массивы numpy
+(используется также модулем calcdryairstate)
+"""
+
 def calc_dryair_visc(t, p=101325.):
     """
     :param t: температура, С
@@ -33,12 +39,20 @@ def calc_dryair_visc(t, p=101325.):
     if not (-100 <= t <= 700 and 0.1e6 <= p <= 20e6):
         raise ValueError('Параметры должны находиться в диапазонах t = [-100; 700] С, p = [0,1; 20] МПа')
 
-    T = t + 273.15
     rho, _ = calc_dryair_dens(t, p)
-    om = rho / rho_cr
-    tau = T / T_cr
+    return float(calc_visc_dens(t + 273.15, rho)), rho
+
+
+def calc_visc_dens(T, rho):
+    """
+    Определение динамической вязкости по температуре и плотности (без проверки диапазонов)
+    :param T: температура, К (число или массив numpy)
+    :param rho: плотность, кг/м3 (число или массив numpy)
+    :return: динамическая вязкость, Па*с
+    """
+    om = np.asarray(rho, dtype=float)[..., None] / rho_cr
+    tau = np.asarray(T, dtype=float) / T_cr
     dv0 = -66.9619 / tau ** 1.5 + 322.119 / tau - 547.958 / tau ** 0.5 + 347.643 + \
           38.4042 * tau - 2.18923 * tau ** 1.5
-    ddv = np.sum(b * om ** r / tau ** tt)
-    dv = (dv0 + ddv) / 1e7
-    return dv, rho
+    ddv = np.sum(b * om ** r / tau[..., None] ** tt, axis=-1)
+    return (dv0 + ddv) / 1e7
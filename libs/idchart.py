@@ -0,0 +1,235 @@
+"""
+Построение I-d диаграммы влажного воздуха (диаграммы Молье):
+линии постоянных относительной влажности, температуры, температуры мокрого термометра,
+плотности и энтальпии в координатах d (влагосодержание, г/кг сух. возд.) - I (энтальпия, Дж/кг сух. возд.).
+Свойства рассчитываются функциями модуля wetairprops сразу для массивов точек.
+Точки линий выбираются адаптивно: отрезок параметра делится пополам, пока середина линии отклоняется
+от хорды более чем на 1/resolution размера диаграммы или пока не уточнена граница области построения
+(t в диапазоне t_range, d в диапазоне d_range, RH <= 100%).
+Диаграммы кэшируются для каждого набора входных параметров (давление, диапазоны, разрешение,
+значения изолиний), повторное построение не требует расчётов.
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+from math import ceil
+import numpy as np
+from .wetairprops import calc_d, calc_I, calc_I_d, calc_RH_d, calc_p_st_d, p_0, R, mu_st, mu_da, ERR_OK
+
+__author__ = "Сергей Медведев"
+__copyright__ = "Сергей Медведев, 2023"
+__license__ = "GPL"
+__version__ = "1.1"
+__maintainer__ = "Сергей Медведев"
+__email__ = "engpython@yandex.ru"
+__status__ = "Production"
+
+# Изолиния: value - значение параметра; d - влагосодержание, г/кг сух. возд.; I - энтальпия, Дж/кг сух. возд.
+# (массивы numpy только для чтения). Если линия выходит из области построения и возвращается в неё,
+# участки разделены точкой (NaN, NaN) - при построении графика линия в этом месте прерывается
+Isoline = namedtuple('Isoline', ['value', 'd', 'I'])
+# I-d диаграмма: p - давление, Па; t_range - диапазон температур, С; d_range - диапазон влагосодержаний, г/кг;
+# I_range - диапазон энтальпий, Дж/кг; resolution - разрешение;
+# RH, t, t_wb, dens, I - кортежи изолиний относительной влажности, температуры, температуры мокрого термометра,
+# плотности и энтальпии
+IdChart = namedtuple('IdChart', ['p', 't_range', 'd_range', 'I_range', 'resolution', 'RH', 't', 't_wb', 'dens', 'I'])
+
+__N_START = 17  # количество точек начального разбиения линии
+__MAX_DEPTH = 20  # максимальное количество делений отрезков пополам
+
+
+def calc_id_chart(p = p_0, t_range = (-20., 50.), d_range = (0., 30.), resolution = 500,
+                  RH_values = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.),
+                  t_step = 5., t_wb_step = 5., dens_step = 0.05, I_step = 10000.):
+    """
+    Построение I-d диаграммы влажного воздуха
+    p: давление влажного воздуха, Па (по умолчанию - нормальное атмосферное давление)
+    t_range: диапазон температур (t_min, t_max), С
+    d_range: диапазон влагосодержаний (d_min, d_max), г/кг сух. возд.
+    resolution: разрешение - допустимое отклонение линии от ломаной составляет 1/resolution размера диаграммы
+    RH_values: значения относительной влажности [0; 1] для линий RH = const
+    t_step: шаг линий t = const, С
+    t_wb_step: шаг линий t_wb = const, С
+    dens_step: шаг линий плотности, кг/м3
+    I_step: шаг линий I = const, Дж/кг
+    return: именованный кортеж IdChart. Результат кэшируется, повторный вызов с теми же параметрами
+            возвращает тот же объект
+    """
+    t_range = tuple(float(t) for t in t_range)
+    d_range = tuple(float(d) for d in d_range)
+    if not (t_range[0] < t_range[1] and 0. <= d_range[0] < d_range[1]):
+        raise ValueError('Диапазоны t_range и d_range должны быть заданы в виде (минимальное, максимальное значение), d >= 0')
+    if resolution <= 0 or min(t_step, t_wb_step, dens_step, I_step) <= 0:
+        raise ValueError('Разрешение и шаги изолиний должны быть больше нуля')
+    RH_values = tuple(float(RH) for RH in RH_values)
+    if not all(0. < RH <= 1. for RH in RH_values):
+        raise ValueError('Значения RH должны находиться в диапазоне (0; 1]')
+    return __calc_id_chart(float(p), t_range, d_range, int(resolution), RH_values, float(t_step),
+                           float(t_wb_step), float(dens_step), float(I_step))
+
+
+def calc_id_points(t, RH = None, d = None, p = p_0):
+    """
+    Определение координат точек (например, результатов измерений) на I-d диаграмме
+    t: температура воздуха (сухой термометр), С
+    RH: относительная влажность [0; 1]
+    d: влагосодержание, г на кг сухого воздуха (задаётся либо RH, либо d)
+    p: давление влажного воздуха, Па
+    Входные параметры могут быть числами или массивами numpy.
+    return: кортеж (d, г/кг сух. возд.; I, Дж/кг сух. возд.; код причины ERR_* модуля wetairprops).
+            Для недопустимых точек d и I - NaN
+    """
+    if (RH is None) == (d is None):
+        raise ValueError('Должно быть задано значение одного из параметров: RH или d')
+    if d is None:
+        d, reason = calc_d(t, RH, p, errors='nan')
+    else:
+        _, reason = calc_RH_d(t, d, p, errors='nan')
+    I, reason_I = calc_I_d(t, d, p, errors='nan')
+    reason = np.where(reason == ERR_OK, reason_I, reason)
+    valid = reason == ERR_OK
+    return np.where(valid, d, np.nan), np.where(valid, I, np.nan), reason
+
+
+def cache_info():
+    """
+    Статистика кэша диаграмм
+    return: именованный кортеж (hits, misses, maxsize, currsize)
+    """
+    return __calc_id_chart.cache_info()
+
+
+def cache_clear():
+    """
+    Очистка кэша диаграмм
+    return: None
+    """
+    __calc_id_chart.cache_clear()
+
+
+@lru_cache(maxsize=32)
+def __calc_id_chart(p, t_range, d_range, resolution, RH_values, t_step, t_wb_step, dens_step, I_step):
+    """
+    Построение I-d диаграммы (параметры - см. calc_id_chart, все параметры хешируемые)
+    """
+    (t_lo, t_hi), (d_lo, d_hi) = t_range, d_range
+    I_lo, I_hi = calc_I_d([t_lo, t_hi], [d_lo, d_hi], p)
+    tol = 1. / resolution
+    scale = (d_lo, d_hi - d_lo, I_lo, I_hi - I_lo)
+
+    def in_chart(t, d):
+        # Точка внутри области построения: t и d в заданных диапазонах, RH <= 100%
+        _, reason = calc_RH_d(t, d, p, errors='nan')
+        return (reason == ERR_OK) & (t_lo <= t) & (t <= t_hi) & (d_lo <= d) & (d <= d_hi)
+
+    def t_I_d(I, d):
+        # Температура по энтальпии и влагосодержанию (при постоянных теплоёмкостях I линейна по t)
+        I_0, I_1 = calc_I_d(np.array([[t_lo], [t_hi]]), d, p)
+        return t_lo + (I - I_0) / (I_1 - I_0) * (t_hi - t_lo)
+
+    def line_RH(RH):
+        def func(t):
+            d, reason = calc_d(t, RH, p, errors='nan')
+            I, _ = calc_I(t, RH, p, errors='nan')
+            return d, I, (reason == ERR_OK) & (d_lo <= d) & (d <= d_hi)
+        return __sample(func, t_lo, t_hi, scale, tol)
+
+    def line_t(t):
+        def func(d):
+            return d, calc_I_d(t, d, p), in_chart(t, d)
+        return __sample(func, d_lo, d_hi, scale, tol)
+
+    def line_I(I):
+        def func(d):
+            return d, np.full_like(d, I), in_chart(t_I_d(I, d), d)
+        return __sample(func, d_lo, d_hi, scale, tol)
+
+    def line_dens(dens):
+        def func(d):
+            # Плотность обратно пропорциональна абсолютной температуре
+            t = (__dens(0., d, p) * 273.15) / dens - 273.15
+            ok = in_chart(t, d)
+            return d, calc_I_d(np.where(ok, t, t_lo), d, p), ok
+        return __sample(func, d_lo, d_hi, scale, tol)
+
+    # Температура мокрого термометра определяется из условия I(t, RH) = I(t_wb, RH = 1),
+    # поэтому линии t_wb = const совпадают с изоэнтальпами, проходящими через точки (t_wb, RH = 1)
+    t_wb_values = __steps(t_range, t_wb_step)
+    I_wb, _ = calc_I(np.array(t_wb_values), 1., p, errors='nan')
+    dens_range = sorted(__dens(t, d, p) for t, d in ((t_lo, d_lo), (t_hi, d_hi), (t_lo, d_hi), (t_hi, d_lo)))
+    dens_values = __steps((dens_range[0], dens_range[-1]), dens_step)
+    return IdChart(p=p, t_range=t_range, d_range=d_range, I_range=(float(I_lo), float(I_hi)), resolution=resolution,
+                   RH=tuple(Isoline(RH, *line_RH(RH)) for RH in RH_values),
+                   t=tuple(Isoline(t, *line_t(t)) for t in __steps(t_range, t_step)),
+                   t_wb=tuple(Isoline(t_wb, *line_I(I)) for t_wb, I in zip(t_wb_values, I_wb) if np.isfinite(I)),
+                   dens=tuple(Isoline(dens, *line_dens(dens)) for dens in dens_values),
+                   I=tuple(Isoline(I, *line_I(I)) for I in __steps((float(I_lo), float(I_hi)), I_step)))
+
+
+def __sample(func, a, b, scale, tol):
+    """
+    Адаптивный выбор точек линии, заданной параметрически
+    func: функция параметра s (массив numpy), возвращающая кортеж (d, I, маска точек внутри области построения)
+    a, b: границы отрезка параметра
+    scale: (d_min, размах d, I_min, размах I) - для перевода координат в доли размера диаграммы
+    tol: допустимое отклонение середины отрезка от хорды, доля размера диаграммы
+    return: кортеж (d, I) - массивы точек линии внутри области построения (только для чтения);
+            между участками линии, разделёнными точками вне области построения, вставляется точка (NaN, NaN)
+    """
+    d_0, d_span, I_0, I_span = scale
+    s = np.linspace(a, b, __N_START)
+    d, I, ok = func(s)
+    x, y = (d - d_0) / d_span, (I - I_0) / I_span
+    active = np.ones(s.size - 1, dtype=bool)
+    s_tol = (b - a) * tol / 8  # точность определения границы области построения
+    for _ in range(__MAX_DEPTH):
+        i = np.flatnonzero(active)
+        if not i.size:
+            break
+        s_m = (s[i] + s[i + 1]) / 2
+        d_m, I_m, ok_m = func(s_m)
+        x_m, y_m = (d_m - d_0) / d_span, (I_m - I_0) / I_span
+        # Отрезок делится, если меняется признак нахождения внутри области построения
+        # или середина линии отклоняется от хорды
+        same = (ok[i] == ok[i + 1]) & (ok_m == ok[i])
+        dev = np.hypot(x_m - (x[i] + x[i + 1]) / 2, y_m - (y[i] + y[i + 1]) / 2)
+        split = ~same | (ok_m & ~(dev <= tol))
+        deeper = (s[i + 1] - s[i]) / 2 > s_tol
+        i, deeper = i[split], deeper[split]
+        new = (s_m, x_m, y_m, d_m, I_m, ok_m)
+        s, x, y, d, I, ok = (np.insert(arr, i + 1, value[split]) for arr, value in zip((s, x, y, d, I, ok), new))
+        # Индексы половин разделённых отрезков после вставки середин
+        j = i + np.arange(i.size)
+        active = np.zeros(s.size - 1, dtype=bool)
+        active[j] = deeper
+        active[j + 1] = deeper
+    idx = np.flatnonzero(ok)
+    # Разрывы: между соседними точками внутри области есть точки вне её
+    gaps = np.flatnonzero(np.diff(idx) > 1) + 1
+    d, I = (np.insert(arr[idx], gaps, np.nan) for arr in (d, I))
+    d.flags.writeable = False
+    I.flags.writeable = False
+    return d, I
+
+
+def __steps(value_range, step):
+    """
+    Значения изолиний, кратные шагу, внутри диапазона
+    value_range: диапазон (минимальное, максимальное значение)
+    step: шаг
+    return: кортеж значений
+    """
+    lo, hi = value_range
+    return tuple(round(k * step, 10) for k in range(ceil(lo / step - 1e-9), int(hi / step + 1e-9) + 1))
+
+
+def __dens(t, d, p):
+    """
+    Определение плотности влажного воздуха по влагосодержанию (методика calc_dens)
+    t: температура, С
+    d: влагосодержание, г на кг сухого воздуха
+    p: давление влажного воздуха, Па
+    return: плотность влажного воздуха, кг/м3
+    """
+    p_st = calc_p_st_d(d, p)
+    return (mu_st * p_st + mu_da * (p - p_st)) / R / (t + 273.15) / 1000.
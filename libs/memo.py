@@ -0,0 +1,407 @@
+"""
+Мемоизация (кэширование результатов) функций расчёта свойств.
+Класс Memo - ограниченный по размеру кэш (вытеснение давно не использовавшихся записей, LRU) с необязательным
+временем жизни записей (TTL) и счётчиками попаданий, промахов и вытеснений. Ключ записи - имя функции и точные
+значения входных параметров (в единицах СИ), поэтому кэшируются только вызовы со скалярными параметрами;
+вызовы с массивами numpy выполняются без кэширования.
+Результаты возвращаются неизменяемыми: словари - в виде MappingProxyType, массивы numpy - только для чтения.
+Класс DiskCache - необязательный второй уровень кэша на диске (база SQLite в режиме WAL): записи сохраняются
+между перезапусками приложения и доступны нескольким процессам одновременно. Записи помечаются версией расчётных
+модулей, записи других версий не используются (удаляются только явно - методом clear).
+Класс CachedProps - набор мемоизированных функций расчёта свойств воды и пара (HSDiag.props_*, Region4.props_px,
+Visc), сухого (calc_dryair_dens, calc_dryair_state) и влажного воздуха (функции модуля wetairprops) с общим кэшем.
+Отличие версии 1.1 от 1.0: добавлены класс DiskCache, параметр store класса Memo, функция props_version,
+мемоизация методов Visc.
+Отличие версии 1.2 от 1.1: в ключ записи допускаются списки строк (например, fields - имена требуемых свойств),
+добавлена функция hs_props_hs.
+Отличие версии 1.3 от 1.2: DiskCache не удаляет записи других версий при открытии базы (фильтрация по версии
+выполняется при чтении, удаление - методом clear(stale=True)).
+Отличие версии 1.4 от 1.3: в ключе записи значения bool помечаются (f(True) и f(1.) - разные записи),
+именованные параметры хранятся отдельно от позиционных (f(x, p=3.) и f(x, 'p', 3.) - разные записи).
+-------------------------------------------------
+'Инженерные расчёты на Python'
+https://zen.yandex.ru/id/5f33dcd5554adc5b33aaee83
+https://medsv.github.io/dzen/
+"""
+
+__author__ = "Сергей Медведев"
+__copyright__ = "Сергей Медведев, 2021"
+__license__ = "GPL"
+__version__ = "1.4"
+__maintainer__ = "Сергей Медведев"
+__email__ = "engpython@yandex.ru"
+__status__ = "Production"
+
+from collections import OrderedDict, namedtuple
+from functools import update_wrapper
+from numbers import Number
+import os
+import pickle
+import sqlite3
+from threading import Lock, local
+from time import monotonic
+from types import MappingProxyType
+import numpy as np
+from . import wetairprops, calcdryairdens, calcdryairstate, calcdryairvisc
+from .calcdryairdens import calc_dryair_dens
+from .calcdryairstate import calc_dryair_state
+from .wsprops import get_engines, Visc
+from .wsprops import (boundary23, engines, hsdiag, hssolver, paramsin, region, region1, region2, region3, region4,
+                      regionclassifier, satcache, saturationcurve, sbtl, scalarpoly, visc)
+
+# Статистика кэша: hits - попадания; misses - промахи; evictions - вытеснения (LRU);
+# expirations - удаления записей с истёкшим временем жизни; maxsize - ёмкость; ttl - время жизни записи, с;
+# currsize - количество записей; hit_rate - доля попаданий; store_hits - попадания в кэш на диске
+# (входят в misses)
+MemoStats = namedtuple('MemoStats', ['hits', 'misses', 'evictions', 'expirations', 'maxsize', 'ttl', 'currsize',
+                                     'hit_rate', 'store_hits'])
+
+
+class Memo:
+    """
+    Ограниченный по размеру кэш результатов функций (LRU) с необязательным временем жизни записей (TTL).
+    Один объект Memo может обслуживать несколько функций (ключ включает имя функции).
+    Потокобезопасен: операции с кэшем выполняются под блокировкой, расчёт - вне её
+    (одновременные промахи по одному ключу приводят к повторному расчёту, но не к ошибке).
+    Исключения не кэшируются.
+    При промахе результат ищется в кэше второго уровня store (например, DiskCache), новые результаты
+    сохраняются и в нём.
+    """
+
+    __NO_KEY = object()  # признак вызова, не подлежащего кэшированию
+
+    def __init__(self, maxsize=1024, ttl=None, timer=monotonic, store=None):
+        """
+        maxsize: максимальное количество записей
+        ttl: время жизни записи, с (None - без ограничения)
+        timer: функция текущего времени, с
+        store: кэш второго уровня с методами get(key) -> (найдено, результат) и put(key, результат)
+               (None - не используется)
+        """
+        if maxsize < 1:
+            raise ValueError('Ёмкость кэша maxsize должна быть не меньше 1')
+        if ttl is not None and ttl <= 0:
+            raise ValueError('Время жизни записи ttl должно быть больше нуля')
+        self.maxsize = int(maxsize)
+        self.ttl = ttl
+        self.timer = timer
+        self.store = store
+        self.__data = OrderedDict()  # ключ -> (момент истечения срока жизни, результат)
+        self.__lock = Lock()
+        self.__hits = self.__misses = self.__evictions = self.__expirations = self.__store_hits = 0
+
+    def __call__(self, func):
+        """
+        Использование объекта в качестве декоратора: @memo
+        """
+        return self.wrap(func)
+
+    def __len__(self):
+        return len(self.__data)
+
+    def wrap(self, func, name=None, lock=None):
+        """
+        Мемоизация функции
+        func: функция (метод объекта)
+        name: имя функции в ключе кэша (по умолчанию - func.__qualname__)
+        lock: блокировка, под которой выполняется расчёт (для объектов, сохраняющих состояние, например Engines.lock)
+        return: функция с теми же параметрами, что и func
+        """
+        name = name or getattr(func, '__qualname__', repr(func))
+
+        def call(args, kwargs):
+            if lock is None:
+                return func(*args, **kwargs)
+            with lock:
+                return func(*args, **kwargs)
+
+        def wrapper(*args, **kwargs):
+            key = self.__make_key(name, args, kwargs)
+            if key is self.__NO_KEY:
+                return call(args, kwargs)
+            found, value = self.__get(key)
+            if found:
+                return value
+            if self.store is not None:
+                found, value = self.store.get(key)
+            if found:
+                with self.__lock:
+                    self.__store_hits += 1
+            else:
+                value = call(args, kwargs)
+                if self.store is not None:
+                    self.store.put(key, value)
+            value = self.__freeze(value)
+            self.__put(key, value)
+            return value
+
+        update_wrapper(wrapper, func)
+        wrapper.memo = self
+        return wrapper
+
+    def stats(self):
+        """
+        Статистика кэша
+        return: именованный кортеж MemoStats
+        """
+        with self.__lock:
+            calls = self.__hits + self.__misses
+            return MemoStats(hits=self.__hits, misses=self.__misses, evictions=self.__evictions,
+                             expirations=self.__expirations, maxsize=self.maxsize, ttl=self.ttl,
+                             currsize=len(self.__data), hit_rate=self.__hits / calls if calls else 0.,
+                             store_hits=self.__store_hits)
+
+    def clear(self, stats=True):
+        """
+        Очистка кэша (кэш второго уровня не очищается)
+        stats: True - обнулить также счётчики статистики
+        return: None
+        """
+        with self.__lock:
+            self.__data.clear()
+            if stats:
+                self.__hits = self.__misses = self.__evictions = self.__expirations = self.__store_hits = 0
+
+    def __get(self, key):
+        """
+        Поиск записи в кэше
+        key: ключ
+        return: кортеж (True - запись найдена; результат)
+        """
+        with self.__lock:
+            item = self.__data.get(key)
+            if item is not None:
+                expires, value = item
+                if expires is None or self.timer() < expires:
+                    self.__data.move_to_end(key)
+                    self.__hits += 1
+                    return True, value
+                del self.__data[key]
+                self.__expirations += 1
+            self.__misses += 1
+            return False, None
+
+    def __put(self, key, value):
+        """
+        Добавление записи в кэш (с вытеснением давно не использовавшихся записей)
+        key: ключ
+        value: результат
+        return: None
+        """
+        expires = None if self.ttl is None else self.timer() + self.ttl
+        with self.__lock:
+            self.__data[key] = (expires, value)
+            self.__data.move_to_end(key)
+            while len(self.__data) > self.maxsize:
+                self.__data.popitem(last=False)
+                self.__evictions += 1
+
+    @staticmethod
+    def __make_key(name, args, kwargs):
+        """
+        Формирование ключа кэша по точным значениям параметров
+        name: имя функции
+        args, kwargs: параметры вызова
+        return: кортеж (имя, позиционные параметры, отсортированные пары именованных параметров) или __NO_KEY,
+                если вызов не кэшируется (массивы, NaN, нехешируемые значения)
+        """
+        items = [Memo.__key_item(value) for value in args]
+        pairs = [(key, Memo.__key_item(value)) for key, value in sorted(kwargs.items())]
+        if any(item is Memo.__NO_KEY for item in items) or any(item is Memo.__NO_KEY for _, item in pairs):
+            return Memo.__NO_KEY
+        return name, tuple(items), tuple(pairs)
+
+    @staticmethod
+    def __key_item(value):
+        """
+        Элемент ключа кэша для значения параметра
+        value: значение параметра
+        return: float для чисел (целые и float с одним значением дают один ключ), ('b', value) для bool
+                (True == 1. и hash(True) == hash(1.), поэтому без пометки f(True) и f(1.) имели бы один ключ),
+                кортеж для списка строк, None и строки - без изменений; __NO_KEY для остальных значений
+        """
+        if isinstance(value, bool):
+            return 'b', value
+        if type(value) is not float and isinstance(value, Number):
+            if np.ndim(value):
+                return Memo.__NO_KEY
+            value = float(value)
+        if type(value) is float:
+            # NaN не равен самому себе - повторное обращение не найдёт запись
+            return value if value == value else Memo.__NO_KEY
+        if isinstance(value, (list, tuple)) and all(isinstance(item, str) for item in value):
+            return tuple(value)  # список имён (например, fields)
+        if value is None or isinstance(value, str):
+            return value
+        return Memo.__NO_KEY
+
+    @staticmethod
+    def __freeze(value):
+        """
+        Преобразование результата в неизменяемый вид
+        value: результат расчёта
+        return: словари - MappingProxyType, массивы numpy - копии только для чтения,
+                кортежи (в том числе именованные) - кортежи того же типа с преобразованными элементами
+        """
+        if isinstance(value, dict):
+            return MappingProxyType({key: Memo.__freeze(item) for key, item in value.items()})
+        if isinstance(value, np.ndarray):
+            value = value.copy()
+            value.flags.writeable = False
+            return value
+        if isinstance(value, tuple):
+            items = (Memo.__freeze(item) for item in value)
+            return type(value)._make(items) if hasattr(value, '_fields') else tuple(items)
+        return value
+
+
+class DiskCache:
+    """
+    Кэш результатов на диске (база SQLite в режиме WAL - одновременное чтение несколькими процессами
+    при одном пишущем). Используется как кэш второго уровня объекта Memo (параметр store).
+    Ключ записи - текстовое представление ключа Memo (числа записываются точно), результат хранится в виде pickle.
+    Записи помечаются версией version, записи других версий не используются (база может использоваться
+    одновременно процессами разных версий); для их удаления служит метод clear(stale=True).
+    Внимание: метод get восстанавливает результаты из pickle, что позволяет выполнить произвольный код,
+    поэтому файл базы и его каталог не должны быть доступны для записи недоверенным пользователям.
+    Ошибки обращения к базе (например, блокировка другим процессом дольше timeout) не прерывают расчёт:
+    запись считается отсутствующей или не сохраняется.
+    """
+
+    def __init__(self, path, version, timeout=5.):
+        """
+        path: путь к файлу базы (каталог создаётся при необходимости)
+        version: версия расчётных модулей (например, props_version())
+        timeout: время ожидания снятия блокировки базы другим процессом, с
+        """
+        self.path = os.fspath(path)
+        self.version = str(version)
+        self.timeout = timeout
+        self.__local = local()  # соединения с базой для каждого потока
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        con = self.__connection()
+        con.execute('PRAGMA journal_mode=WAL')
+        con.execute('CREATE TABLE IF NOT EXISTS props (key TEXT PRIMARY KEY, version TEXT NOT NULL, value BLOB NOT NULL)')
+
+    def __len__(self):
+        cur = self.__connection().execute('SELECT COUNT(*) FROM props WHERE version = ?', (self.version,))
+        return cur.fetchone()[0]
+
+    def get(self, key):
+        """
+        Поиск записи
+        key: ключ (кортеж)
+        return: кортеж (True - запись найдена; результат)
+        """
+        try:
+            row = self.__connection().execute('SELECT value FROM props WHERE key = ? AND version = ?',
+                                              (repr(key), self.version)).fetchone()
+            if row is not None:
+                return True, pickle.loads(row[0])
+        except (sqlite3.Error, pickle.UnpicklingError, AttributeError, ImportError, EOFError):
+            pass
+        return False, None
+
+    def put(self, key, value):
+        """
+        Сохранение записи
+        key: ключ (кортеж)
+        value: результат
+        return: None
+        """
+        try:
+            self.__connection().execute('INSERT OR REPLACE INTO props (key, version, value) VALUES (?, ?, ?)',
+                                        (repr(key), self.version, pickle.dumps(value, pickle.HIGHEST_PROTOCOL)))
+        except (sqlite3.Error, pickle.PicklingError, TypeError, AttributeError):
+            pass
+
+    def clear(self, stale=False):
+        """
+        Удаление записей
+        stale: False - удаление всех записей, True - только записей других версий
+        return: None
+        """
+        if stale:
+            self.__connection().execute('DELETE FROM props WHERE version != ?', (self.version,))
+        else:
+            self.__connection().execute('DELETE FROM props')
+
+    def close(self):
+        """
+        Закрытие соединения с базой текущего потока
+        return: None
+        """
+        con = getattr(self.__local, 'con', None)
+        if con is not None:
+            con.close()
+            self.__local.con = None
+
+    def __connection(self):
+        """
+        Соединение с базой текущего потока (создаётся при первом обращении)
+        return: объект sqlite3.Connection
+        """
+        con = getattr(self.__local, 'con', None)
+        if con is None:
+            # isolation_level=None - каждая запись фиксируется сразу (без явных транзакций)
+            con = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            con.execute('PRAGMA synchronous=NORMAL')
+            self.__local.con = con
+        return con
+
+
+class CachedProps:
+    """
+    Мемоизированные функции расчёта свойств с общим кэшем memo (параметры и результаты - как у исходных функций):
+    hs_props_Tp, hs_props_tp, hs_props_ph, hs_props_ps, hs_props_hs, hs_props_px, hs_props_p - методы HSDiag;
+    water_props_tp - Region1.props_tp; steam_props_tp - Region2.props_tp;
+    wet_steam_props_px - Region4.props_px; wet_steam_dh_p - Region4.dh_p;
+    calc_dryair_dens, calc_dryair_state - свойства сухого воздуха;
+    calc_props, calc_d, calc_I, calc_I_d, calc_dens, calc_RH_d, calc_p_s, calc_p_st, calc_t_s,
+    calc_t_wb, calc_t_dp - свойства влажного воздуха (модуль wetairprops).
+    visc_dvisc_tp, visc_kvisc_tp, visc_calc_visc - методы Visc.
+    Методы объектов Engines и Visc выполняются под блокировкой engines.lock.
+    """
+
+    def __init__(self, engines=None, memo=None):
+        """
+        engines: набор расчётных объектов Engines (по умолчанию - общий для процесса, get_engines())
+        memo: кэш Memo (по умолчанию - новый кэш с параметрами по умолчанию)
+        """
+        self.engines = engines = get_engines() if engines is None else engines
+        self.memo = memo = Memo() if memo is None else memo
+        for name in ('props_Tp', 'props_tp', 'props_ph', 'props_ps', 'props_hs', 'props_px', 'props_p'):
+            setattr(self, 'hs_' + name, memo.wrap(getattr(engines.hs, name), 'HSDiag.' + name, engines.lock))
+        self.water_props_tp = memo.wrap(engines.region1.props_tp, 'Region1.props_tp', engines.lock)
+        self.steam_props_tp = memo.wrap(engines.region2.props_tp, 'Region2.props_tp', engines.lock)
+        self.wet_steam_props_px = memo.wrap(engines.region4.props_px, 'Region4.props_px', engines.lock)
+        self.wet_steam_dh_p = memo.wrap(engines.region4.dh_p, 'Region4.dh_p', engines.lock)
+        visc = Visc()
+        for name in ('dvisc_tp', 'kvisc_tp', 'calc_visc'):
+            setattr(self, 'visc_' + name, memo.wrap(getattr(visc, name), 'Visc.' + name, engines.lock))
+        self.calc_dryair_dens = memo.wrap(calc_dryair_dens)
+        self.calc_dryair_state = memo.wrap(calc_dryair_state)
+        for name in ('calc_props', 'calc_d', 'calc_I', 'calc_I_d', 'calc_dens', 'calc_RH_d', 'calc_p_s',
+                     'calc_p_st', 'calc_t_s', 'calc_t_wb', 'calc_t_dp'):
+            setattr(self, name, memo.wrap(getattr(wetairprops, name)))
+
+    def stats(self):
+        """
+        Статистика кэша
+        return: именованный кортеж MemoStats
+        """
+        return self.memo.stats()
+
+
+def props_version():
+    """
+    Версия расчётных модулей (для пометки записей кэша на диске): при изменении версии любого из модулей
+    ранее сохранённые результаты не используются. В список входят все модули пакета wsprops (в том числе
+    вспомогательные - определение области, полиномы, таблицы SBTL), так как каждый из них влияет на результаты
+    return: строка вида 'hsdiag=1.2;region1=1.2;...'
+    """
+    modules = (boundary23, engines, hsdiag, hssolver, paramsin, region, region1, region2, region3, region4,
+               regionclassifier, satcache, saturationcurve, sbtl, scalarpoly, visc, calcdryairdens, calcdryairstate,
+               calcdryairvisc, wetairprops)
+    return ';'.join(f"{module.__name__.rsplit('.', 1)[-1]}={module.__version__}" for module in modules)
@@ -17,7 +17,7 @@ https://files.stroyinf.ru/Data1/44/44694/
 __author__ = "Сергей Медведев"
 __copyright__ = "Сергей Медведев, 2023"
 __license__ = "GPL"
-__version__ = "2.2.6"
+__version__ = "2.8"
 __maintainer__ = "Сергей Медведев"
 __email__ = "engpython@yandex.ru"
 __status__ = "Production"
@@ -70,12 +70,45 @@ b = min(t, calc_t_s(p))
 
 Отличие версии 2.2.6 от 2.2.5
 Добавлена аннотация типов
+
+Отличие версии 2.3 от 2.2.6
+Добавлены функции calc_t_wb_arr и calc_RH_t_wb_arr, рассчитывающие температуру
+мокрого термометра и относительную влажность по температуре мокрого термометра
+сразу для массивов точек (безопасный метод Ньютона с аналитической производной
+calc_p_s и сужением отрезка поиска). Функции возвращают признак сходимости для
+каждой точки; для недопустимых входных значений возвращается NaN.
+
+Отличие версии 2.4 от 2.3
+Функция calc_t_s не использует root_scalar: начальное приближение рассчитывается
+по ряду Чебышёва (отдельно над льдом и над водой), затем выполняются два шага
+метода Ньютона по calc_p_s. Функции calc_t_s и calc_t_dp_d принимают массивы numpy.
+
+Отличие версии 2.5 от 2.4
+Добавлена функция calc_props(t, RH=None, d=None, p=p_0), рассчитывающая все
+свойства влажного воздуха за один вызов (давление насыщения, парциальное давление
+пара и энтальпия рассчитываются один раз). Принимает числа и массивы numpy,
+возвращает именованный кортеж WetAirProps.
+
+Отличие версии 2.6 от 2.5
+Функции calc_p_s, calc_p_st, calc_d, calc_I, calc_dens, calc_RH_d принимают массивы numpy
+(входные параметры приводятся к общей форме). Добавлен параметр errors: при errors='raise'
+(по умолчанию) для недопустимых значений генерируется исключение, при errors='nan' для
+недопустимых значений возвращается NaN, а функция возвращает кортеж (значение, код причины),
+коды причин - константы ERR_*.
+
+Отличие версии 2.7 от 2.6
+Добавлена функция calc_I_d - определение энтальпии по влагосодержанию (принимает массивы numpy)
+
+Отличие версии 2.8 от 2.7
+В функцию calc_props добавлен параметр errors (см. calc_d)
 """
 
 
 
+from collections import namedtuple
 from scipy.optimize import root_scalar
 from math import exp, log
+import numpy as np
 R: float = 8.314  # Универсальная газовая постоянная, Дж/(моль*К)
 mu_st: float = 18.  # Молярная масса водяного пара, г/моль
 mu_da: float = 29.  # Молярная масса сухого воздуха, г/моль
@@ -84,6 +117,47 @@ t_min: float = -100.  # нижняя граница допустимых зна
 t_max: float = 200.  # верхняя граница допустимых значений, С
 p_min: float = 0.001405102123874154  # нижняя граница допустимых значений, Па
 p_max: float = 1555073.745636215  # верхняя граница допустимых значений, Па
+# Коэффициенты C1...C7 уравнения упругости насыщенного водяного пара (calc_p_s)
+__C_ICE = (-5.6745359e3, 6.3925247, -9.677843e-3, 6.2215701e-7, 2.0747825e-9, -9.484024e-13, 4.1635019)  # t < 0
+__C_WATER = (-5.8002206e3, 1.3914993, -4.8640239e-2, 4.1764768e-5, -1.4452093e-8, 0., 6.5459673)  # t >= 0
+# Начальное приближение для calc_t_s: t_s(ln p) в виде рядов Чебышёва 8-й степени по x = [-1; 1],
+# отдельно над льдом и над водой (погрешность не более 1e-4 К).
+# Кортеж: ln(p) на границах отрезка, коэффициенты ряда
+__p_s_ice_0: float = 611.1535708907679  # упругость пара надо льдом при 0 C, Па
+__p_s_water_0: float = 611.2128674511893  # упругость пара над водой при 0 C, Па
+__T_S_ICE = (log(p_min), log(__p_s_ice_0),
+             (-55.6434100019289, 49.35308486534041, 5.567551538420828, 0.6378048709285645, 0.07474104177005503,
+              0.008967886956781867, 0.0011000964786979258, 0.000136216592644003, 1.779797164410186e-05))
+__T_S_WATER = (log(__p_s_water_0), log(p_max),
+               (84.48785626146514, 97.51760762332464, 15.13136223850933, 2.4302175803646664, 0.37517551779595937,
+                0.05198980283340138, 0.005694919811136606, 0.00028247639815104646, -9.578571108511652e-05))
+
+# Коды причин недопустимости значений (errors='nan')
+ERR_OK: int = 0  # значение рассчитано
+ERR_T: int = 1  # температура вне диапазона [t_min; t_max]
+ERR_P: int = 2  # давление влажного воздуха не больше нуля
+ERR_RH: int = 3  # относительная влажность вне диапазона [0; 1]
+ERR_D: int = 4  # влагосодержание меньше нуля
+ERR_P_ST: int = 5  # парциальное давление пара не ниже давления влажного воздуха
+ERR_RH_D: int = 6  # относительная влажность, рассчитанная по влагосодержанию, более 100%
+__ERR_MESSAGES = {
+    ERR_T: f'Значение температуры должно находиться в диапазоне [{t_min}; +{t_max}] C',
+    ERR_P: 'Значение давления p должно быть больше нуля.',
+    ERR_RH: 'Параметр RH должен находиться в диапазоне [0; 1]',
+    ERR_D: 'Значение влагосодержания d должно быть больше нуля.',
+    ERR_P_ST: 'Парциальное давление пара выше давления влажного воздуха.',
+    ERR_RH_D: 'При заданных значениях параметров t, d, p относительная влажность получается более 100%',
+}
+
+# Свойства влажного воздуха, рассчитываемые функцией calc_props:
+# t - температура, С; RH - относительная влажность [0; 1]; p - давление, Па;
+# d - влагосодержание, г/кг сух. возд.; d1 - влагосодержание, г/кг влажн. возд.; dens - плотность, кг/м3;
+# t_wb - температура мокрого термометра, С; t_dp - температура точки росы, С;
+# I - энтальпия, Дж/кг сух. возд.; I1 - энтальпия, Дж/кг влажн. возд.; p_s - давление насыщения, Па;
+# p_st - парциальное давление пара, Па; p_cond - давление начала образования конденсата, Па
+WetAirProps = namedtuple('WetAirProps', ['t', 'RH', 'p', 'd', 'd1', 'dens', 't_wb', 't_dp', 'I', 'I1',
+                                         'p_s', 'p_st', 'p_cond'])
+
 
 def calc_t_wb(t, RH, p = p_0, RH_target = 1.):
     """
@@ -148,12 +222,12 @@ def calc_t_dp(t, RH, p = p_0):
 def calc_t_dp_d(d, p = p_0):
     """
     Определение температуры точки росы по влагосодержанию
-    d: влагосодержание, г на кг сухого воздуха
+    d: влагосодержание, г на кг сухого воздуха (число или массив numpy)
     p: давление воздуха, Па (по умолчанию - нормальное атмосферное давление)
     return: t_dp - температура точки росы, С
     """    
     p_st =  calc_p_st_d(d, p)  # парциальное давление пара
-    if p_st < p_min:
+    if np.any(p_st < p_min):
         raise ValueError('Недопустимые значения пары параметров t и RH. ' +
                          f'Температура точки росы ниже {t_min} C.')        
     return calc_t_s(p_st)
@@ -171,14 +245,20 @@ def calc_RH_t_dp(t, t_dp):
     return p_st / p_s
     
 
-def calc_RH_d(t, d, p = p_0):
+def calc_RH_d(t, d, p = p_0, errors = 'raise'):
     """
     Определение относительной влажности по влагосодержанию
     t: температура воздуха (сухой термометр), С
     d: влагосодержание, г на кг сухого воздуха
     p: давление влажного воздуха, Па (по умолчанию - нормальное атмосферное давление)
+    errors: 'raise' - генерация исключения при недопустимых значениях, 'nan' - см. __result
     return: относительная влажность воздуха, [0.; 1.]
     """    
+    if errors != 'raise' or np.ndim(t) or np.ndim(d) or np.ndim(p):
+        scalar, (t, d, p), reason = __check_arr(errors, t=t, d=d, p=p)
+        RH = calc_p_st_d(d, p) / __calc_p_s_arr(t)[0]
+        reason = __set_reason(reason, RH > (1. + 1e-10), ERR_RH_D, errors)  # из-за погрешности при RH = 1.
+        return __result(np.minimum(RH, 1.), reason, errors, scalar)
     p_st = calc_p_st_d(d, p)  # парциальное давление пара
     p_s = calc_p_s(t)  # давление насыщения
     RH = p_st / p_s
@@ -217,13 +297,134 @@ def calc_RH_t_wb(t, t_wb, p = p_0):
     return sol.root
     
     
-def calc_p_st(t, RH):
+def calc_t_wb_arr(t, RH, p = p_0, RH_target = 1., xtol = 1e-9, maxiter = 50):
+    """
+    Определение температуры мокрого термометра по относительной влажности для массивов точек
+    t: температура воздуха (сухой термометр), С
+    RH: относительная влажность [0; 1]
+    p: давление воздуха, Па (по умолчанию - нормальное атмосферное давление)
+    RH_target: целевое значение относительной влажности при адиабатическом
+               охлаждении воздуха (по умолчанию - 1. (RH=100%))
+    xtol: допустимая погрешность определения температуры, С
+    maxiter: максимальное количество итераций
+    Входные параметры могут быть числами или массивами numpy (приводятся к общей форме).
+    return: кортеж (t_wb - температура мокрого термометра, С; converged - признак сходимости).
+            Для недопустимых значений входных параметров t_wb = NaN, converged = False
+    """
+    t, RH, p, RH_target = (np.array(a, dtype=float) for a in np.broadcast_arrays(t, RH, p, RH_target))
+    valid = ((t_min <= t) & (t <= t_max) & (0. <= RH) & (RH <= 1.) &
+             (RH <= RH_target) & (RH_target <= 1.) & (0. < p))
+    I_t, _, _, ok = __calc_I_arr(np.where(valid, t, 0.), np.where(valid, RH, 0.), p)
+    return __solve_t_wb(t, RH, p, RH_target, I_t, valid & ok, xtol, maxiter)
+
+
+def __solve_t_wb(t, RH, p, RH_target, I_t, valid, xtol, maxiter):
+    """
+    Определение температуры мокрого термометра для массивов точек по известной энтальпии воздуха
+    t, RH, p, RH_target: см. calc_t_wb_arr (массивы numpy одной формы)
+    I_t: энтальпия воздуха, Дж/кг
+    valid: маска допустимых точек
+    xtol, maxiter: см. calc_t_wb_arr
+    return: кортеж (t_wb, converged)
+    """
+    # Температура мокрого термометра не может быть ниже t_min
+    I_min, _, _, ok = __calc_I_arr(np.full(t.shape, t_min), 1., p)
+    valid = valid & ok & (I_min <= I_t)
+
+    def residual(x):
+        I, dI_dt, _, ok = __calc_I_arr(x, RH_target, p)
+        return I - I_t, dI_dt, ok
+
+    t_wb, converged = __solve_arr(residual, np.full(t.shape, t_min), np.where(valid, t, t_min), valid,
+                                  xtol, maxiter)
+    # При RH = 1 температура мокрого термометра равна температуре воздуха
+    done = valid & (RH == 1.)
+    t_wb[done] = t[done]
+    converged[done] = True
+    return t_wb, converged
+
+
+def calc_RH_t_wb_arr(t, t_wb, p = p_0, RH_target = 1., xtol = 1e-12, maxiter = 50):
+    """
+    Определение относительной влажности по температуре мокрого термометра для массивов точек
+    t: температура воздуха (сухой термометр), С
+    t_wb: температура мокрого термометра, С
+    p: давление влажного воздуха, Па (по умолчанию - нормальное атмосферное давление)
+    RH_target: значение относительной влажности, при котором определялась температура
+               мокрого термометра (по умолчанию - 1. (RH=100%))
+    xtol: допустимая погрешность определения относительной влажности
+    maxiter: максимальное количество итераций
+    Входные параметры могут быть числами или массивами numpy (приводятся к общей форме).
+    return: кортеж (RH - относительная влажность воздуха [0.; 1.]; converged - признак сходимости).
+            Для недопустимых значений входных параметров RH = NaN, converged = False
+    """
+    t, t_wb, p, RH_target = (np.array(a, dtype=float) for a in np.broadcast_arrays(t, t_wb, p, RH_target))
+    valid = ((t_min <= t_wb) & (t_wb <= t) & (t <= t_max) & (0. <= RH_target) & (RH_target <= 1.) & (0. < p))
+    I_wb, _, _, ok = __calc_I_arr(np.where(valid, t_wb, 0.), np.where(valid, RH_target, 0.), p)
+    valid &= ok
+    # Слишком низкая температура мокрого термометра (энтальпия ниже энтальпии сухого воздуха)
+    I_test, _, _, ok = __calc_I_arr(np.where(valid, t, 0.), 0., p)
+    valid &= ok & (I_test <= I_wb)
+
+    def residual(x):
+        I, _, dI_dRH, ok = __calc_I_arr(t, x, p)
+        return I - I_wb, dI_dRH, ok
+
+    RH, converged = __solve_arr(residual, np.zeros(t.shape), np.where(valid, RH_target, 0.), valid,
+                                xtol, maxiter)
+    # При t = t_wb относительная влажность равна RH_target
+    done = valid & (t == t_wb)
+    RH[done] = RH_target[done]
+    converged[done] = True
+    return RH, converged
+
+
+def __solve_arr(residual, lo, hi, valid, xtol, maxiter):
+    """
+    Безопасный метод Ньютона для массивов точек: решение уравнения residual(x) = 0
+    с возрастающей по x функцией на отрезках [lo; hi]. Начальное приближение - hi.
+    Если шаг Ньютона выходит за пределы текущего отрезка или значение функции
+    не может быть рассчитано, выполняется деление отрезка пополам.
+    residual: функция, возвращающая кортеж (значение функции, производная, признак допустимости точки)
+    lo, hi: границы отрезков поиска (массивы numpy)
+    valid: маска точек, для которых выполняется поиск
+    xtol: допустимая погрешность решения
+    maxiter: максимальное количество итераций
+    return: кортеж (решение, признак сходимости); для точек вне valid решение - NaN
+    """
+    x = hi.copy()
+    converged = np.zeros(x.shape, dtype=bool)
+    active = valid.copy()
+    for _ in range(maxiter):
+        if not active.any():
+            break
+        g, dg, ok = residual(x)
+        # Точки, в которых функция не определена (парциальное давление пара выше давления воздуха),
+        # лежат правее решения
+        hi = np.where(active & (~ok | (g > 0)), x, hi)
+        lo = np.where(active & ok & (g < 0), x, lo)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x_new = x - g / dg
+        bisect = ~ok | ~(lo < x_new) | ~(x_new < hi)
+        x_new = np.where(bisect, (lo + hi) / 2, x_new)
+        done = active & ok & ((g == 0) | (np.abs(x_new - x) <= xtol) | (hi - lo <= xtol))
+        converged |= done
+        active &= ~done
+        x = np.where(active, x_new, x)
+    return np.where(valid, x, np.nan), converged
+
+
+def calc_p_st(t, RH, errors = 'raise'):
     """
     Определение парциального давления пара
     t: температура воздуха (сухой термометр), С
     RH: относительная влажность [0; 1]
+    errors: 'raise' - генерация исключения при недопустимых значениях, 'nan' - см. __result
     return: p_st - парциальное давление пара, Па
     """
+    if errors != 'raise' or np.ndim(t) or np.ndim(RH):
+        scalar, (t, RH), reason = __check_arr(errors, t=t, RH=RH)
+        return __result(RH * __calc_p_s_arr(t)[0], reason, errors, scalar)
     __check_RH(RH)
     p_s: float = calc_p_s(t)  # давление насыщения
     p_st: float = RH * p_s  # парциальное давление водяного пара
@@ -251,38 +452,77 @@ def calc_p_da(t, RH, p = p_0):
     """
     return p - calc_p_st(t, RH)
 
-def calc_d(t, RH, p = p_0):
+def calc_d(t, RH, p = p_0, errors = 'raise'):
     """
     Определение влагосодержания, г/(кг сухого воздуха)
     t: температура воздуха (сухой термометр), С
     RH: относительная влажность [0; 1]
     p: давление воздуха, Па (по умолчанию - нормальное атмосферное давление)
+    errors: 'raise' - генерация исключения при недопустимых значениях, 'nan' - см. __result
     return: d - влагосодержание, г/кг сух. возд.
     """
+    if errors != 'raise' or np.ndim(t) or np.ndim(RH) or np.ndim(p):
+        scalar, (t, RH, p), reason = __check_arr(errors, t=t, RH=RH, p=p)
+        _, d, reason = __calc_d_arr(t, RH, p, reason, errors)
+        return __result(d, reason, errors, scalar)
     __check_RH(RH)
     return __calc_d(t, RH, p)
 
 def __calc_d(t, RH, p):
+    """
+    Определение влагосодержания без проверки RH
+    """
     p_st = calc_p_st(t, RH)
     if p_st > p:
         raise ValueError(f"Парциальное давление пара {p_st} Па выше давления влажного воздуха {p} Па.")
     d = 1000 * p_st / (p - p_st) * mu_st / mu_da
     return d
 
-def calc_I(t, RH, p = p_0) -> float:
+def calc_I(t, RH, p = p_0, errors = 'raise'):
     """
     Определение энтальпии, Дж/кг
     t: температура воздуха (сухой термометр), С
     RH: относительная влажность [0; 1]
     p: давление влажного воздуха, Па (по умолчанию - нормальное атмосферное давление)
+    errors: 'raise' - генерация исключения при недопустимых значениях, 'nan' - см. __result
     """
+    if errors != 'raise' or np.ndim(t) or np.ndim(RH) or np.ndim(p):
+        scalar, (t, RH, p), reason = __check_arr(errors, t=t, RH=RH, p=p)
+        p_st, d, reason = __calc_d_arr(t, RH, p, reason, errors)
+        return __result(__calc_I_d(t, d, p_st, p), reason, errors, scalar)
     __check_RH(RH)
     return __calc_I(t, RH, p)
 
+def calc_I_d(t, d, p = p_0, errors = 'raise'):
+    """
+    Определение энтальпии по влагосодержанию, Дж/кг
+    t: температура воздуха (сухой термометр), С
+    d: влагосодержание, г на кг сухого воздуха
+    p: давление влажного воздуха, Па (по умолчанию - нормальное атмосферное давление)
+    errors: 'raise' - генерация исключения при недопустимых значениях, 'nan' - см. __result
+    Относительная влажность не проверяется (при RH > 1 - энтальпия пересыщенного воздуха без учёта конденсата)
+    return: энтальпия, Дж/кг сух. возд.
+    """
+    scalar, (t, d, p), reason = __check_arr(errors, t=t, d=d, p=p)
+    p_st = calc_p_st_d(d, p)
+    reason = __set_reason(reason, p_st >= p, ERR_P_ST, errors)
+    return __result(__calc_I_d(t, d, p_st, p), reason, errors, scalar)
+
 def __calc_I(t: float, RH: float, p: float) -> float:
     d: float = __calc_d(t, RH, p)
     p_s: float = calc_p_s(t)  # Давление насыщения при температуре t
     p_st: float = p_s * RH  # Парциальное давление пара
+    return __calc_I_d(t, d, p_st, p)
+
+def __calc_I_d(t, d, p_st, p):
+    """
+    Определение энтальпии по уже рассчитанным влагосодержанию и парциальному давлению пара
+    t: температура воздуха, С
+    d: влагосодержание, г/кг сух. возд.
+    p_st: парциальное давление пара, Па
+    p: давление влажного воздуха, Па
+    return: энтальпия, Дж/кг сух. возд.
+    """
     r: float = __calc_latent_heat(p_st)
     c_da: float = __calc_cp_da(t, p - p_st)
     c_st: float = __calc_cp_st(t, p_st)
@@ -291,54 +531,138 @@ def __calc_I(t: float, RH: float, p: float) -> float:
 
 
 
-def calc_p_s (t) -> float:
+def __calc_p_s_arr(t, ice=None):
+    """
+    Определение упругости насыщенного водяного пара и её производной по температуре
+    для массивов значений (методика calc_p_s)
+    t: температура водяного пара, С (массив numpy, значения внутри [t_min; t_max])
+    ice: маска точек, для которых используется уравнение надо льдом (по умолчанию - t < 0)
+    return: кортеж (p_s - давление насыщения, Па; dp_s/dt, Па/К)
+    """
+    T = t + 273.15
+    if ice is None:
+        ice = t < 0
+    C1, C2, C3, C4, C5, C6, C7 = (np.where(ice, c_ice, c_water) for c_ice, c_water in zip(__C_ICE, __C_WATER))
+    p_s = np.exp(C1/T + C2 + C3*T + C4*T*T + C5*T**3 + C6*T**4 + C7*np.log(T))
+    dln = -C1/T/T + C3 + 2*C4*T + 3*C5*T*T + 4*C6*T**3 + C7/T
+    return p_s, p_s * dln
+
+
+def __calc_I_arr(t, RH, p):
+    """
+    Определение энтальпии влажного воздуха и её производных для массивов значений (методика __calc_I).
+    Теплоёмкости и теплота парообразования при дифференцировании считаются постоянными.
+    t: температура воздуха, С
+    RH: относительная влажность [0; 1]
+    p: давление влажного воздуха, Па
+    return: кортеж (I, Дж/кг; dI/dt, Дж/кг/К; dI/dRH, Дж/кг; ok - признак того, что
+            парциальное давление пара ниже давления влажного воздуха; в остальных точках I = NaN)
+    """
+    t, RH, p = np.broadcast_arrays(t, RH, p)
+    p_s, dp_s = __calc_p_s_arr(np.clip(t, t_min, t_max))
+    p_st = RH * p_s
+    ok = (t_min <= t) & (t <= t_max) & (p_st < p)
+    p_da = np.where(ok, p - p_st, np.nan)
+    k = 1000 * mu_st / mu_da
+    d = k * p_st / p_da
+    dd_dp_st = k * p / p_da / p_da
+    r = __calc_latent_heat(p_st)
+    c_da = __calc_cp_da(t, p_da)
+    c_st = __calc_cp_st(t, p_st)
+    I = 1e3 * c_da * t + (r + c_st * t) * d
+    dI_dt = 1e3 * c_da + c_st * d + (r + c_st * t) * dd_dp_st * RH * dp_s
+    dI_dRH = (r + c_st * t) * dd_dp_st * p_s
+    return I, dI_dt, dI_dRH, ok
+
+
+def calc_p_s (t, errors = 'raise'):
     """
     Определение упругости насыщенного водяного пара (давления насыщения)
     t: температура водяного пара, С
+    errors: 'raise' - генерация исключения при недопустимых значениях, 'nan' - см. __result
     return: p_s - давление насыщения, Па
     Источник: https://files.stroyinf.ru/Data1/44/44694/
     """
+    if errors != 'raise' or np.ndim(t):
+        scalar, (t,), reason = __check_arr(errors, t=t)
+        return __result(__calc_p_s_arr(t)[0], reason, errors, scalar)
     # ограничение методики расчёта упругости пара
     if not t_min <= t <= t_max:
         raise ValueError(f'Значение температуры должно находиться в диапазоне [{t_min}; +{t_max}] C')  
     T: float = t + 273.15
-    if t < 0:
-        C1: float= -5.6745359e3; C2 = 6.3925247; C3: float = -9.677843e-3; C4 = 6.2215701e-7
-        C5= 2.0747825e-9; C6: float = -9.484024e-13; C7 =  4.1635019
-    else:
-        C1 = -5.8002206e3; C2 = 1.3914993; C3 = -4.8640239e-2; C4 = 4.1764768e-5
-        C5: float = -1.4452093e-8; C6 = 0.; C7 = 6.5459673
+    C1, C2, C3, C4, C5, C6, C7 = __C_ICE if t < 0 else __C_WATER
     return exp(C1/T + C2 + C3*T + C4*T*T+ C5*T**3 + C6*T**4 + C7*log(T))
 
 def calc_t_s (p):
     """
     Определение температуры насыщения водяного пара при заданном давлении
     Функция обратная calc_p_s.
-    p: давление водяного пара, Па
+    Начальное приближение рассчитывается по ряду Чебышёва, затем уточняется двумя шагами
+    метода Ньютона по уравнению ln(calc_p_s(t)) = ln(p) (погрешность - на уровне точности вычислений).
+    Если давление лежит между упругостью пара надо льдом и над водой при 0 C, возвращается 0.
+    p: давление водяного пара, Па (число или массив numpy)
     return: t_s - температура насыщения, С
     """
+    if np.ndim(p):
+        p = np.asarray(p, dtype=float)
+        if not np.all((p_min <= p) & (p <= p_max)):
+            raise ValueError(f'Значение давления должно находиться в диапазоне [{p_min}; {p_max}] Па')
+        ice = p < __p_s_water_0
+        x = np.log(p)
+        t = np.where(ice, __chebval_t_s(x, __T_S_ICE), __chebval_t_s(x, __T_S_WATER))
+        for _ in range(2):
+            p_s, dp_s = __calc_p_s_arr(t, ice)
+            t = t - (np.log(p_s) - x) * p_s / dp_s
+        return np.where(ice, np.clip(t, t_min, 0.), np.clip(t, 0., t_max))
     if not p_min <= p <= p_max:
-        raise ValueError(f'Значение давления должно находиться в диапазоне [{p_min}; {p_max}] Па')      
-    t_est = 0.  # первое приближение
-    #return optimize.newton(lambda t: p-calc_p_s(t), t_est)
-    sol = root_scalar(lambda t: p-calc_p_s(t), bracket=[t_min, t_max])
-    return sol.root
-    
-    
-def calc_dens(t, RH, p = p_0):
+        raise ValueError(f'Значение давления должно находиться в диапазоне [{p_min}; {p_max}] Па')
+    ice = p < __p_s_water_0
+    x = log(p)
+    t = __chebval_t_s(x, __T_S_ICE if ice else __T_S_WATER)
+    C1, C2, C3, C4, C5, C6, C7 = __C_ICE if ice else __C_WATER
+    for _ in range(2):
+        T = t + 273.15
+        ln_p_s = C1/T + C2 + C3*T + C4*T*T + C5*T**3 + C6*T**4 + C7*log(T)
+        dln = -C1/T/T + C3 + 2*C4*T + 3*C5*T*T + 4*C6*T**3 + C7/T
+        t -= (ln_p_s - x) / dln
+    return min(max(t, t_min), 0.) if ice else min(max(t, 0.), t_max)
+
+
+def __chebval_t_s(x, cheb):
+    """
+    Начальное приближение температуры насыщения (схема Кленшоу для ряда Чебышёва)
+    x: ln(p) (число или массив numpy)
+    cheb: кортеж (ln(p) на границах отрезка, коэффициенты ряда) - __T_S_ICE или __T_S_WATER
+    return: температура насыщения, С
+    """
+    x0, x1, c = cheb
+    x = (2 * x - x0 - x1) / (x1 - x0)
+    b1 = b2 = 0.
+    for ck in c[:0:-1]:
+        b1, b2 = 2 * x * b1 - b2 + ck, b1
+    return x * b1 - b2 + c[0]
+
+
+def calc_dens(t, RH, p = p_0, errors = 'raise'):
     """
     Определение плотности влажного воздуха
     t: температура, Па
     p: давление влажного воздуха, Па (по умолчанию - нормальное атмосферное давление)
     RH: относительная влажность [0; 1]
+    errors: 'raise' - генерация исключения при недопустимых значениях, 'nan' - см. __result
     return: плотность влажного воздуха, кг/м3
     """  
-    __check_RH(RH)
-    p_s: float = calc_p_s (t)
+    arr = errors != 'raise' or np.ndim(t) or np.ndim(RH) or np.ndim(p)
+    if arr:
+        scalar, (t, RH, p), reason = __check_arr(errors, t=t, RH=RH, p=p)
+        p_s, _ = __calc_p_s_arr(t)
+    else:
+        __check_RH(RH)
+        p_s: float = calc_p_s (t)
     p_st: float = RH * p_s
     p_da: float = p - p_st
     dens: float = (mu_st * p_st + mu_da * p_da) / R / (t + 273.15) / 1000.
-    return dens
+    return __result(dens, reason, errors, scalar) if arr else dens
     
 def calc_dens_d(t, d, p = p_0):
     """
@@ -378,14 +702,59 @@ def calc_p_cond(d, t):
     k = p_s / p_st
     return k * p_0
     
-"""
-def calc_props(t, RH, p = p_0):
-    __check_RH(RH)
-    d = calc_d(t, RH, p)
-    try:
-"""        
-    
-    
+def calc_props(t, RH = None, d = None, p = p_0, errors = 'raise'):
+    """
+    Определение всех свойств влажного воздуха за один вызов.
+    Давление насыщения, парциальное давление пара и энтальпия рассчитываются один раз
+    и используются при расчёте остальных свойств.
+    t: температура воздуха (сухой термометр), С
+    RH: относительная влажность [0; 1]
+    d: влагосодержание, г на кг сухого воздуха (задаётся либо RH, либо d)
+    p: давление влажного воздуха, Па (по умолчанию - нормальное атмосферное давление)
+    errors: 'raise' - генерация исключения при недопустимых значениях, 'nan' - см. __result
+    Входные параметры могут быть числами или массивами numpy (приводятся к общей форме).
+    return: именованный кортеж WetAirProps (для массивов - кортеж массивов);
+            при errors='nan' - кортеж (WetAirProps, код причины), все свойства недопустимых точек - NaN.
+            Если температура мокрого термометра или точки росы ниже t_min, её значение - NaN
+    """
+    if (RH is None) == (d is None):
+        raise ValueError('Должно быть задано значение одного из параметров: RH или d')
+    if d is None:
+        scalar, (t, RH, p), reason = __check_arr(errors, t=t, RH=RH, p=p)
+        p_s, _ = __calc_p_s_arr(t)
+        p_st = RH * p_s
+        bad = p_st >= p
+        reason = __set_reason(reason, bad, ERR_P_ST, errors)
+        if bad.any():
+            RH = np.where(bad, 0., RH)
+            p_st = RH * p_s
+        d = 1000 * p_st / (p - p_st) * mu_st / mu_da
+    else:
+        scalar, (t, d, p), reason = __check_arr(errors, t=t, d=d, p=p)
+        p_s, _ = __calc_p_s_arr(t)
+        p_st = calc_p_st_d(d, p)
+        RH = p_st / p_s
+        bad = RH > (1. + 1e-10)  # из-за погрешности в расчётах RH при RH = 1.
+        reason = __set_reason(reason, bad, ERR_RH_D, errors)
+        if bad.any():
+            d, p_st, RH = (np.where(bad, 0., value) for value in (d, p_st, RH))
+        RH = np.minimum(RH, 1.)
+    I = __calc_I_d(t, d, p_st, p)
+    t_wb, _ = __solve_t_wb(t, RH, p, np.ones_like(t), I, np.ones(t.shape, dtype=bool), 1e-9, 50)
+    # Температура точки росы: при p_st < p_min (в том числе при RH = 0) не определена
+    dew = p_st >= p_min
+    t_dp = np.where(dew, calc_t_s(np.where(dew, p_st, p_min)), np.nan)
+    p_da = p - p_st
+    dens = (mu_st * p_st + mu_da * p_da) / R / (t + 273.15) / 1000.
+    with np.errstate(divide='ignore'):
+        p_cond = p / RH
+    props = WetAirProps(t=t, RH=RH, p=p, d=d, d1=d / (1 + d / 1000.), dens=dens, t_wb=t_wb, t_dp=t_dp,
+                        I=I, I1=I / (1 + d / 1000.), p_s=p_s, p_st=p_st, p_cond=p_cond)
+    props = WetAirProps(*(__result(value, reason, 'raise', scalar) for value in props))
+    if errors == 'raise':
+        return props
+    return props, int(reason) if scalar else reason
+
 
 def __calc_latent_heat(p_s) -> float:
     """
@@ -422,3 +791,88 @@ def __check_RH(RH):
         raise ValueError('Параметр RH должен находиться в диапазоне [0; 1]')
     return True
 
+
+
+def __check_arr(errors, t = None, RH = None, d = None, p = None):
+    """
+    Проверка входных параметров, заданных числами или массивами numpy
+    errors: 'raise' - генерация исключения при первом же недопустимом значении, 'nan' - формирование кодов причин
+    t, RH, d, p: проверяемые параметры (не заданные параметры - None)
+    return: кортеж (признак того, что все параметры - числа; список заданных параметров, приведённых к общей форме,
+            в порядке t, RH, d, p; массив кодов причин ERR_*). Недопустимые значения заменяются на допустимые,
+            чтобы расчёт по ним не приводил к ошибкам
+    """
+    if errors not in ('raise', 'nan'):
+        raise ValueError(f"Недопустимое значение параметра errors: {errors}")
+    given = [(name, value) for name, value in (('t', t), ('RH', RH), ('d', d), ('p', p)) if value is not None]
+    scalar = not any(np.ndim(value) for _, value in given)
+    arrays = np.broadcast_arrays(*(np.asarray(value, dtype=float) for _, value in given))
+    values = dict(zip((name for name, _ in given), (np.array(value) for value in arrays)))
+    reason = np.full(arrays[0].shape, ERR_OK, dtype=np.int8)
+    for name, code, substitute in (('t', ERR_T, 0.), ('p', ERR_P, p_0), ('RH', ERR_RH, 0.), ('d', ERR_D, 0.)):
+        if name not in values:
+            continue
+        value = values[name]
+        if name == 't':
+            bad = ~((t_min <= value) & (value <= t_max))
+        elif name == 'p':
+            bad = ~(value > 0)
+        elif name == 'RH':
+            bad = ~((0. <= value) & (value <= 1.))
+        else:
+            bad = ~(value >= 0)
+        if bad.any():
+            reason = __set_reason(reason, bad, code, errors)
+            value[bad] = substitute
+    return scalar, [values[name] for name, _ in given], reason
+
+
+def __set_reason(reason, bad, code, errors):
+    """
+    Запись кода причины для недопустимых значений (если причина ещё не записана)
+    reason: массив кодов причин
+    bad: маска недопустимых значений
+    code: код причины ERR_*
+    errors: 'raise' - при наличии недопустимых значений генерируется исключение, 'nan' - коды записываются в reason
+    return: массив кодов причин
+    """
+    bad = bad & (reason == ERR_OK)
+    if bad.any():
+        if errors == 'raise':
+            raise ValueError(__ERR_MESSAGES[code])
+        reason = np.where(bad, code, reason).astype(np.int8)
+    return reason
+
+
+def __calc_d_arr(t, RH, p, reason, errors):
+    """
+    Определение парциального давления пара и влагосодержания для массивов значений (методика __calc_d)
+    t: температура воздуха, С
+    RH: относительная влажность [0; 1]
+    p: давление влажного воздуха, Па
+    reason: массив кодов причин
+    errors: 'raise' или 'nan'
+    return: кортеж (p_st, Па; d, г/кг сух. возд.; массив кодов причин)
+    """
+    p_st = RH * __calc_p_s_arr(t)[0]
+    bad = p_st >= p
+    reason = __set_reason(reason, bad, ERR_P_ST, errors)
+    d = 1000 * p_st / np.where(bad, 1., p - p_st) * mu_st / mu_da
+    return p_st, d, reason
+
+
+def __result(value, reason, errors, scalar):
+    """
+    Формирование результата: для недопустимых значений возвращается NaN
+    value: рассчитанные значения
+    reason: массив кодов причин (ERR_OK - значение рассчитано)
+    errors: 'raise' - возвращается только значение, 'nan' - кортеж (значение, код причины)
+    scalar: True - результат приводится к числам
+    return: значение или кортеж (значение, код причины)
+    """
+    value = np.where(reason == ERR_OK, value, np.nan)
+    if scalar:
+        value, reason = float(value), int(reason)
+    if errors == 'raise':
+        return value
+    return value, reason
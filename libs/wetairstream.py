@@ -0,0 +1,376 @@
+"""
+Потоковый (по частям) расчёт свойств влажного воздуха для больших файлов:
+метеорологических файлов EPW (TMY, 8760 строк и более) и выгрузок систем диспетчеризации
+зданий (десятки миллионов строк) в формате CSV или Parquet.
+Файл читается частями по chunk_size строк, свойства каждой части рассчитываются функцией
+calc_props модуля wetairprops сразу для массивов значений, результаты записываются в CSV
+или Parquet по мере расчёта - объём используемой памяти определяется размером части, а не файла.
+Недопустимые строки не прерывают расчёт: свойства для них - NaN, в столбце reason записывается
+код причины (константы ERR_* модуля wetairprops).
+Для каждой части собирается статистика (количество строк, время чтения, расчёта и записи,
+производительность), по которой можно оценить продолжительность расчёта.
+Для чтения и записи Parquet требуется пакет pyarrow.
+"""
+
+import csv
+from collections import namedtuple
+from itertools import islice
+from time import perf_counter
+import numpy as np
+from .wetairprops import calc_props, WetAirProps, p_0, ERR_OK
+
+__author__ = "Сергей Медведев"
+__copyright__ = "Сергей Медведев, 2023"
+__license__ = "GPL"
+__version__ = "1.0"
+__maintainer__ = "Сергей Медведев"
+__email__ = "engpython@yandex.ru"
+__status__ = "Production"
+
+# Статистика расчёта части файла: index - номер части; rows - количество строк; invalid - количество
+# недопустимых строк; read, calc, write - время чтения, расчёта и записи, с; rows_per_second - производительность
+ChunkStats = namedtuple('ChunkStats', ['index', 'rows', 'invalid', 'read', 'calc', 'write', 'rows_per_second'])
+
+# Номера столбцов файла EPW: температура сухого термометра, С; относительная влажность, %; давление, Па
+__EPW_HEADER_ROWS = 8
+__EPW_TIME_COLUMNS = ('year', 'month', 'day', 'hour', 'minute')
+__EPW_T, __EPW_RH, __EPW_P = 6, 8, 9
+__EPW_MISSING = {__EPW_T: 99.9, __EPW_RH: 999., __EPW_P: 999999.}  # значения, обозначающие отсутствие данных
+
+
+class StreamStats:
+    """
+    Статистика потокового расчёта: список ChunkStats по частям файла и итоговые значения
+    """
+
+    def __init__(self):
+        self.chunks = []
+
+    def add(self, chunk_stats):
+        """
+        Добавление статистики части файла
+        chunk_stats: ChunkStats
+        return: None
+        """
+        self.chunks.append(chunk_stats)
+
+    @property
+    def rows(self):
+        """Общее количество строк"""
+        return sum(chunk.rows for chunk in self.chunks)
+
+    @property
+    def invalid(self):
+        """Общее количество недопустимых строк"""
+        return sum(chunk.invalid for chunk in self.chunks)
+
+    @property
+    def seconds(self):
+        """Общее время чтения, расчёта и записи, с"""
+        return sum(chunk.read + chunk.calc + chunk.write for chunk in self.chunks)
+
+    @property
+    def rows_per_second(self):
+        """Средняя производительность, строк/с"""
+        seconds = self.seconds
+        return self.rows / seconds if seconds > 0 else float('nan')
+
+    def __repr__(self):
+        return (f"StreamStats(chunks={len(self.chunks)}, rows={self.rows}, invalid={self.invalid}, "
+                f"seconds={self.seconds:.3f}, rows_per_second={self.rows_per_second:.0f})")
+
+
+def read_csv(path, columns, chunk_size = 100000, delimiter = ',', keep = (), encoding = 'utf-8'):
+    """
+    Чтение CSV-файла частями
+    path: путь к файлу (первая строка - заголовок)
+    columns: словарь {'t': столбец температуры, 'RH' или 'd': столбец относительной влажности
+             или влагосодержания, 'p': столбец давления (необязательный, по умолчанию - p_0)}
+    chunk_size: количество строк в части
+    delimiter: разделитель столбцов
+    keep: столбцы, переносимые в результат без изменений (например, время измерения)
+    encoding: кодировка файла
+    return: генератор словарей {имя параметра: массив numpy, имя столбца из keep: список строк}
+    """
+    __check_columns(columns)
+    with open(path, newline='', encoding=encoding) as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        header = next(reader)
+        index = {}
+        for name in tuple(columns.values()) + tuple(keep):
+            if name not in header:
+                raise ValueError(f'В файле {path} отсутствует столбец {name}')
+            index[name] = header.index(name)
+        while True:
+            rows = list(islice(reader, chunk_size))
+            if not rows:
+                return
+            yield __make_chunk(rows, index, columns, keep)
+
+
+def read_epw(path, chunk_size = 100000):
+    """
+    Чтение метеорологического файла EPW (EnergyPlus Weather) частями
+    path: путь к файлу
+    chunk_size: количество строк в части
+    return: генератор словарей {'year', 'month', 'day', 'hour', 'minute': списки строк,
+            't': температура, С; 'RH': относительная влажность, %; 'p': давление, Па}.
+            Отсутствующие данные (99.9, 999, 999999) заменяются на NaN
+    """
+    columns = {'t': __EPW_T, 'RH': __EPW_RH, 'p': __EPW_P}
+    index = dict(zip(__EPW_TIME_COLUMNS, range(len(__EPW_TIME_COLUMNS))))
+    index.update((column, column) for column in columns.values())
+    with open(path, newline='', encoding='latin-1') as f:
+        reader = csv.reader(f)
+        for _ in islice(reader, __EPW_HEADER_ROWS):
+            pass
+        while True:
+            rows = list(islice(reader, chunk_size))
+            if not rows:
+                return
+            chunk = __make_chunk(rows, index, columns, __EPW_TIME_COLUMNS)
+            for name, column in columns.items():
+                chunk[name][chunk[name] >= __EPW_MISSING[column]] = np.nan
+            yield chunk
+
+
+def read_parquet(path, columns, chunk_size = 100000, keep = ()):
+    """
+    Чтение файла Parquet частями (требуется пакет pyarrow)
+    path: путь к файлу
+    columns, keep: см. read_csv
+    chunk_size: количество строк в части
+    return: генератор словарей {имя параметра: массив numpy, имя столбца из keep: массив numpy}
+    """
+    __check_columns(columns)
+    pq = __import_parquet()
+    names = list(dict.fromkeys(tuple(columns.values()) + tuple(keep)))
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=names):
+        chunk = {name: batch.column(column).to_numpy(zero_copy_only=False).astype(float)
+                 for name, column in columns.items()}
+        chunk.update((name, batch.column(name).to_numpy(zero_copy_only=False)) for name in keep)
+        yield chunk
+
+
+def calc_chunks(chunks, fields = WetAirProps._fields, RH_percent = False, stats = None):
+    """
+    Расчёт свойств влажного воздуха для частей файла
+    chunks: итерируемый объект (например, генератор read_csv) словарей {'t', 'RH' или 'd', 'p' (необязательно),
+            столбцы, переносимые в результат без изменений}
+    fields: рассчитываемые свойства (поля WetAirProps)
+    RH_percent: True - относительная влажность задана и возвращается в процентах
+    stats: StreamStats для сбора статистики (время записи не учитывается) или None
+    return: генератор словарей {столбцы, переносимые без изменений; свойства из fields; 'reason' - код причины}
+    """
+    unknown = set(fields) - set(WetAirProps._fields)
+    if unknown:
+        raise ValueError(f'Неизвестные свойства: {", ".join(sorted(unknown))}')
+    chunks = iter(chunks)
+    index = 0
+    while True:
+        start = perf_counter()
+        chunk = next(chunks, None)
+        if chunk is None:
+            return
+        read = perf_counter() - start
+        start = perf_counter()
+        result = __calc_chunk(chunk, fields, RH_percent)
+        calc = perf_counter() - start
+        if stats is not None:
+            rows = len(result['reason'])
+            stats.add(ChunkStats(index, rows, int(np.count_nonzero(result['reason'] != ERR_OK)), read, calc, 0.,
+                                 rows / (read + calc) if read + calc > 0 else float('nan')))
+        index += 1
+        yield result
+
+
+def process(chunks, path, fields = WetAirProps._fields, RH_percent = False, delimiter = ','):
+    """
+    Потоковый расчёт свойств влажного воздуха с записью результатов в файл
+    chunks: итерируемый объект частей файла (read_csv, read_epw, read_parquet)
+    path: путь к файлу результатов; расширение .parquet - формат Parquet (требуется pyarrow), иначе - CSV
+    fields: рассчитываемые свойства (поля WetAirProps)
+    RH_percent: True - относительная влажность задана и записывается в процентах
+    delimiter: разделитель столбцов CSV
+    return: StreamStats - статистика расчёта
+    """
+    stats = StreamStats()
+    if str(path).lower().endswith('.parquet'):
+        writer = __ParquetWriter(path, __import_parquet(arrow=True))
+    else:
+        writer = __CsvWriter(path, delimiter)
+    try:
+        calc_stats = StreamStats()
+        for result in calc_chunks(chunks, fields, RH_percent, calc_stats):
+            start = perf_counter()
+            writer.write(result)
+            write = perf_counter() - start
+            chunk = calc_stats.chunks[-1]
+            seconds = chunk.read + chunk.calc + write
+            stats.add(chunk._replace(write=write, rows_per_second=chunk.rows / seconds if seconds > 0 else float('nan')))
+    finally:
+        writer.close()
+    return stats
+
+
+def __check_columns(columns):
+    """
+    Проверка словаря столбцов входного файла
+    columns: словарь {'t', 'RH' или 'd', 'p' (необязательно): столбец файла}
+    return: None
+    """
+    if 't' not in columns or (('RH' in columns) == ('d' in columns)) or set(columns) - {'t', 'RH', 'd', 'p'}:
+        raise ValueError("Должны быть заданы столбцы 't', один из столбцов 'RH' или 'd' и, при необходимости, 'p'")
+
+
+def __make_chunk(rows, index, columns, keep):
+    """
+    Формирование части файла из списка строк
+    rows: список строк файла (списков значений)
+    index: словарь {столбец: номер столбца}
+    columns: словарь {имя параметра: столбец}
+    keep: столбцы, переносимые в результат без изменений
+    return: словарь {имя параметра: массив numpy, имя столбца из keep: список строк}
+    """
+    values = list(zip(*rows))
+    chunk = {name: __to_float(values[index[column]]) for name, column in columns.items()}
+    chunk.update((name, list(values[index[name]])) for name in keep)
+    return chunk
+
+
+def __to_float(values):
+    """
+    Преобразование строк в массив чисел; пустые и нечисловые значения заменяются на NaN
+    values: последовательность строк
+    return: массив numpy
+    """
+    try:
+        return np.array(values, dtype=float)
+    except ValueError:
+        result = np.empty(len(values))
+        for i, value in enumerate(values):
+            try:
+                result[i] = float(value)
+            except ValueError:
+                result[i] = np.nan
+        return result
+
+
+def __calc_chunk(chunk, fields, RH_percent):
+    """
+    Расчёт свойств влажного воздуха для части файла
+    chunk: словарь {'t', 'RH' или 'd', 'p' (необязательно), столбцы, переносимые без изменений}
+    fields: рассчитываемые свойства
+    RH_percent: True - относительная влажность задана и возвращается в процентах
+    return: словарь {столбцы, переносимые без изменений; свойства из fields; 'reason'}
+    """
+    t = chunk['t']
+    p = chunk.get('p', p_0)
+    if 'RH' in chunk:
+        RH = chunk['RH'] / 100. if RH_percent else chunk['RH']
+        props, reason = calc_props(t, RH=RH, p=p, errors='nan')
+    else:
+        props, reason = calc_props(t, d=chunk['d'], p=p, errors='nan')
+    result = {name: value for name, value in chunk.items() if name not in ('t', 'RH', 'd', 'p')}
+    for name in fields:
+        value = getattr(props, name)
+        result[name] = value * 100. if name == 'RH' and RH_percent else value
+    result['reason'] = reason
+    return result
+
+
+class __CsvWriter:
+    """
+    Запись частей результата в CSV-файл
+    """
+
+    def __init__(self, path, delimiter):
+        """
+        path: путь к файлу
+        delimiter: разделитель столбцов
+        """
+        self.__file = open(path, 'w', newline='', encoding='utf-8')
+        self.__delimiter = delimiter
+        self.__header = None
+
+    def write(self, result):
+        """
+        Запись части результата
+        result: словарь {имя столбца: массив или список значений}
+        return: None
+        """
+        if self.__header is None:
+            self.__header = list(result)
+            self.__file.write(self.__delimiter.join(self.__format(self.__header)) + '\n')
+        columns = [self.__format(result[name]) for name in self.__header]
+        self.__file.write('\n'.join(map(self.__delimiter.join, zip(*columns))) + '\n')
+
+    def close(self):
+        """
+        Закрытие файла
+        return: None
+        """
+        self.__file.close()
+
+    def __format(self, values):
+        """
+        Преобразование столбца в список строк (строки, содержащие разделитель или кавычки, заключаются в кавычки)
+        values: массив numpy или список значений
+        return: список строк
+        """
+        if isinstance(values, np.ndarray):
+            if values.dtype.kind == 'f':
+                return ['%.12g' % value for value in values.tolist()]
+            values = values.tolist()
+        special = (self.__delimiter, '"', '\n', '\r')
+        values = [str(value) for value in values]
+        return [f'"{value.replace(chr(34), chr(34) * 2)}"' if any(c in value for c in special) else value
+                for value in values]
+
+
+class __ParquetWriter:
+    """
+    Запись частей результата в файл Parquet (требуется пакет pyarrow)
+    """
+
+    def __init__(self, path, pa):
+        """
+        path: путь к файлу
+        pa: модуль pyarrow
+        """
+        self.__pa = pa
+        self.__path = path
+        self.__writer = None
+
+    def write(self, result):
+        """
+        Запись части результата
+        result: словарь {имя столбца: массив или список значений}
+        return: None
+        """
+        table = self.__pa.table({name: self.__pa.array(value) for name, value in result.items()})
+        if self.__writer is None:
+            self.__writer = self.__pa.parquet.ParquetWriter(self.__path, table.schema)
+        self.__writer.write_table(table)
+
+    def close(self):
+        """
+        Закрытие файла
+        return: None
+        """
+        if self.__writer is not None:
+            self.__writer.close()
+
+
+def __import_parquet(arrow = False):
+    """
+    Импорт модуля pyarrow.parquet
+    arrow: True - возвращается модуль pyarrow, False - pyarrow.parquet
+    return: модуль
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ValueError('Для работы с файлами Parquet требуется пакет pyarrow (pip install pyarrow)') from None
+    return pyarrow if arrow else pyarrow.parquet
@@ -20,6 +20,11 @@ __status__ = "Production"
 from .hsdiag import HSDiag  # Основной (сводный) расчётный класс
 from .region1 import Region1  # Область 1
 from .region2 import Region2  # Область 2
+from .region3 import Region3  # Область 3
 from .region4 import Region4  # Область 4
 from .saturationcurve import SaturationCurve  # Линия насыщения
 from .visc import Visc  # Расчёт динамической и кинематической вязкости
+from .regionclassifier import RegionClassifier  # Определение области по [p, h] и [p, s]
+from .hssolver import HSSolver  # Определение T, p и области по [h, s]
+from .sbtl import SBTL  # Быстрый табличный расчёт свойств (Spline-Based Table Look-up)
+from .engines import Engines, get_engines  # Общий для процесса набор расчётных объектов
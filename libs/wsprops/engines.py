@@ -0,0 +1,96 @@
+"""
+В модуле размещён класс Engines - общий для процесса набор расчётных объектов (HSDiag, Region1, Region2,
+Region3, Region4, SaturationCurve), и функция get_engines, возвращающая его единственный экземпляр.
+Объекты создаются и "прогреваются" (выполняется пробный расчёт каждым методом) один раз при первом
+обращении, поэтому повторное создание объектов и первые расчёты не увеличивают время отклика.
+-------------------------------------------------
+'Инженерные расчёты на Python'
+https://zen.yandex.ru/id/5f33dcd5554adc5b33aaee83
+https://medsv.github.io/dzen/
+"""
+
+__author__ = "Сергей Медведев"
+__copyright__ = "Сергей Медведев, 2021"
+__license__ = "GPL"
+__version__ = "1.0"
+__maintainer__ = "Сергей Медведев"
+__email__ = "engpython@yandex.ru"
+__status__ = "Production"
+
+from threading import Lock, RLock
+import numpy as np
+from .hsdiag import HSDiag
+from .visc import Visc
+
+
+class Engines:
+    """
+    Общий набор расчётных объектов.
+    Объекты сохраняют результаты последнего расчёта в своих атрибутах (props, props_w, props_s, curReg),
+    поэтому при обращении из нескольких потоков (сессий Streamlit) расчёт вместе с чтением результатов
+    выполняется под блокировкой lock. Настройки объектов после создания изменять не следует.
+    """
+
+    def __init__(self, warm_up=True):
+        """
+        warm_up: True - выполнить пробный расчёт каждым методом
+        """
+        self.hs = HSDiag()
+        self.region1 = self.hs.region1
+        self.region2 = self.hs.region2
+        self.region3 = self.hs.region3
+        self.region4 = self.hs.region4
+        self.sc = self.hs.sc
+        self.lock = RLock()
+        Visc.set_hs(self.hs)
+        if warm_up:
+            self.warm_up()
+
+    def warm_up(self):
+        """
+        Пробный расчёт каждым методом (скалярные значения и массивы)
+        return: None
+        """
+        with self.lock:
+            for p in (101325., np.array([101325., 1e6])):
+                self.sc.t_p(p)
+                self.sc.p_t(100.)
+                props = self.region1.props_tp(20., p)
+                self.region1.props_ph(p, props['h'])
+                self.region1.props_ps(p, props['s'])
+                Visc.visc_props(props)
+                props = self.region2.props_tp(300., p)
+                self.region2.props_ph(p, props['h'])
+                self.region2.props_ps(p, props['s'])
+                Visc.visc_props(props)
+                props = self.region3.props_Tp(700., p + 50e6)
+                Visc.visc_props(props)
+                props = self.region4.props_px(p, 0.5)
+                self.region4.props_ph(p, props['h'])
+                self.region4.props_ps(p, props['s'])
+                self.region4.dh_p(p)
+                self.hs.props_tp(20., p)
+                self.hs.props_Tp(700., p + 50e6)
+                self.hs.props_ph(p, props['h'])
+                self.hs.props_ps(p, props['s'])
+                self.hs.props_px(p, 0.5)
+                self.hs.props_hs(props['h'], props['s'])
+            self.region4.props_T(373.15)
+            self.region4.cache.clear()
+
+
+__engines = None
+__engines_lock = Lock()
+
+
+def get_engines():
+    """
+    Получение общего для процесса набора расчётных объектов (создаётся при первом вызове)
+    return: объект Engines
+    """
+    global __engines
+    if __engines is None:
+        with __engines_lock:
+            if __engines is None:
+                __engines = Engines()
+    return __engines
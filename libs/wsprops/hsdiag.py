@@ -1,5 +1,5 @@
 """
-В модуле размещён класс HSDiag, содержащий методы для расчёта теплофизических свойств воды и водяного пара (области 1, 2 и частично 4)
+В модуле размещён класс HSDiag, содержащий методы для расчёта теплофизических свойств воды и водяного пара (области 1, 2, 3 и частично 4)
 Допустимый диапазон далений для области 4: 611,213 Па - 16,529 МПа
 Методика расчёта взята из документа
 http://www.iapws.org/relguide/IF97-Rev.pdf
@@ -12,27 +12,50 @@ https://medsv.github.io/dzen/
 __author__ = "Сергей Медведев"
 __copyright__ = "Сергей Медведев, 2021"
 __license__ = "GPL"
-__version__ = "1.0"
+__version__ = "1.6"
 __maintainer__ = "Сергей Медведев"
 __email__ = "engpython@yandex.ru"
 __status__ = "Production"
 
+import numpy as np
+from .region3 import Region3
 from .region4 import Region4
+from .regionclassifier import RegionClassifier
+from .hssolver import HSSolver
+from .sbtl import SBTL
+from .scalarpoly import is_number
 
 class HSDiag():
     """
     Класс для расчёта теплофизических свойств воды и водяного пара
+    Отличие от версии 1.2: добавлен метод props_hs (расчёт по энтальпии и энтропии)
+    Отличие от версии 1.3: добавлена область 3 (расчёт по температуре и давлению)
+    Отличие от версии 1.4: область 3 добавлена в расчёт по давлению и энтальпии (энтропии);
+    табличный расчёт (SBTL) и расчёт по энтальпии и энтропии выполняются только в областях 1, 2 и 4
+    Отличие от версии 1.5: в методе props_hs добавлен параметр exact (по умолчанию - расчёт по обратным уравнениям
+    без итераций)
     """
-    def __init__(self):
+    def __init__(self, sbtl=False, sbtl_path=None):
         """
         Инициализация параметров
-        """        
+        sbtl: True - быстрый табличный расчёт (SBTL) методами props_Tp, props_tp, props_ph, props_px, props_p,
+              False - расчёт по уравнениям IF97
+        sbtl_path: каталог таблиц SBTL (см. класс SBTL), None - таблицы рассчитываются при создании первого
+                   объекта и используются всеми объектами HSDiag
+        """
         self.region4 = Region4()
         self.region1 = self.region4.region1
         self.region2 = self.region4.region2
         self.sc = Region4.sc
-        self.regions = [self.region1, self.region2, self.region4]
+        self.region3 = Region3()
+        # Область 3 - последняя: индексы областей 1, 2, 4 совпадают с индексами RegionClassifier и HSSolver
+        self.regions = [self.region1, self.region2, self.region4, self.region3]
+        # Определение области по [p, h] и [p, s] по предварительно рассчитанным граничным кривым
+        self.classifier = RegionClassifier(self.region1, self.region2, self.region4, self.region3)
+        # Определение T, p и области по [h, s]
+        self.hs_solver = HSSolver(self.region1, self.region2, self.region4)
         self.curReg = None
+        self.sbtl = SBTL(self, sbtl_path) if sbtl else None
 
     def props_Tp(self, T, p):
         """
@@ -41,6 +64,11 @@ class HSDiag():
         p: давление, Па
         return: словарь свойств
         """
+        if self.sbtl is not None:
+            self.curReg = None
+            return self.sbtl.props_Tp(T, p)
+        if not is_number(T, p) and (np.ndim(T) or np.ndim(p)):
+            return self.__props_arr(self.__classify_Tp, 'props_Tp', T, p, "T={} К, p={} Па")
         self.curReg = None
         for region in self.regions:
             if region.Tp_in(T, p):
@@ -54,7 +82,12 @@ class HSDiag():
         t: температура, C
         p: давление, Па
         return: словарь свойств
-        """        
+        """
+        if self.sbtl is not None:
+            self.curReg = None
+            return self.sbtl.props_tp(t, p)
+        if not is_number(t, p) and (np.ndim(t) or np.ndim(p)):
+            return self.props_Tp(np.asarray(t, dtype=float) + 273.15, p)
         for region in self.regions:
             self.curReg = None
             if region.tp_in(t, p):
@@ -69,11 +102,15 @@ class HSDiag():
         h: энтальпия, Дж/кг
         return: словарь свойств
         """
-        self.curReg = None
-        for region in self.regions:
-            if region.ph_in(p, h):
-                self.curReg = region
-                return region.props_ph(p, h)
+        if self.sbtl is not None:
+            self.curReg = None
+            return self.sbtl.props_ph(p, h)
+        if not is_number(p, h) and (np.ndim(p) or np.ndim(h)):
+            return self.__props_arr(lambda p, h: self.classifier.classify(p, h, 'h'),
+                                    'props_ph', p, h, "p={} Па, h={} Дж/кг")
+        self.curReg = self.classifier.region_pX(p, h, 'h')
+        if self.curReg is not None:
+            return self.curReg.props_ph(p, h)
         self.__error(f"p={p} Па, h={h} Дж/кг")
 
     def props_ps(self, p, s):
@@ -83,13 +120,57 @@ class HSDiag():
         s: энтропия, Дж/кг/К
         return: словарь свойств.
         """
-        self.curReg = None       
-        for region in self.regions:
-            if region.ps_in(p, s):
-                self.curReg = region
-                return region.props_ps(p, s)
+        if not is_number(p, s) and (np.ndim(p) or np.ndim(s)):
+            return self.__props_arr(lambda p, s: self.classifier.classify(p, s, 's'),
+                                    'props_ps', p, s, "p={} Па, s={} Дж/кг/К")
+        self.curReg = self.classifier.region_pX(p, s, 's')
+        if self.curReg is not None:
+            return self.curReg.props_ps(p, s)
         self.__error(f"p={p} Па, s={s} Дж/кг/К")  
 
+    def props_hs(self, h, s, exact=False):
+        """
+        Расчёт теплофизических свойств воды и водяного пара по энтальпии и энтропии (области 1, 2 и 4).
+        Область, температура и давление определяются классом HSSolver: при exact=False - по граничным
+        уравнениям Supp-phs3 и обратным уравнениям Supp-PHS12 без итераций (результат согласован с IF97
+        с погрешностью обратных уравнений: до 25 мК по температуре; в области 4 при s < s''(623,15 K)
+        температура насыщения определяется итерационно), при exact=True - итерационно по прямым уравнениям IF97
+        (в 2-8 раз медленнее). Свойства в найденной точке рассчитываются по уравнениям IF97 (и при sbtl=True).
+        h: энтальпия, Дж/кг
+        s: энтропия, Дж/кг/К
+        exact: False - по обратным уравнениям, True - итерационный расчёт, согласованный с уравнениями IF97
+        return: словарь свойств
+        """
+        self.curReg = None
+        if not is_number(h, s) and (np.ndim(h) or np.ndim(s)):
+            h, s = (np.array(a, dtype=float) for a in np.broadcast_arrays(h, s))
+            shape = h.shape
+            h, s = h.ravel(), s.ravel()
+            nums, T, p = self.hs_solver.solve(h, s, exact)
+            if np.any(nums < 0):
+                i = np.flatnonzero(nums < 0)[0]
+                self.__error(f"h={h[i]} Дж/кг, s={s[i]} Дж/кг/К")
+            props = self.__gather(nums, lambda region, idx: self.__props_hs_region(region, T[idx], p[idx], h[idx]))
+            return {key: value.reshape(shape) for key, value in props.items()}
+        num, T, p = self.hs_solver.solve_point(float(h), float(s), exact)
+        if num < 0:
+            self.__error(f"h={h} Дж/кг, s={s} Дж/кг/К")
+        self.curReg = self.regions[num]
+        return self.__props_hs_region(self.curReg, T, p, h)
+
+    def __props_hs_region(self, region, T, p, h):
+        """
+        Расчёт свойств в области по найденным температуре и давлению
+        region: объект области
+        T: температура, К
+        p: давление, Па
+        h: энтальпия, Дж/кг (для области 4, где T и p взаимозависимы)
+        return: словарь свойств
+        """
+        if region is self.region4:
+            return region.props_ph(p, h)
+        return region.props_Tp(T, p)
+
     def props_px(self, p, x):
         """
         Расчёт теплофизических свойств влажного водяного пара по давлению и степени сухости.
@@ -97,7 +178,13 @@ class HSDiag():
         x: степень сухости x = [0; 1]
         return: словарь свойств.
         """
+        if self.sbtl is not None:
+            self.curReg = None
+            return self.sbtl.props_px(p, x)
         self.curReg = None         
+        if not is_number(p, x) and (np.ndim(p) or np.ndim(x)):
+            self.__check_arr(self.region4.p_in(p) & self.region4.x_in(x), "p={} Па, x={}", p, x)
+            return self.region4.props_px(p, x)
         if self.region4.px_in(p, x):
             self.curReg = self.region4
             return self.region4.props_px(p, x)
@@ -109,7 +196,13 @@ class HSDiag():
         p: давление, Па
         return: кортеж двух словарей: 0 - кипящая вода, 1 - сухой насыщенный пар
         """
+        if self.sbtl is not None:
+            self.curReg = None
+            return self.sbtl.props_p(p)
         self.curReg = None
+        if not is_number(p) and np.ndim(p):
+            self.__check_arr(self.region4.p_in(p), "p={} Па", p)
+            return self.region4.props_p(p)
         if self.region4.p_in(p):
             self.curReg = self.region4
             return self.region4.props_p(p)
@@ -121,7 +214,7 @@ class HSDiag():
         T: температура, К
         return: абсолютное давление, Па
         """
-        if self.sc.T_in(T):
+        if np.all(self.sc.T_in(T)):
             return self.sc.p_T(T)
         self.__error(f"T={T} К")
 
@@ -139,7 +232,7 @@ class HSDiag():
         p: абсолютное давление, Па
         return: температура, К
         """
-        if self.sc.p_in(p):
+        if np.all(self.sc.p_in(p)):
             return self.sc.T_p(p)
         self.__error(f"p={p} Па")  
 
@@ -157,7 +250,7 @@ class HSDiag():
         p: давление, Па
         return: скрытая теплота парообразования, Дж/кг
         """
-        if self.sc.p_in(p):
+        if np.all(self.sc.p_in(p)):
             return self.region4.dh_p(p)
         self.__error(f"p={p} Па")
     
@@ -167,10 +260,80 @@ class HSDiag():
         p: давление, Па
         return: значение s'' - s', Дж/кг/К
         """
-        if self.sc.p_in(p):
+        if np.all(self.sc.p_in(p)):
             return self.region4.ds_p(p)
         self.__error(f"p={p} Па")
 
+    def __classify_Tp(self, T, p):
+        """
+        Определение областей для массивов точек [T, p] с помощью булевых масок (методы Tp_mask областей)
+        T: температура, К (одномерный массив numpy)
+        p: давление, Па (одномерный массив numpy)
+        return: массив индексов областей в self.regions, -1 для точек, лежащих вне областей
+        """
+        nums = np.full(T.size, -1)
+        rest = np.arange(T.size)  # индексы точек, ещё не отнесённых к области
+        for num, region in enumerate(self.regions):
+            if not rest.size:
+                break
+            mask = region.Tp_mask(T[rest], p[rest])
+            nums[rest[mask]] = num
+            rest = rest[~mask]
+        return nums
+
+    def __props_arr(self, classify, props_method, a, b, descr):
+        """
+        Расчёт теплофизических свойств для массивов входных параметров.
+        Каждая точка относится к одной из областей, расчёт в каждой области выполняется
+        одним вызовом для подмножества её точек, результаты собираются в выходные массивы
+        в исходном порядке точек.
+        classify: функция, возвращающая для массивов a, b массив индексов областей в self.regions (-1 - вне областей)
+        props_method: имя метода области, рассчитывающего свойства ('props_Tp', 'props_ph', 'props_ps')
+        a, b: массивы входных параметров (с учётом правил broadcasting)
+        descr: шаблон описания точки для сообщения об ошибке
+        return: словарь свойств, значения словаря - массивы формы входных параметров
+        """
+        self.curReg = None
+        a, b = (np.array(v, dtype=float) for v in np.broadcast_arrays(a, b))
+        shape = a.shape
+        a, b = a.ravel(), b.ravel()
+        nums = classify(a, b)
+        if np.any(nums < 0):
+            i = np.flatnonzero(nums < 0)[0]
+            self.__error(descr.format(a[i], b[i]))
+        props = self.__gather(nums, lambda region, idx: getattr(region, props_method)(a[idx], b[idx]))
+        return {key: value.reshape(shape) for key, value in props.items()}
+
+    def __gather(self, nums, calc):
+        """
+        Расчёт свойств по областям и сборка результатов в выходные массивы в исходном порядке точек
+        nums: массив индексов областей в self.regions
+        calc: функция calc(region, idx), возвращающая словарь свойств для точек idx области region
+        return: словарь свойств, значения словаря - одномерные массивы
+        """
+        props = {}
+        for num, region in enumerate(self.regions):
+            idx = np.flatnonzero(nums == num)
+            if not idx.size:
+                continue
+            for key, value in calc(region, idx).items():
+                if key not in props:
+                    props[key] = np.full(nums.size, np.nan)
+                props[key][idx] = value
+        return props
+
+    def __check_arr(self, mask, descr, *args):
+        """
+        Генерация исключения, если хотя бы одна точка массива лежит вне допустимой области
+        mask: булев массив, True для допустимых точек
+        descr: шаблон описания точки для сообщения об ошибке
+        args: массивы входных параметров
+        return: None
+        """
+        if not np.all(mask):
+            args = np.broadcast_arrays(*args)
+            self.__error(descr.format(*(arg[~mask][0] for arg in args)))
+
     def __error(self, str):
         """
         Генерация исключения
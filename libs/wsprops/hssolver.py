@@ -0,0 +1,687 @@
+"""
+В модуле размещён класс HSSolver, определяющий температуру, давление и область (1, 2 или 4) по паре параметров
+[h, s] (энтальпия, энтропия).
+Начальные приближения дают дополнительные обратные уравнения IAPWS (Supplementary Release on Backward Equations
+p(h,s) for Regions 1 and 2, T_sat(h,s) for Region 4, http://www.iapws.org/relguide/Supp-PHS12-2014.pdf):
+p(h, s) для области 1, p(h, s) для подобластей 2a, 2b, 2c и T_sat(h, s) для области 4 (при s >= s''(623,15 K)).
+Границы областей в плоскости h-s задаются уравнениями IAPWS (Revised Supplementary Release on Backward Equations
+p(h,s) for Region 3, Equations as a Function of h and s for the Region Boundaries, and an Equation T_sat(h,s)
+for Region 4, http://www.iapws.org/relguide/Supp-phs3-2014.pdf): линия кипящей воды h'1(s) (s <= s'(623,15 K)),
+линия сухого насыщенного пара h''2ab(s) (s >= 5,85 кДж/кг/К) и h''2c3b(s) (s''(623,15 K) <= s < 5,85 кДж/кг/К),
+граница областей 1 и 3 h_B13(s) и граница областей 2 и 3 T_B23(h, s). Нижняя граница области 4 и её верхняя
+граница между линиями насыщения - изобары-изотермы T_min и T_max (отрезки прямых с наклоном, равным температуре).
+Расчёт выполняется в одном из двух режимов (параметр exact методов solve и solve_point):
+- exact=False (по умолчанию): область определяется по граничным уравнениям, температура и давление - по обратным
+  уравнениям без итераций (p(h, s) и T(p, h) в областях 1 и 2, T_sat(h, s) в области 4 при s >= s''(623,15 K)).
+  Результат согласован с прямыми уравнениями IF97 с погрешностью обратных уравнений (до 25 мК по температуре,
+  до 0,55% по давлению в области 1 вблизи линии насыщения при низких давлениях, 6e-5 - в области 2), степень
+  сухости вблизи линий насыщения может выходить за пределы [0, 1] на величину этой погрешности.
+  Для области 4 при s < s''(623,15 K) обратного уравнения нет, температура насыщения определяется итерациями;
+- exact=True: результат уточняется итерационным расчётом, который вычисляет прямые уравнения IF97 сразу для всего
+  массива точек и даёт результат, согласованный с ними (расчёт одной точки в 2-8 раз медленнее):
+- область 4: температура насыщения - корень уравнения f(T) = h - h' - L * (s - s') = 0, где L = (h'' - h') / (s'' - s')
+  (точка лежит на изобаре-изотерме, соединяющей точки кипящей воды и сухого насыщенного пара; L близко к T).
+  Производная f' близка к s' - s - v' * dp/dT, функция выпукла, поэтому метод Ньютона сходится к корню как
+  от начального приближения T_sat(h, s), так и (при s < s''(623,15 K)) от T_min;
+- области 1 и 2: метод Ньютона по T и p (для области 2 - по T и ln(p)) с якобианом из тождеств
+  dh = cp * dT + (v - T * (dv/dT)_p) * dp, ds = cp / T * dT - (dv/dT)_p * dp; начальное приближение давления -
+  по уравнению p(h, s), температуры - по обратному уравнению IF97 T(p, h).
+Для одной точки (метод solve_point) те же итерации выполняются над числами float (без массивов numpy).
+В этом режиме границы используются только для отбора точек, для которых выполняется расчёт: для области 4 -
+граничные уравнения с запасом band, для областей 1 и 2 - диапазоны энтропии (области по энтропии
+не пересекаются). Точка относится к области, если решение сошлось и лежит в её пределах (для области 4 -
+0 <= x <= 1, для областей 1 и 2 - методы Tp_mask), поэтому результат на границах не зависит от погрешности
+граничных уравнений.
+Отличие версии 1.1 от 1.0: начальные приближения - по обратным уравнениям Supp-PHS12 (было: давление 10 МПа
+для области 1, p_min - для области 2, T_min - для области 4).
+Отличие версии 1.2 от 1.1: добавлен режим exact=False (используется по умолчанию); линии насыщения - по граничным
+уравнениям Supp-phs3 (были рассчитаны в узлах сетки по температуре при создании объекта). Время расчёта одной
+точки HSDiag.props_hs (timeit, Python 3.11, numpy 2.4; в скобках - при exact=True): область 1 - 16 (53) мкс,
+область 2 - 25 (57) мкс, область 4 - 10 (74) мкс при s >= s''(623,15 K) и 17 (48) мкс при s < s''(623,15 K).
+-------------------------------------------------
+'Инженерные расчёты на Python'
+https://zen.yandex.ru/id/5f33dcd5554adc5b33aaee83
+https://medsv.github.io/dzen/
+"""
+
+__author__ = "Сергей Медведев"
+__copyright__ = "Сергей Медведев, 2021"
+__license__ = "GPL"
+__version__ = "1.2"
+__maintainer__ = "Сергей Медведев"
+__email__ = "engpython@yandex.ru"
+__status__ = "Production"
+
+from math import exp, isfinite
+import numpy as np
+from .scalarpoly import ScalarPoly
+
+
+class HSSolver:
+    """
+    Определение температуры, давления и области по паре параметров [h, s] для массивов точек
+    """
+    max_iter = 50  # Максимальное количество итераций метода Ньютона
+    rtol = 1e-11  # Относительная погрешность T и p, при которой итерации прекращаются
+    T_tol = 1e-6  # Допуск по температуре при проверке принадлежности точки области, К
+    s_margin = 1.  # Запас при отборе точек для областей 1 и 2 по энтропии, Дж/кг/К
+    # Допуски при проверке границ областей 1 и 2 по результату обратных уравнений (exact=False): отклонение
+    # обратных уравнений от прямых - до 25 мК по температуре и до 0,55% по давлению
+    T_tol_backward = 0.05  # К
+    p_rtol_backward = 6e-3
+    # Допуск по энтропии в точке (T, p), найденной по обратным уравнениям (до 0,32 Дж/кг/К внутри областей):
+    # вне областей применимости обратные уравнения могут давать T и p, лежащие в пределах области
+    s_tol_backward = 1.  # Дж/кг/К
+    # Обратное уравнение p(h, s) для области 1 (Supp-PHS12, Table 2)
+    _p1_hs_poly = ScalarPoly(
+        I=[0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 2, 2, 2, 3, 4, 4, 5],
+        J=[0, 1, 2, 4, 5, 6, 8, 14, 0, 1, 4, 6, 0, 1, 10, 4, 1, 4, 0],
+        n=[-0.691997014660582, -18.361254878756, -9.28332409297335, 65.9639569909906, -16.2060388912024,
+           450.620017338667, 854.68067822417, 6075.23214001162, 32.6487682621856, -26.9408844582931, -319.9478483343,
+           -928.35430704332, 30.3634537455249, -65.0540422444146, -4309.9131651613, -747.512324096068,
+           730.000345529245, 1142.84032569021, -436.407041874559])
+    # Граница подобластей 2a и 2b h_2ab(s) (Supp-PHS12, Table 5): коэффициенты при s^0...s^3, кДж/кг
+    _h2ab_coefs = (-3498.98083432139, 2575.60716905876, -421.073558227969, 27.6349063799944)
+    s2bc = 5850.  # Граница подобластей 2b и 2c по энтропии, Дж/кг/К
+    # Обратное уравнение p(h, s) для подобласти 2a (Supp-PHS12, Table 6)
+    _p2a_hs_poly = ScalarPoly(
+        I=[0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 3, 3, 3, 3, 3, 4, 5, 5, 6, 7],
+        J=[1, 3, 6, 16, 20, 22, 0, 1, 2, 3, 5, 6, 10, 16, 20, 22, 3, 16, 20, 0, 2, 3, 6, 16, 16, 3, 16, 3, 1],
+        n=[-0.0182575361923032, -0.125229548799536, 0.592290437320145, 6.04769706185122, 238.624965444474,
+           -298.639090222922, 0.051225081304075, -0.437266515606486, 0.413336902999504, -5.16468254574773,
+           -5.57014838445711, 12.8555037824478, 11.414410895329, -119.504225652714, -2847.7798596156,
+           4317.57846408006, 1.1289404080265, 1974.09186206319, 1516.12444706087, 0.0141324451421235,
+           0.585501282219601, -2.97258075863012, 5.94567314847319, -6236.56565798905, 9659.86235133332,
+           6.81500934948134, -6332.07286824489, -5.5891922446576, 0.0400645798472063])
+    # Обратное уравнение p(h, s) для подобласти 2b (Supp-PHS12, Table 7)
+    _p2b_hs_poly = ScalarPoly(
+        I=[0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 2, 2, 2, 3, 3, 3, 3, 4, 4, 5, 5, 6, 6, 6, 7, 7, 8, 8, 8, 8, 12, 14],
+        J=[0, 1, 2, 4, 8, 0, 1, 2, 3, 5, 12, 1, 6, 18, 0, 1, 7, 12, 1, 16, 1, 12, 1, 8, 18, 1, 16, 1, 3, 14, 18, 10,
+           16],
+        n=[0.0801496989929495, -0.543862807146111, 0.337455597421283, 8.9055545115745, 313.840736431485,
+           0.797367065977789, -1.2161697355624, 8.72803386937477, -16.9769781757602, -186.552827328416,
+           95115.9274344237, -18.9168510120494, -4334.0703719484, 543212633.012715, 0.144793408386013,
+           128.024559637516, -67230.9534071268, 33697238.0095287, -586.63419676272, -22140322476.9889,
+           1716.06668708389, -570817595.806302, -3121.09693178482, -2078413.8463301, 3056059461577.86,
+           3221.57004314333, 326810259797.295, -1441.04158934487, 410.694867802691, 109077066873.024,
+           -24796465425889.3, 1888019068.65134, -123651009018773.0])
+    # Обратное уравнение p(h, s) для подобласти 2c (Supp-PHS12, Table 8)
+    _p2c_hs_poly = ScalarPoly(
+        I=[0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 3, 3, 3, 3, 3, 4, 5, 5, 5, 5, 6, 6, 10, 12, 16],
+        J=[0, 1, 2, 3, 4, 8, 0, 2, 5, 8, 14, 2, 3, 7, 10, 18, 0, 5, 8, 16, 18, 18, 1, 4, 6, 14, 8, 18, 7, 7, 10],
+        n=[0.112225607199012, -3.39005953606712, -32.0503911730094, -197.5973051049, -407.693861553446,
+           13294.3775222331, 1.70846839774007, 37.3694198142245, 3581.44365815434, 423014.446424664,
+           -751071025.760063, 52.3446127607898, -228.351290812417, -960652.417056937, -80705929.2526074,
+           1626980172256.69, 0.772465073604171, 46392.9973837746, -13731788.5134128, 1704703926305.12,
+           -25110462818730.8, 31774883083552.0, 53.8685623675312, -55308.9094625169, -1028615.22421405,
+           2042494187562.34, 273918446.626977, -2.63963146312685e+15, -1078908541.08088, -29649262098.0124,
+           -1.11754907323424e+15])
+    # Обратное уравнение T_sat(h, s) для области 4 при s >= s''(623,15 K) (Supp-PHS12, Table 9)
+    _T4_hs_poly = ScalarPoly(
+        I=[0, 0, 0, 1, 1, 1, 1, 2, 2, 2, 3, 3, 3, 3, 4, 4, 5, 5, 5, 5, 6, 6, 6, 8, 10, 10, 12, 14, 14, 16, 16, 18, 18,
+           18, 20, 28],
+        J=[0, 3, 12, 0, 1, 2, 5, 0, 5, 8, 0, 2, 3, 4, 0, 1, 1, 2, 4, 16, 6, 8, 22, 1, 20, 36, 24, 1, 28, 12, 32, 14,
+           22, 36, 24, 36],
+        n=[0.179882673606601, -0.267507455199603, 1.162767226126, 0.147545428713616, -0.512871635973248,
+           0.421333567697984, 0.56374952218987, 0.429274443819153, -3.3570455214214, 10.8890916499278,
+           -0.248483390456012, 0.30415322190639, -0.494819763939905, 1.07551674933261, 0.0733888415457688,
+           0.0140170545411085, -0.106110975998808, 0.0168324361811875, 1.25028363714877, 1013.16840309509,
+           -1.51791558000712, 52.4277865990866, 23049.5545563912, 0.0249459806365456, 2107964.67412137,
+           366836848.613065, -144814105.365163, -0.0017927637300359, 4899556021.00459, 471.262212070518,
+           -82929439019.8652, -1715.45662263191, 3557776.82973575, 586062760258.436, -12988763.5078195,
+           31724744937.1057])
+
+    # Линия кипящей воды h'1(s) при s <= s'(623,15 K) (Supp-phs3)
+    _h1_s_poly = ScalarPoly(
+        I=[0, 0, 1, 1, 2, 2, 3, 3, 4, 4, 4, 5, 5, 7, 8, 12, 12, 14, 14, 16, 20, 20, 22, 24, 28, 32, 32],
+        J=[14, 36, 3, 16, 0, 5, 4, 36, 4, 16, 24, 18, 24, 1, 4, 2, 4, 1, 22, 10, 12, 28, 8, 3, 0, 6, 8],
+        n=[0.332171191705237, 6.11217706323496e-4, -8.82092478906822, -0.45562819254325, -2.63483840850452e-5,
+           -22.3949661148062, -4.28398660164013, -0.616679338856916, -14.682303110404, 284.523138727299,
+           -113.398503195444, 1156.71380760859, 395.551267359325, -1.54891257229285, 19.4486637751291,
+           -3.57915139457043, -3.35369414148819, -0.66442679633246, 32332.1885383934, 3317.66744667084,
+           -22350.1257931087, 5739538.75852936, 173.226193407919, -0.0363968822121321, 8.34596332878346e-7,
+           5.03611916682674, 65.5444787064505])
+    # Линия сухого насыщенного пара h''2ab(s) при s >= 5,85 кДж/кг/К (Supp-phs3)
+    _h2ab_s_poly = ScalarPoly(
+        I=[1, 1, 2, 2, 4, 4, 7, 8, 8, 10, 12, 12, 18, 20, 24, 28, 28, 28, 28, 28, 32, 32, 32, 32, 32, 36, 36, 36, 36,
+           36],
+        J=[8, 24, 4, 32, 1, 2, 7, 5, 12, 1, 0, 7, 10, 12, 32, 8, 12, 20, 22, 24, 2, 7, 12, 14, 24, 10, 12, 20, 22, 28],
+        n=[-524.581170928788, -9269472.18142218, -237.385107491666, 21077015581.2776, -23.9494562010986,
+           221.802480294197, -5104725.33393438, 1249813.96109147, 2000084369.96201, -815.158509791035,
+           -157.612685637523, -11420042233.2791, 6.62364680776872e+15, -2.27622818296144e+18, -1.71048081348406e+31,
+           6.60788766938091e+15, 1.66320055886021e+22, -2.18003784381501e+29, -7.87276140295618e+29,
+           1.51062329700346e+31, 7957321.70300541, 1.31957647355347e+15, -3.2509706829914e+23, -4.18600611419248e+25,
+           2.97478906557467e+34, -9.53588761745473e+19, 1.66957699620939e+24, -1.75407764869978e+32,
+           3.47581490626396e+34, -7.10971318427851e+38])
+    # Линия сухого насыщенного пара h''2c3b(s) при s''(623,15 K) <= s < 5,85 кДж/кг/К (Supp-phs3)
+    _h2c3b_s_poly = ScalarPoly(
+        I=[0, 0, 0, 1, 1, 5, 6, 7, 8, 8, 12, 16, 22, 22, 24, 36],
+        J=[0, 3, 4, 0, 12, 36, 12, 16, 2, 20, 32, 36, 2, 32, 7, 20],
+        n=[1.04351280732769, -2.27807912708513, 1.80535256723202, 0.420440834792042, -105721.24483466,
+           4.36911607493884e+24, -328032702839.753, -6.7868676080427e+15, 7439.57464645363, -3.56896445355761e+19,
+           1.67590585186801e+31, -3.55028625419105e+37, 396611982166.538, -4.14716268484468e+40,
+           3.59080103867382e+18, -1.16994334851995e+40])
+    # Граница областей 1 и 3 h_B13(s) (Supp-phs3)
+    _hB13_s_poly = ScalarPoly(
+        I=[0, 1, 1, 3, 5, 6],
+        J=[0, -2, 2, -12, -4, -3],
+        n=[0.913965547600543, -4.30944856041991e-5, 60.3235694765419, 1.17518273082168e-18, 0.220000904781292,
+           -69.0815545851641])
+    # Граница областей 2 и 3 T_B23(h, s) (Supp-phs3)
+    _TB23_hs_poly = ScalarPoly(
+        I=[-12, -10, -8, -4, -3, -2, -2, -2, -2, 0, 1, 1, 1, 3, 3, 5, 6, 6, 8, 8, 8, 12, 12, 14, 14],
+        J=[10, 8, 3, 4, 3, -6, 2, 3, 4, 0, -3, -2, 10, -2, -1, -5, -6, -3, -8, -2, -1, -12, -1, -12, 1],
+        n=[6.2909626082981e-4, -8.23453502583165e-4, 5.15446951519474e-8, -1.17565945784945, 3.48519684726192,
+           -5.07837382408313e-12, -2.84637670005479, -2.36092263939673, 6.01492324973779, 1.48039650824546,
+           3.60075182221907e-4, -0.0126700045009952, -1221843.32521413, 0.149276502463272, 0.698733471798484,
+           -0.0252207040114321, 0.0147151930985213, -1.08618917681849, -9.36875039816322e-4, 81.9877897570217,
+           -182.041861521835, 2.61907376402688e-6, -29162.6417025961, 1.40660774926165e-5, 7832370.62349385])
+    s_b23_max = 5260.578707  # Наибольшая энтропия на границе областей 2 и 3 (Supp-phs3), Дж/кг/К
+
+    def __init__(self, region1, region2, region4):
+        """
+        region1, region2, region4: объекты областей 1, 2 и 4
+        """
+        self.region1 = region1
+        self.region2 = region2
+        self.region4 = region4
+        self.sc = region4.sc
+        # Концы изобар-изотерм T_min и T_max (нижняя граница области 4 и её верхняя граница между линиями
+        # насыщения): (s', h') и (s'', h'') при T_min (индекс 0) и T_max (индекс 1)
+        s_w, h_w, s_s, h_s = self.__sat_curves(np.array([region4.T_min, region4.T_max]))
+        self.s_w, self.h_w, self.s_s, self.h_s = (tuple(a.tolist()) for a in (s_w, h_w, s_s, h_s))
+        self.s4_min = self.s_s[1]  # Нижняя граница применимости уравнения T_sat(h, s) - s''(T_max), Дж/кг/К
+        # Запас по энтальпии при отборе точек области 4 (exact=True): отклонение граничных уравнений
+        # от линий насыщения IF97 - не более 6 Дж/кг
+        self.band = self.s_margin * region4.T_max  # Дж/кг
+        # Наименьшая энтропия границы областей 1 и 3 (изотерма T_max) - при p_max, Дж/кг/К
+        self.s_b13_min = float(region1.props_Tp(region1.T_max, region1.p_max, fields=('s',))['s'])
+        # Уравнение T_B23(h, s) применяется в диапазоне от (s''(T_max), h''(T_max)) до точки границы
+        # областей 2 и 3 при p_max (энтропия на границе сначала растёт до s_b23_max, затем убывает)
+        props = region2.props_Tp(region2.bound23.T_p(region2.p_max), region2.p_max, fields=('h', 's'))
+        self.h_b23_min, self.h_b23_max = self.h_s[1], float(props['h'])
+        self.s_b23_min = float(props['s'])
+        # Области 1 и 2 не пересекаются по энтропии: максимальная энтропия области 1 - s'(T_max),
+        # минимальная энтропия области 2 - s_b23_min. При exact=True метод Ньютона для области выполняется
+        # только для точек в её диапазоне энтропий (с запасом s_margin)
+        self.s1_max = self.s_w[1] + self.s_margin
+        self.s2_min = self.s_b23_min - self.s_margin
+
+    def h1_s(self, s):
+        """
+        Энтальпия кипящей воды по уравнению h'1(s) (Supp-phs3; s <= s'(623,15 K))
+        s: энтропия, Дж/кг/К (число или массив numpy)
+        return: энтальпия, Дж/кг (число или массив numpy)
+        """
+        sigma = s / 3.8e3
+        return 1700e3 * self._h1_s_poly(sigma - 1.09, sigma + 0.366e-4)
+
+    def h2_s(self, s):
+        """
+        Энтальпия сухого насыщенного пара по уравнениям h''2ab(s) (s >= 5,85 кДж/кг/К) и h''2c3b(s)
+        (s''(623,15 K) <= s < 5,85 кДж/кг/К) (Supp-phs3)
+        s: энтропия, Дж/кг/К (число или массив numpy)
+        return: энтальпия, Дж/кг (число или массив numpy)
+        """
+        if isinstance(s, float):
+            if s >= self.s2bc:
+                return 2800e3 * exp(self._h2ab_s_poly(5.21e3 / s - 0.513, s / 9.2e3 - 0.524))
+            return 2800e3 * self._h2c3b_s_poly(s / 5.9e3 - 1.02, s / 5.9e3 - 0.726) ** 4
+        h = np.empty(np.shape(s))
+        sub_ab = s >= self.s2bc
+        s_ab, s_c3b = s[sub_ab], s[~sub_ab]
+        h[sub_ab] = 2800e3 * np.exp(self._h2ab_s_poly.values(5.21e3 / s_ab - 0.513, s_ab / 9.2e3 - 0.524))
+        h[~sub_ab] = 2800e3 * self._h2c3b_s_poly.values(s_c3b / 5.9e3 - 1.02, s_c3b / 5.9e3 - 0.726) ** 4
+        return h
+
+    def hB13_s(self, s):
+        """
+        Энтальпия на границе областей 1 и 3 по уравнению h_B13(s) (Supp-phs3; s_b13_min <= s <= s'(623,15 K))
+        s: энтропия, Дж/кг/К (число или массив numpy)
+        return: энтальпия, Дж/кг (число или массив numpy)
+        """
+        sigma = s / 3.8e3
+        return 1700e3 * self._hB13_s_poly(sigma - 0.884, sigma - 0.864)
+
+    def TB23_hs(self, h, s):
+        """
+        Температура на границе областей 2 и 3 по уравнению T_B23(h, s) (Supp-phs3; точки в диапазоне
+        s_b23_min...s_b23_max, h_b23_min...h_b23_max)
+        h: энтальпия, Дж/кг (число или массив numpy)
+        s: энтропия, Дж/кг/К (число или массив numpy той же формы, что и h)
+        return: температура, К (число или массив numpy)
+        """
+        return 900. * self._TB23_hs_poly(h / 3000e3 - 0.727, s / 5.3e3 - 0.864)
+
+    def p1_hs(self, h, s):
+        """
+        Давление в области 1 по обратному уравнению p(h, s) (Supp-PHS12)
+        h: энтальпия, Дж/кг (число или массив numpy)
+        s: энтропия, Дж/кг/К (число или массив numpy той же формы, что и h)
+        return: давление, Па (число или массив numpy)
+        """
+        return 100e6 * self._p1_hs_poly(h / 3400e3 + 0.05, s / 7.6e3 + 0.05)
+
+    def p2_hs(self, h, s):
+        """
+        Давление в области 2 по обратным уравнениям p(h, s) для подобластей 2a, 2b, 2c (Supp-PHS12)
+        h: энтальпия, Дж/кг (число или массив numpy)
+        s: энтропия, Дж/кг/К (число или массив numpy той же формы, что и h)
+        return: давление, Па (число или массив numpy)
+        """
+        sigma = s / 1e3
+        h2ab = 1e3 * sum(c * sigma ** k for k, c in enumerate(self._h2ab_coefs))
+        if isinstance(h, float) and isinstance(s, float):
+            if h <= h2ab:
+                return 4e6 * self._p2a_hs_poly(h / 4200e3 - 0.5, s / 12e3 - 1.2) ** 4
+            if s >= self.s2bc:
+                return 100e6 * self._p2b_hs_poly(h / 4100e3 - 0.6, s / 7.9e3 - 1.01) ** 4
+            return 100e6 * self._p2c_hs_poly(h / 3500e3 - 0.7, s / 5.9e3 - 1.1) ** 4
+        p = np.empty(np.shape(h))
+        sub_a = h <= h2ab
+        sub_b = ~sub_a & (s >= self.s2bc)
+        sub_c = ~(sub_a | sub_b)
+        p[sub_a] = 4e6 * self._p2a_hs_poly.values(h[sub_a] / 4200e3 - 0.5, s[sub_a] / 12e3 - 1.2) ** 4
+        p[sub_b] = 100e6 * self._p2b_hs_poly.values(h[sub_b] / 4100e3 - 0.6, s[sub_b] / 7.9e3 - 1.01) ** 4
+        p[sub_c] = 100e6 * self._p2c_hs_poly.values(h[sub_c] / 3500e3 - 0.7, s[sub_c] / 5.9e3 - 1.1) ** 4
+        return p
+
+    def Tsat_hs(self, h, s):
+        """
+        Температура насыщения в области 4 по обратному уравнению T_sat(h, s) (Supp-PHS12; s >= s4_min)
+        h: энтальпия, Дж/кг (число или массив numpy)
+        s: энтропия, Дж/кг/К (число или массив numpy той же формы, что и h)
+        return: температура, К (число или массив numpy)
+        """
+        return 550. * self._T4_hs_poly(h / 2800e3 - 0.119, s / 9.2e3 - 1.07)
+
+    def solve(self, h, s, exact=False):
+        """
+        Определение температуры, давления и области для массивов точек [h, s]
+        h: энтальпия, Дж/кг (одномерный массив numpy)
+        s: энтропия, Дж/кг/К (одномерный массив numpy той же формы, что и h)
+        exact: False - по граничным и обратным уравнениям (без итераций, кроме области 4 при s < s4_min),
+               True - итерационный расчёт по прямым уравнениям IF97
+        return: кортеж (nums, T, p): nums - массив индексов областей (0 - область 1, 1 - область 2,
+                2 - область 4, -1 - точка лежит вне областей), T - температура, К, p - давление, Па
+                (NaN для точек вне областей)
+        """
+        if not exact:
+            with np.errstate(all='ignore'):
+                return self.__solve_backward(h, s)
+        nums = np.full(h.size, -1)
+        T = np.full(h.size, np.nan)
+        p = np.full(h.size, np.nan)
+        rest = np.arange(h.size)  # индексы точек, ещё не отнесённых к области
+        steps = ((2, self.__solve_sat, self.sat_mask),
+                 (0, lambda h, s: self.__solve_Tp(self.region1, h, s, self.p1_hs(h, s), False),
+                  lambda h, s: s <= self.s1_max),
+                 (1, lambda h, s: self.__solve_Tp(self.region2, h, s, self.p2_hs(h, s), True),
+                  lambda h, s: s >= self.s2_min))
+        with np.errstate(all='ignore'):
+            for num, solve, candidates in steps:
+                part = rest[candidates(h[rest], s[rest])]
+                if not part.size:
+                    continue
+                T_r, p_r, mask = solve(h[part], s[part])
+                idx = part[mask]
+                nums[idx], T[idx], p[idx] = num, T_r[mask], p_r[mask]
+                rest = rest[nums[rest] < 0]
+        return nums, T, p
+
+    def solve_point(self, h, s, exact=False):
+        """
+        Определение температуры, давления и области для одной точки [h, s] (расчёт над числами float,
+        порядок проверки областей и условия принадлежности - как в методе solve)
+        h: энтальпия, Дж/кг (число float)
+        s: энтропия, Дж/кг/К (число float)
+        exact: False - по граничным и обратным уравнениям, True - итерационный расчёт (см. метод solve)
+        return: кортеж (num, T, p): индекс области (0 - область 1, 1 - область 2, 2 - область 4, -1 - точка
+                лежит вне областей), температура, К, давление, Па (NaN для точек вне областей)
+        """
+        if not exact:
+            return self.__solve_backward_point(h, s)
+        steps = ((2, self.__solve_sat_point, lambda: self.sat_mask(h, s)),
+                 (0, lambda h, s: self.__solve_Tp_point(self.region1, h, s, self.p1_hs(h, s), False),
+                  lambda: s <= self.s1_max),
+                 (1, lambda h, s: self.__solve_Tp_point(self.region2, h, s, self.p2_hs(h, s), True),
+                  lambda: s >= self.s2_min))
+        for num, solve, candidate in steps:
+            if candidate():
+                T, p, inside = solve(h, s)
+                if inside:
+                    return num, T, p
+        return -1, float('nan'), float('nan')
+
+    def sat_mask(self, h, s):
+        """
+        Отбор точек, которые могут лежать в области 4 (между граничными кривыми с запасом band)
+        h: энтальпия, Дж/кг (массив numpy)
+        s: энтропия, Дж/кг/К (массив numpy)
+        return: булев массив, False - точка заведомо лежит вне области 4
+        """
+        lower, upper = self.__sat_edges(s)
+        return ((self.s_w[0] - self.s_margin <= s) & (s <= self.s_s[0] + self.s_margin) &
+                (lower - self.band <= h) & (h <= upper + self.band))
+
+    def __sat_edges(self, s):
+        """
+        Нижняя и верхняя границы области 4 по энтальпии: изобара-изотерма T_min и линии насыщения h'1(s), h''(s)
+        по граничным уравнениям (между линиями насыщения - изобара-изотерма T_max)
+        s: энтропия, Дж/кг/К (число float или массив numpy)
+        return: кортеж (lower, upper) - энтальпии, Дж/кг (числа float или массивы numpy; NaN вне диапазона
+                энтропии области 4 с запасом s_margin)
+        """
+        s_w, h_w, s_s, h_s = self.s_w, self.h_w, self.s_s, self.h_s
+        lower = h_w[0] + (h_s[0] - h_w[0]) / (s_s[0] - s_w[0]) * (s - s_w[0])
+        if isinstance(s, float):
+            if not s_w[0] - self.s_margin <= s <= s_s[0] + self.s_margin:
+                return float('nan'), float('nan')
+            if s <= s_w[1]:
+                return lower, self.h1_s(s)
+            if s >= s_s[1]:
+                return lower, self.h2_s(s)
+            return lower, h_w[1] + (h_s[1] - h_w[1]) / (s_s[1] - s_w[1]) * (s - s_w[1])
+        upper = h_w[1] + (h_s[1] - h_w[1]) / (s_s[1] - s_w[1]) * (s - s_w[1])
+        liquid = (s_w[0] - self.s_margin <= s) & (s <= s_w[1])
+        vapour = (s_s[1] <= s) & (s <= s_s[0] + self.s_margin)
+        upper[liquid] = self.h1_s(s[liquid])
+        upper[vapour] = self.h2_s(s[vapour])
+        upper[~(liquid | vapour) & ((s < s_w[1]) | (s > s_s[1]))] = np.nan
+        return lower, upper
+
+    def __solve_backward(self, h, s):
+        """
+        Определение температуры, давления и области для массивов точек по граничным и обратным уравнениям
+        (exact=False, см. описание модуля)
+        h: энтальпия, Дж/кг (одномерный массив numpy)
+        s: энтропия, Дж/кг/К (одномерный массив numpy)
+        return: кортеж (nums, T, p) - см. метод solve
+        """
+        region1, region2, region4 = self.region1, self.region2, self.region4
+        nums = np.full(h.size, -1)
+        T = np.full(h.size, np.nan)
+        p = np.full(h.size, np.nan)
+        lower, upper = self.__sat_edges(s)
+        in_s = (self.s_w[0] <= s) & (s <= self.s_s[0])
+        sat = in_s & (lower <= h) & (h <= upper)
+        # Область 4: при s >= s4_min - уравнение T_sat(h, s), иначе - итерации
+        idx = np.flatnonzero(sat & (s >= self.s4_min))
+        T[idx] = np.clip(self.Tsat_hs(h[idx], s[idx]), region4.T_min, region4.T_max)
+        nums[idx] = 2
+        idx = np.flatnonzero(sat & (s < self.s4_min))
+        if idx.size:
+            T_r, _, mask = self.__solve_sat(h[idx], s[idx], check_x=False)
+            T[idx[mask]], nums[idx[mask]] = T_r[mask], 2
+        idx = np.flatnonzero(nums == 2)
+        p[idx] = self.sc.p_T(T[idx])
+        # Области 1 и 2: точки выше линий насыщения (и изобары-изотермы T_min)
+        single = ~(in_s & (h <= upper))
+        idx = np.flatnonzero(single & (s <= self.s_w[1]))
+        h_r, s_r = h[idx], s[idx]
+        p_r = self.p1_hs(h_r, s_r)
+        T_r = region1.T_ph(p_r, h_r)
+        inside = (s_r < self.s_b13_min) | (h_r <= self.hB13_s(s_r))
+        self.__store_backward(region1, 0, idx, s_r, T_r, p_r, inside, nums, T, p)
+        idx = np.flatnonzero(single & (s >= self.s_b23_min))
+        h_r, s_r = h[idx], s[idx]
+        p_r = self.p2_hs(h_r, s_r)
+        T_r = region2.T_ph(p_r, h_r)
+        # Вблизи границы областей 2 и 3 давление сравнивается с давлением на границе при T_B23(h, s)
+        box = ((s_r <= self.s_b23_max) & (self.h_b23_min <= h_r) & (h_r <= self.h_b23_max))
+        inside = (s_r >= self.s_s[1]) | (h_r > self.h_b23_max)
+        inside[box] = p_r[box] <= region2.bound23.p_T(self.TB23_hs(h_r[box], s_r[box]))
+        self.__store_backward(region2, 1, idx, s_r, T_r, p_r, inside, nums, T, p)
+        return nums, T, p
+
+    def __store_backward(self, region, num, idx, s_r, T_r, p_r, inside, nums, T, p):
+        """
+        Запись результата обратных уравнений для точек, лежащих в области 1 или 2 (с учётом допусков
+        T_tol_backward и p_rtol_backward на границах T_min, T_max, p_min и p_max и проверкой энтропии
+        в найденной точке с допуском s_tol_backward)
+        region: объект области
+        num: индекс области
+        idx: индексы точек в массивах nums, T, p
+        s_r: энтропия точек, Дж/кг/К
+        T_r, p_r: температура, К, и давление, Па, по обратным уравнениям
+        inside: булев массив точек, лежащих в области по граничным уравнениям
+        nums, T, p: массивы результата (изменяются)
+        return: None
+        """
+        inside = inside & self.__backward_limits(region, T_r, p_r)
+        s_fwd = region.props_Tp(T_r[inside], p_r[inside], fields=('s',))['s']
+        inside[inside] = np.abs(s_fwd - s_r[inside]) <= self.s_tol_backward
+        idx = idx[inside]
+        nums[idx] = num
+        T[idx] = np.clip(T_r[inside], region.T_min, region.T_max)
+        p[idx] = np.clip(p_r[inside], region.p_min, region.p_max)
+
+    def __backward_limits(self, region, T, p):
+        """
+        Проверка границ области по температуре и давлению (с допусками T_tol_backward и p_rtol_backward)
+        region: объект области
+        T: температура, К (число float или массив numpy)
+        p: давление, Па (число float или массив numpy)
+        return: bool или булев массив
+        """
+        return ((region.T_min - self.T_tol_backward <= T) & (T <= region.T_max + self.T_tol_backward) &
+                (region.p_min * (1 - self.p_rtol_backward) <= p) & (p <= region.p_max * (1 + self.p_rtol_backward)))
+
+    def __solve_backward_point(self, h, s):
+        """
+        Определение температуры, давления и области для одной точки по граничным и обратным уравнениям
+        (см. __solve_backward)
+        h: энтальпия, Дж/кг (число float)
+        s: энтропия, Дж/кг/К (число float)
+        return: кортеж (num, T, p) - см. метод solve_point
+        """
+        region1, region2, region4 = self.region1, self.region2, self.region4
+        in_s = self.s_w[0] <= s <= self.s_s[0]
+        lower, upper = self.__sat_edges(s)
+        if in_s and lower <= h <= upper:
+            if s >= self.s4_min:
+                T = min(max(self.Tsat_hs(h, s), region4.T_min), region4.T_max)
+                return 2, T, self.sc.p_T(T)
+            T, p, inside = self.__solve_sat_point(h, s, check_x=False)
+            return (2, T, p) if inside else (-1, float('nan'), float('nan'))
+        if in_s and h < lower:
+            return -1, float('nan'), float('nan')
+        if s <= self.s_w[1]:
+            region, num = region1, 0
+            p = self.p1_hs(h, s)
+            inside = s < self.s_b13_min or h <= self.hB13_s(s)
+        elif s >= self.s_b23_min:
+            region, num = region2, 1
+            p = self.p2_hs(h, s)
+            if s <= self.s_b23_max and self.h_b23_min <= h <= self.h_b23_max:
+                inside = p <= region2.bound23.p_T(self.TB23_hs(h, s))
+            else:
+                inside = s >= self.s_s[1] or h > self.h_b23_max
+        else:
+            return -1, float('nan'), float('nan')
+        T = region.T_ph(p, h) if inside and isfinite(p) else float('nan')
+        if not (inside and self.__backward_limits(region, T, p) and
+                abs(region.props_Tp(T, p, fields=('s',))['s'] - s) <= self.s_tol_backward):
+            return -1, float('nan'), float('nan')
+        return num, min(max(T, region.T_min), region.T_max), min(max(p, region.p_min), region.p_max)
+
+    def __sat_curves(self, T):
+        """
+        Линии кипящей воды и сухого насыщенного пара
+        T: температура насыщения, К (массив numpy)
+        return: кортеж (s', h', s'', h'') массивов numpy
+        """
+        p = self.sc.p_T(T)
+        props_w = self.region1.props_Tp(T, p, fields=('h', 's'))
+        props_s = self.region2.props_Tp(T, p, fields=('h', 's'))
+        return props_w['s'], props_w['h'], props_s['s'], props_s['h']
+
+    def __solve_sat(self, h, s, check_x=True):
+        """
+        Определение температуры и давления насыщения для точек области 4
+        h: энтальпия, Дж/кг (массив numpy)
+        s: энтропия, Дж/кг/К (массив numpy)
+        check_x: True - точка лежит в области 4 при 0 <= x <= 1, False - при сходимости итераций (область
+                 определена по граничным уравнениям)
+        return: кортеж (T, p, mask): температура, К, давление, Па, и булев массив точек, лежащих в области 4
+        """
+        region4 = self.region4
+        seeded = s >= self.s4_min
+        T = np.where(seeded, np.clip(self.Tsat_hs(h, s), region4.T_min, region4.T_max), region4.T_min)
+        f, ds, x = self.__sat_residual(T, h, s)
+        # Без начального приближения корень существует и лежит правее T_min только при f(T_min) > 0
+        # и f'(T_min) < 0 (f выпукла)
+        active = np.flatnonzero((seeded | (f > 0)) & (ds < 0))
+        for _ in range(self.max_iter):
+            if not active.size:
+                break
+            T_a = np.clip(T[active] - f[active] / ds[active], region4.T_min, region4.T_max)
+            done = np.abs(T_a - T[active]) <= self.rtol * T_a
+            T[active] = T_a
+            f[active], ds[active], x[active] = self.__sat_residual(T_a, h[active], s[active])
+            # Итерации прекращаются для точек, у которых корня нет (f' >= 0) или он лежит правее T_max
+            # (область 3 или вне IF97): для них невязка f останется большой
+            active = active[~done & (ds[active] < 0) & (T_a < region4.T_max)]
+        mask = np.abs(f) <= self.__f_tol(h, s, T)
+        if check_x:
+            mask &= (0 <= x) & (x <= 1)
+        return T, self.sc.p_T(T), mask
+
+    def __sat_residual(self, T, h, s):
+        """
+        Невязка уравнения области 4, приближённое значение её производной по температуре и степень сухости
+        T: температура насыщения, К (число или массив numpy)
+        h: энтальпия, Дж/кг (число или массив numpy)
+        s: энтропия, Дж/кг/К (число или массив numpy)
+        return: кортеж (f, df/dT, x): f = h - h' - L * (s - s'), df/dT ~ s' - s - v' * dp/dT,
+                x = (s - s') / (s'' - s')
+        """
+        p = self.sc.p_T(T)
+        props_w = self.region1.props_Tp(T, p, fields=('h', 's', 'v'))
+        props_s = self.region2.props_Tp(T, p, fields=('h', 's', 'v'))
+        ds_sat = props_s['s'] - props_w['s']
+        L = (props_s['h'] - props_w['h']) / ds_sat
+        # Производная f при L = T: dh' = T * ds' + v' * dp, dp/dT = (s'' - s') / (v'' - v') (уравнение Клапейрона)
+        df = props_w['s'] - s - props_w['v'] * ds_sat / (props_s['v'] - props_w['v'])
+        return h - props_w['h'] - L * (s - props_w['s']), df, (s - props_w['s']) / ds_sat
+
+    def __solve_sat_point(self, h, s, check_x=True):
+        """
+        Определение температуры и давления насыщения для одной точки (см. __solve_sat)
+        h: энтальпия, Дж/кг (число float)
+        s: энтропия, Дж/кг/К (число float)
+        check_x: True - проверка 0 <= x <= 1, False - только сходимость итераций
+        return: кортеж (T, p, inside): температура, К, давление, Па, True - точка лежит в области 4
+        """
+        region4 = self.region4
+        seeded = s >= self.s4_min
+        T = min(max(self.Tsat_hs(h, s), region4.T_min), region4.T_max) if seeded else region4.T_min
+        f, df, x = self.__sat_residual(T, h, s)
+        if (seeded or f > 0) and df < 0:
+            for _ in range(self.max_iter):
+                T_new = min(max(T - f / df, region4.T_min), region4.T_max)
+                done = abs(T_new - T) <= self.rtol * T_new
+                T = T_new
+                f, df, x = self.__sat_residual(T, h, s)
+                if done or df >= 0 or T >= region4.T_max:
+                    break
+        inside = abs(f) <= self.__f_tol(h, s, T) and (not check_x or 0 <= x <= 1)
+        return T, self.sc.p_T(T), inside
+
+    def __solve_Tp_point(self, region, h, s, p0, log_p):
+        """
+        Определение температуры и давления для одной точки области 1 или 2 (см. __solve_Tp)
+        region: объект области (Region1 или Region2)
+        h: энтальпия, Дж/кг (число float)
+        s: энтропия, Дж/кг/К (число float)
+        p0: начальное приближение давления (обратное уравнение p(h, s)), Па
+        log_p: True - итерации по ln(p), False - по p
+        return: кортеж (T, p, inside): температура, К, давление, Па, True - точка лежит в области
+        """
+        p = min(max(p0, region.p_min), region.p_max) if isfinite(p0) else region.p_max
+        T = min(max(region.T_ph(p, h), region.T_min), region.T_max)
+        for _ in range(self.max_iter):
+            props = region.props_Tp(T, p, fields=('h', 's', 'cp', 'v'))
+            dT = 1e-6 * T
+            dvdT = (region.props_Tp(T + dT, p, fields=('v',))['v'] - props['v']) / dT
+            dh, ds = h - props['h'], s - props['s']
+            step_p = (dh - T * ds) / props['v']
+            step_T = T / props['cp'] * (ds + dvdT * step_p)
+            if log_p:
+                p_new = p * exp(min(max(step_p / p, -1.), 1.))
+            else:
+                p_new = min(max(p + step_p, 0.1 * region.p_min), 2 * region.p_max)
+            if abs(p_new - p) > 1e-3 * p_new:
+                T_new = min(max(region.T_ps(p_new, s), region.T_min), region.T_max)
+            else:
+                T_new = T + step_T
+            done = (abs(dh) <= self.rtol * (abs(h) + region.R * T) and
+                    abs(ds) <= self.rtol * (abs(s) + region.R))
+            T, p = T_new, p_new
+            if done:
+                break
+            if not (isfinite(T) and isfinite(p)):
+                return T, p, False
+        else:
+            return T, p, False
+        inside = (region.Tp_in(T, p) or region.Tp_in(T - self.T_tol, p) or region.Tp_in(T + self.T_tol, p))
+        return min(max(T, region.T_min), region.T_max), p, inside
+
+    def __f_tol(self, h, s, T):
+        """
+        Допустимая невязка уравнения области 4 (относительная погрешность rtol слагаемых h и T * s)
+        h: энтальпия, Дж/кг (число или массив numpy)
+        s: энтропия, Дж/кг/К (число или массив numpy)
+        T: температура насыщения, К (число или массив numpy)
+        return: допустимые значения |f|, Дж/кг
+        """
+        return self.rtol * (np.abs(h) + T * np.abs(s))
+
+    def __solve_Tp(self, region, h, s, p0, log_p):
+        """
+        Определение температуры и давления для точек области 1 или 2 методом Ньютона
+        region: объект области (Region1 или Region2)
+        h: энтальпия, Дж/кг (массив numpy)
+        s: энтропия, Дж/кг/К (массив numpy)
+        p0: начальное приближение давления (обратное уравнение p(h, s)), Па (массив numpy)
+        log_p: True - итерации по ln(p) (область 2, свойства близки к идеальному газу), False - по p
+        return: кортеж (T, p, mask): температура, К, давление, Па, и булев массив точек, лежащих в области
+        """
+        p = np.clip(np.nan_to_num(p0, nan=region.p_max), region.p_min, region.p_max)
+        T = np.clip(region.T_ph(p, h), region.T_min, region.T_max)
+        active = np.arange(h.size)
+        for _ in range(self.max_iter):
+            if not active.size:
+                break
+            T_a, p_a = T[active], p[active]
+            props = region.props_Tp(T_a, p_a, fields=('h', 's', 'cp', 'v'))
+            dT = 1e-6 * T_a
+            # (dv/dT)_p - конечной разностью (при расчёте одного удельного объёма вычисляется только g_pi)
+            dvdT = (region.props_Tp(T_a + dT, p_a, fields=('v',))['v'] - props['v']) / dT
+            dh, ds = h[active] - props['h'], s[active] - props['s']
+            step_p = (dh - T_a * ds) / props['v']
+            step_T = T_a / props['cp'] * (ds + dvdT * step_p)
+            if log_p:
+                # Шаг по ln(p) ограничивается, чтобы давление оставалось положительным
+                p_new = p_a * np.exp(np.clip(step_p / p_a, -1., 1.))
+            else:
+                p_new = np.clip(p_a + step_p, 0.1 * region.p_min, 2 * region.p_max)
+            # Вдали от решения температура берётся по обратному уравнению T(p, s) при новом давлении
+            # (шаг метода Ньютона по T при большой ошибке давления может вывести точку далеко за пределы области)
+            far = np.abs(p_new - p_a) > 1e-3 * p_new
+            T_new = np.where(far, np.clip(region.T_ps(p_new, s[active]), region.T_min, region.T_max),
+                             T_a + step_T)
+            # Сходимость проверяется по невязкам: погрешность округления p в области 1 (dp = d(h - T * s) / v)
+            # на несколько порядков больше rtol * p
+            done = ((np.abs(dh) <= self.rtol * (np.abs(h[active]) + region.R * T_a)) &
+                    (np.abs(ds) <= self.rtol * (np.abs(s[active]) + region.R)))
+            T[active], p[active] = T_new, p_new
+            # Расходящиеся точки (NaN) исключаются, для них mask будет False
+            active = active[~done & np.isfinite(T_new) & np.isfinite(p_new)]
+        converged = np.ones(h.size, dtype=bool)
+        converged[active] = False
+        converged &= np.isfinite(T) & np.isfinite(p)
+        T_c, p_c = np.where(converged, T, region.T_min), np.where(converged, p, region.p_max)
+        inside = (region.Tp_mask(T_c, p_c) | region.Tp_mask(T_c - self.T_tol, p_c) |
+                  region.Tp_mask(T_c + self.T_tol, p_c))
+        return np.clip(T, region.T_min, region.T_max), p, converged & inside
@@ -8,11 +8,12 @@ https://medsv.github.io/dzen/
 __author__ = "Sergey Medvedev"
 __copyright__ = "Sergey Medvedev, 2020"
 __license__ = "GPL"
-__version__ = "1.1"
+__version__ = "1.2"
 __maintainer__ = "Sergey Medvedev"
 __email__ = "engpython@yandex.ru"
 __status__ = "Production"
 
+import numpy as np
 from .saturationcurve import SaturationCurve
 
 
@@ -62,7 +63,7 @@ class ParamsIn:
         p: давление, Па
         return: True если давление находится внутри допустимого диапазона, False в противном сучае
         """
-        return self.p_min <= p <= self.p_max
+        return (self.p_min <= p) & (p <= self.p_max)
 
     def T_in(self, T):
         """
@@ -70,7 +71,7 @@ class ParamsIn:
         T: температура, К
         return: True если температура находится внутри допустимого диапазона, False в противном сучае
         """
-        return self.T_min <= T <= self.T_max
+        return (self.T_min <= T) & (T <= self.T_max)
 
     def t_in(self, t):
         """
@@ -86,7 +87,7 @@ class ParamsIn:
         x: степень сухости
         return: True если значение x лежит в диапазоне [0; 1], False в противном сучае
         """
-        return 0. <= x <= 1.
+        return (0. <= x) & (x <= 1.)
 
     def _get_T_edges(self, p):
         """
@@ -154,6 +155,58 @@ class ParamsIn:
         """
         return self._pX_in(p, s, 's')
 
+    def Tp_mask(self, T, p):
+        """
+        Векторный аналог метода Tp_in.
+        Проверка нахождения пар параметров [T, p] в пределах области
+        T: температура, К (массив numpy)
+        p: давление, Па (массив numpy той же формы, что и T)
+        return: булев массив, True для точек, находящихся внутри области
+        """
+        mask = self.p_in(p) & self.T_in(T)
+        # Для точек вне диапазона давлений границы вычисляются при допустимом давлении p_max,
+        # результат для них всё равно отбрасывается маской
+        T_lower, T_upper = self._get_T_edges(np.where(mask, p, self.p_max))
+        return mask & (T_lower <= T) & (T <= T_upper)
+
+    def tp_mask(self, t, p):
+        """
+        Векторный аналог метода tp_in.
+        t: температура, С (массив numpy)
+        p: давление, Па (массив numpy той же формы, что и t)
+        return: булев массив, True для точек, находящихся внутри области
+        """
+        return self.Tp_mask(t + 273.15, p)
+
+    def ph_mask(self, p, h):
+        """
+        Векторный аналог метода ph_in.
+        p: давление, Па (массив numpy)
+        h: энтальпия, Дж/кг (массив numpy той же формы, что и p)
+        return: булев массив, True для точек, находящихся внутри области
+        """
+        return self._pX_mask(p, h, 'h')
+
+    def ps_mask(self, p, s):
+        """
+        Векторный аналог метода ps_in.
+        p: давление, Па (массив numpy)
+        s: энтропия, Дж/кг/К (массив numpy той же формы, что и p)
+        return: булев массив, True для точек, находящихся внутри области
+        """
+        return self._pX_mask(p, s, 's')
+
+    def _pX_mask(self, p, value, X):
+        """
+        Абстрактный метод.
+        Векторный аналог метода _pX_in.
+        p: давление, Па (массив numpy)
+        value: значения второго параметра (h, Дж/кг или s, Дж/кг/К)
+        X: 'h' или 's'
+        return: булев массив, True для точек, находящихся внутри области
+        """
+        raise NotImplementedError('Метод должен быть переопределён')
+
     def _pX_in(self, p, value, X):
         """
         Абстрактный метод.
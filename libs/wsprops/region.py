@@ -9,24 +9,39 @@ https://medsv.github.io/dzen/
 __author__ = "Sergey Medvedev"
 __copyright__ = "Sergey Medvedev, 2020"
 __license__ = "GPL"
-__version__ = "1.2"
+__version__ = "1.7"
 __maintainer__ = "Sergey Medvedev"
 __email__ = "engpython@yandex.ru"
 __status__ = "Production"
 
+import numpy as np
 from .paramsin import ParamsIn
+from .scalarpoly import is_number
 
 
 class Region(ParamsIn):
     """
     Родительский класс для классов однофазных областей 1, 2.
     Содержит общие для области 1 и 2 методы
+    Отличие от версии 1.3: добавлены методы props_grid, props_grid_tp (расчёт свойств на сетке T x p
+    матричными произведениями степеней приведённых давления и температуры).
+    Отличие от версии 1.4: в методах props_Tp, props_tp можно задать список требуемых свойств (fields),
+    в этом случае вычисляются только необходимые для них производные энергии Гиббса.
+    Отличие от версии 1.5: для массивов в методах props_ph, props_ps обратные уравнения вычисляются
+    для всего массива сразу (удалён поточечный расчёт _backward_arr).
+    Отличие от версии 1.6: суммы энергии Гиббса для массивов точек вычисляются методом _point_sums
+    (степени - только для различных показателей) вместо метода _select_terms.
     """
 
     R = 461.526  # Газовая постоянная водяного пара, Дж/кг/К
     Tc = 647.096  # Температура в критической точке, К
     pc = 22.064e6  # Давление в критической точке, Па
     rc = 322  # Плотность в критической точке, кг/м3
+    # Номера сумм (производных энергии Гиббса), необходимых для расчёта каждого свойства:
+    # 0 - g, 1 - g_pi, 2 - g_pipi, 3 - g_tau, 4 - g_tautau, 5 - g_pitau
+    field_sums = {'h': (3,), 's': (0, 3), 'cp': (4,), 'cv': (1, 2, 4, 5), 'v': (1,), 'u': (1, 3),
+                  'w': (1, 2, 4, 5), 'x': ()}
+    _needed_cache = {}  # номера сумм для наборов свойств (кортеж имён -> кортеж номеров сумм)
 
     def __init__(self):
         ParamsIn.__init__(self)
@@ -35,26 +50,66 @@ class Region(ParamsIn):
         # Верхнее значение давления после которого линия насыщения перестаёт быть границей между областями 1 и 2
         self.p_sc_marg = self.sc.p_T(self.T_sc_marg)
 
-    def props_Tp(self, T, p):
+    def props_Tp(self, T, p, fields=None):
         """
         Расчёт теплофизических свойств воды и водяного пара по температуре и давлению.
+        Допускается передача массивов numpy (с учётом правил broadcasting), в этом случае
+        значениями словаря являются массивы (столбцы) одной формы.
         T: температура, К
         p: давление, Па
-        return: словарь свойств
+        fields: последовательность имён требуемых свойств (например, ('v', 'h')); None - все свойства
+        return: словарь свойств (при заданном fields - только T, p и требуемые свойства)
         """
-        self._props_Tp(T, p)
+        if fields is not None:
+            fields = self._check_fields(fields)
+        if not is_number(T, p) and (np.ndim(T) or np.ndim(p)):
+            T, p = (np.array(a, dtype=float) for a in np.broadcast_arrays(T, p))
+        self._props_Tp(T, p, fields=fields)
         self.props['T'] = T
         self.props['p'] = p
+        if fields is not None:
+            return {key: self.props[key] for key in ('T', 'p', *fields)}
         return self.props.copy()
 
-    def props_tp(self, t, p):
+    def props_tp(self, t, p, fields=None):
         """
         Расчёт теплофизических свойств воды и водяного пара по температуре и давлению.
         t: температура, С
         p: давление, Па
+        fields: последовательность имён требуемых свойств; None - все свойства
         return: словарь свойств.
         """
-        return self.props_Tp(t + 273.15, p)
+        return self.props_Tp(t + 273.15, p, fields)
+
+    def props_grid(self, T, p):
+        """
+        Расчёт теплофизических свойств на прямоугольной сетке температур и давлений (например, для таблиц).
+        Степени приведённого давления вычисляются один раз для каждой строки, степени приведённой
+        температуры - один раз для каждого столбца, энергия Гиббса и её производные для всей сетки
+        определяются несколькими матричными произведениями.
+        Принадлежность точек области не проверяется.
+        T: температуры, К (одномерный массив, список или число) - столбцы сетки
+        p: давления, Па (одномерный массив, список или число) - строки сетки
+        return: словарь свойств, значения словаря - массивы формы (len(p), len(T))
+        """
+        T = np.atleast_1d(np.asarray(T, dtype=float))
+        p = np.atleast_1d(np.asarray(p, dtype=float))
+        if T.ndim != 1 or p.ndim != 1:
+            raise ValueError('Температуры и давления сетки должны задаваться одномерными массивами')
+        T, p = np.meshgrid(T, p)
+        self._props_Tp(T, p, grid=True)
+        self.props['T'] = T
+        self.props['p'] = p
+        return self.props.copy()
+
+    def props_grid_tp(self, t, p):
+        """
+        Расчёт теплофизических свойств на прямоугольной сетке температур и давлений (см. props_grid).
+        t: температуры, С (одномерный массив, список или число) - столбцы сетки
+        p: давления, Па (одномерный массив, список или число) - строки сетки
+        return: словарь свойств, значения словаря - массивы формы (len(p), len(t))
+        """
+        return self.props_grid(np.asarray(t, dtype=float) + 273.15, p)
 
     def props_ph(self, p, h):
         """
@@ -63,9 +118,12 @@ class Region(ParamsIn):
         h: энтальпия, Дж/кг
         return: словарь свойств.
         """
+        if not is_number(p, h) and (np.ndim(p) or np.ndim(h)):
+            p, h = (np.array(a, dtype=float) for a in np.broadcast_arrays(p, h))
         T = self.T_ph(p, h)
         self._props_Tp(T, p)
         self.props['T'] = T
+        self.props['p'] = p
         self.props['h'] = h
         return self.props.copy()
 
@@ -76,9 +134,12 @@ class Region(ParamsIn):
         s: энтропия, Дж/кг/К
         return: словарь свойств.
         """
+        if not is_number(p, s) and (np.ndim(p) or np.ndim(s)):
+            p, s = (np.array(a, dtype=float) for a in np.broadcast_arrays(p, s))
         T = self.T_ps(p, s)
         self._props_Tp(T, p)
         self.props['T'] = T
+        self.props['p'] = p
         self.props['s'] = s
         return self.props.copy()
 
@@ -97,12 +158,140 @@ class Region(ParamsIn):
         value_upper = self.props_Tp(T_upper, p)[X]
         return value_lower <= value <= value_upper
 
-    def _props_Tp(self, T, p):
+    def _pX_mask(self, p, value, X):
+        """
+        Векторный аналог метода _pX_in.
+        p: давление, Па (массив numpy)
+        value: значения второго параметра (h, Дж/кг или s, Дж/кг/К)
+        X: 'h' или 's'
+        return: булев массив, True для точек, находящихся внутри области
+        """
+        mask = self.p_in(p)
+        p = np.where(mask, p, self.p_max)
+        T_lower, T_upper = self._get_T_edges(p)
+        value_lower = self.props_Tp(T_lower, p)[X]
+        value_upper = self.props_Tp(T_upper, p)[X]
+        return mask & (value_lower <= value) & (value <= value_upper)
+
+    def _check_fields(self, fields):
+        """
+        Проверка имён требуемых свойств
+        fields: последовательность имён свойств (строка - одно свойство)
+        return: кортеж имён свойств
+        """
+        if isinstance(fields, str):
+            fields = (fields,)
+        fields = tuple(fields)
+        unknown = [name for name in fields if name not in self.field_sums]
+        if unknown:
+            raise ValueError(f"Неизвестные свойства: {', '.join(map(str, unknown))}. "
+                             f"Допустимые значения: {', '.join(self.field_sums)}")
+        return fields
+
+    @classmethod
+    def _sums_needed(cls, fields):
+        """
+        Номера сумм (производных энергии Гиббса), необходимых для расчёта свойств
+        fields: кортеж имён свойств или None (все свойства)
+        return: упорядоченный кортеж номеров сумм (0 - g, 1 - g_pi, 2 - g_pipi, 3 - g_tau, 4 - g_tautau,
+                5 - g_pitau)
+        """
+        needed = cls._needed_cache.get(fields)
+        if needed is None:
+            if fields is None:
+                needed = tuple(range(6))
+            else:
+                needed = tuple(sorted({k for name in fields for k in cls.field_sums[name]}))
+            cls._needed_cache[fields] = needed
+        return needed
+
+    # Номера производных (по первому аргументу, по второму аргументу) для сумм 0...5
+    _SUM_ORDERS = ((0, 0), (1, 0), (2, 0), (0, 1), (0, 2), (1, 1))
+
+    @classmethod
+    def _point_sums(cls, a, b, coefs, needed):
+        """
+        Расчёт сумм sum(w * n * a^I * b^J) для массивов точек (аргументы - произвольной формы).
+        Слагаемые группируются по показателю степени a: sum_I(w_I * a^I * sum_J(w_J * N[I, J] * b^J)),
+        поэтому степени a и b вычисляются только для различных показателей, а внутренние суммы - одним
+        матричным произведением для всех различных I (матрицы степеней - показатели x точки).
+        a, b: значения аргументов (массивы numpy одной формы)
+        coefs: кортеж, подготовленный методом _grid_coefs
+        needed: кортеж номеров требуемых сумм (0 - функция, 1, 2 - первая и вторая производные по a,
+                3, 4 - первая и вторая производные по b, 5 - смешанная производная)
+        return: список из 6 элементов: массивы формы a.shape для сумм needed, None для остальных
+        """
+        I_u, J_u, N, I_w, J_w = coefs
+        shape = a.shape
+        A = a.ravel() ** I_u[:, None]
+        B = b.ravel() ** J_u[:, None]
+        result = [None] * 6
+        for m in sorted({cls._SUM_ORDERS[k][1] for k in needed}):
+            inner = A * ((N * J_w[m]) @ B)
+            for k in needed:
+                if cls._SUM_ORDERS[k][1] == m:
+                    result[k] = (I_w[cls._SUM_ORDERS[k][0]] @ inner).reshape(shape)
+        return result
+
+    @staticmethod
+    def _grid_coefs(I, J, n, I_weights):
+        """
+        Подготовка коэффициентов для расчёта сумм sum(w * n * a^I * b^J) на сетке (метод _grid_sums)
+        I, J: показатели степени (массивы numpy)
+        n: коэффициенты (массив numpy)
+        I_weights: веса слагаемых, зависящие от I, для производных по первому аргументу (три массива:
+                   для функции, первой и второй производных)
+        return: кортеж (различные I, различные J, матрица коэффициентов N[I, J],
+                веса по различным I (3 x len(I)), веса по различным J (3 x len(J)))
+        """
+        I_u, I_pos = np.unique(I, return_inverse=True)
+        J_u, J_pos = np.unique(J, return_inverse=True)
+        N = np.zeros((I_u.size, J_u.size))
+        np.add.at(N, (I_pos, J_pos), n)
+        # Веса зависят только от показателя степени, поэтому берутся по первому слагаемому с данным I
+        first = np.array([np.flatnonzero(I_pos == k)[0] for k in range(I_u.size)])
+        I_w = np.array([np.asarray(w, dtype=float)[first] for w in I_weights])
+        J_w = np.array([np.ones_like(J_u), J_u, J_u * (J_u - 1)], dtype=float)
+        return I_u.astype(float), J_u.astype(float), N, I_w, J_w
+
+    @staticmethod
+    def _grid_sums(a, b, coefs):
+        """
+        Расчёт сумм sum(w_I * w_J * n * a^I * b^J) на сетке a (строки) x b (столбцы) двумя матричными
+        произведениями: степени a вычисляются один раз для строки, степени b - один раз для столбца
+        a: значения первого аргумента (одномерный массив numpy)
+        b: значения второго аргумента (одномерный массив numpy)
+        coefs: кортеж, подготовленный методом _grid_coefs
+        return: массив формы (3, len(a), 3, len(b)): [k, :, m, :] - сумма с весом k-й производной
+                по первому аргументу и m-й производной по второму аргументу
+        """
+        I_u, J_u, N, I_w, J_w = coefs
+        left = (a[:, None] ** I_u)[None] * I_w[:, None, :]  # (3, строки, различные I)
+        right = (b[:, None] ** J_u)[None] * J_w[:, None, :]  # (3, столбцы, различные J)
+        right = N @ right.transpose(2, 0, 1).reshape(J_u.size, -1)  # (различные I, 3 * столбцы)
+        sums = left.reshape(-1, I_u.size) @ right
+        return sums.reshape(3, a.size, 3, b.size)
+
+    @staticmethod
+    def _fill(T, value):
+        """
+        Заполнение значения свойства, не зависящего от параметров состояния (например, x)
+        T: температура, К (число или массив numpy)
+        value: значение
+        return: value для скалярного T, массив формы T, заполненный value, в противном случае
+        """
+        if not is_number(T) and np.ndim(T):
+            return np.full(np.shape(T), value)
+        return value
+
+    def _props_Tp(self, T, p, grid=False, fields=None):
         """
         Абстрактный метод.
         Расчёт теплофизических свойств воды и водяного пара по температуре и давлению.
         T: температура, К
         p: давление, Па
+        grid: True - T и p образуют сетку (строки - давления, столбцы - температуры)
+        fields: кортеж имён требуемых свойств; None - все свойства
         return: None
         """
         raise NotImplementedError("Метод должен быть переопределён")
@@ -0,0 +1,503 @@
+"""
+В модуле размещён класс Region3, содержащий методы для расчёта теплофизических свойств воды и водяного пара
+в области 3 (околокритическая и сверхкритическая области между изотермой 623,15 К и границей Boundary23).
+Методика расчёта взята из документа
+http://www.iapws.org/relguide/IF97-Rev.pdf
+-------------------------------------------------
+'Инженерные расчёты на Python'
+https://zen.yandex.ru/id/5f33dcd5554adc5b33aaee83
+https://medsv.github.io/dzen/
+"""
+
+__author__ = "Sergey Medvedev"
+__copyright__ = "Sergey Medvedev, 2021"
+__license__ = "GPL"
+__version__ = "1.1"
+__maintainer__ = "Sergey Medvedev"
+__email__ = "engpython@yandex.ru"
+__status__ = "Production"
+
+from math import log
+import numpy as np
+from .paramsin import ParamsIn
+from .boundary23 import Boundary23  # Граница между 2-ой и 3-ей областями
+from .scalarpoly import ScalarPoly, is_number
+
+
+class Region3(ParamsIn):
+    """
+    Класс для 3-й области.
+    Основное уравнение области 3 - уравнение для энергии Гельмгольца f(rho, T), поэтому для расчёта по
+    температуре и давлению плотность определяется из уравнения p(rho, T) = p методом Ньютона с делением
+    отрезка пополам (для массивов - для всех точек сразу). Отрезок, содержащий решение, выбирается по
+    положению точки относительно линии насыщения: при T < Tc и p >= ps(T) - жидкость (rho > rho'),
+    при p < ps(T) - пар (rho < rho''), при T >= Tc - единственное решение.
+    Обратные уравнения v(T, p) для подобластей 3a...3z (IAPWS Supp-VPT3) в пакет не перенесены, поэтому
+    расчёт по (T, p) остаётся итерационным (5-8 вычислений сумм энергии Гельмгольца на точку).
+    По [p, h] и [p, s] плотность определяется тем же методом из уравнения X(rho, T(rho, p)) = X (h и s при
+    постоянном давлении монотонно убывают с ростом плотности), температура при заданной плотности - из
+    уравнения p(rho, T) = p. При p < pc отрезок выбирается по положению точки относительно линии насыщения
+    (жидкость - T = [623,15 К; Ts(p)], пар - T = [Ts(p); T_B23(p)]); точки между линиями кипящей воды
+    и сухого насыщенного пара (область влажного пара при T > 623,15 К) к области 3 не относятся.
+    Отличие от версии 1.0: для одной точки (аргументы - числа) по (T, p) и (T, rho) плотность и свойства
+    вычисляются над числами float, суммы энергии Гельмгольца - методом ScalarPoly.sums (для двух сумм
+    итерации по плотности - функцией без numpy). Время расчёта одной точки props_Tp - 15-21 мкс
+    (HSDiag.props_Tp - 20-26 мкс) вместо 160-230 мкс.
+    """
+    R = 461.526  # Газовая постоянная водяного пара, Дж/кг/К
+    Tc = 647.096  # Температура в критической точке, К
+    pc = 22.064e6  # Давление в критической точке, Па
+    rc = 322  # Плотность в критической точке, кг/м3
+    rho_max = 800.  # Плотность, при которой давление в области 3 заведомо выше p_max, кг/м3
+    max_iter = 100  # Максимальное число итераций при определении плотности
+    rtol = 1e-13  # Относительная точность определения плотности
+    bound23 = Boundary23()  # Граница между 2-ой и 3-ей областями
+    # Коэффициенты уравнения для энергии Гельмгольца (IF97, Table 30); слагаемое n1 * ln(delta) - отдельно
+    n1 = 1.0658070028513
+    I = np.array([0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 3, 3, 3,
+                  3, 3, 4, 4, 4, 4, 5, 5, 5, 6, 6, 6, 7, 8, 9, 9, 10, 10, 11])
+    J = np.array([0, 1, 2, 7, 10, 12, 23, 2, 6, 15, 17, 0, 2, 6, 7, 22, 26, 0, 2, 4,
+                  16, 26, 0, 2, 4, 26, 1, 3, 26, 0, 2, 26, 2, 26, 2, 26, 0, 1, 26])
+    n = np.array([-15.732845290239, 20.944396974307, -7.6867707878716, 2.6185947787954,
+                  -2.808078114862, 1.2053369696517, -0.0084566812812502, -1.2654315477714,
+                  -1.1524407806681, 0.88521043984318, -0.64207765181607, 0.38493460186671,
+                  -0.85214708824206, 4.8972281541877, -3.0502617256965, 0.039420536879154,
+                  0.12558408424308, -0.2799932969871, 1.389979956946, -2.018991502357,
+                  -0.0082147637173963, -0.47596035734923, 0.0439840744735, -0.44476435428739,
+                  0.90572070719733, 0.70522450087967, 0.10770512626332, -0.32913623258954,
+                  -0.50871062041158, -0.022175400873096, 0.094260751665092, 0.16436278447961,
+                  -0.013503372241348, -0.014834345352472, 0.00057922953628084, 0.0032308904703711,
+                  8.0964802996215e-05, -0.00016557679795037, -4.4923899061815e-05])
+    # Матрица коэффициентов для вычисления сумм f, delta * f_d, delta^2 * f_dd, tau * f_t, tau^2 * f_tt,
+    # delta * tau * f_dt одним матричным умножением
+    _helm_coefs = n[:, None] * np.array([np.ones_like(I), I, I * (I - 1), J, J * (J - 1), I * J]).T
+    # Те же суммы для одной точки
+    _helm_scalar = ScalarPoly(I, J, n, weights=[np.ones_like(I), I, I * (I - 1), J, J * (J - 1), I * J])
+    # Коэффициенты вспомогательных уравнений для плотностей на линии насыщения (IAPWS SR1-86),
+    # используются только для выбора отрезка, содержащего решение
+    _rho_w_coefs = ((1.99274064, 1 / 3), (1.09965342, 2 / 3), (-0.510839303, 5 / 3), (-1.75493479, 16 / 3),
+                    (-45.5170352, 43 / 3), (-6.74694450e5, 110 / 3))
+    _rho_s_coefs = ((-2.03150240, 2 / 6), (-2.68302940, 4 / 6), (-5.38626492, 8 / 6), (-17.2991605, 18 / 6),
+                    (-44.7586581, 37 / 6), (-63.9201063, 71 / 6))
+
+    def __init__(self):
+        super().__init__()
+        self.T_min = 623.15  # Минимальное значение температуры, K
+        self.p_min = self.p_s_marg  # Минимальное значение давления, Па
+        self.T_max = self.bound23.T_p(self.p_max)  # Максимальное значение температуры, K
+
+    def _get_T_edges(self, p):
+        """
+        Определение граничных значений температуры в области при давлении p
+        p: давление, Па
+        return: (T_lower, T_upper) - нижнее и верхнее значения температуры, К
+        """
+        return self.T_min, self.bound23.T_p(p)
+
+    def props_Tp(self, T, p):
+        """
+        Расчёт теплофизических свойств воды и водяного пара по температуре и давлению.
+        Допускается передача массивов numpy (с учётом правил broadcasting), в этом случае
+        значениями словаря являются массивы одной формы.
+        T: температура, К
+        p: давление, Па
+        return: словарь свойств
+        """
+        if is_number(T, p) or not (np.ndim(T) or np.ndim(p)):
+            T, p = float(T), float(p)
+            self.__props_Trho_point(T, self.__rho_Tp_point(T, p))
+            self.props['p'] = p
+            return self.props.copy()
+        T, p = (np.array(a, dtype=float) for a in np.broadcast_arrays(T, p))
+        self.__props_Trho(T, self.rho_Tp(T, p))
+        self.props['p'] = p
+        return self.props.copy()
+
+    def props_tp(self, t, p):
+        """
+        Расчёт теплофизических свойств воды и водяного пара по температуре и давлению.
+        t: температура, С
+        p: давление, Па
+        return: словарь свойств
+        """
+        return self.props_Tp(t + 273.15, p)
+
+    def props_Trho(self, T, rho):
+        """
+        Расчёт теплофизических свойств по температуре и плотности (основное уравнение области 3).
+        T: температура, К
+        rho: плотность, кг/м3
+        return: словарь свойств
+        """
+        if is_number(T, rho) or not (np.ndim(T) or np.ndim(rho)):
+            self.__props_Trho_point(float(T), float(rho))
+            return self.props.copy()
+        T, rho = (np.array(a, dtype=float) for a in np.broadcast_arrays(T, rho))
+        self.__props_Trho(T, rho)
+        return self.props.copy()
+
+    def props_ph(self, p, h):
+        """
+        Расчёт теплофизических свойств воды и водяного пара по давлению и энтальпии.
+        p: давление, Па
+        h: энтальпия, Дж/кг
+        return: словарь свойств
+        """
+        return self.__props_pX(p, h, 'h')
+
+    def props_ps(self, p, s):
+        """
+        Расчёт теплофизических свойств воды и водяного пара по давлению и энтропии.
+        p: давление, Па
+        s: энтропия, Дж/кг/К
+        return: словарь свойств
+        """
+        return self.__props_pX(p, s, 's')
+
+    def _pX_in(self, p, value, X):
+        """
+        Проверка нахождения пары параметров [p, h] или [p, s] в пределах области
+        p: давление, Па
+        value: значение второго параметра (h, Дж/кг или s, Дж/кг/К)
+        X: 'h' или 's'
+        return: True если точка находится внутри области, False в противном случае
+        """
+        return bool(self._pX_mask(np.array([p], dtype=float), np.array([value], dtype=float), X)[0])
+
+    def _pX_mask(self, p, value, X):
+        """
+        Векторный аналог метода _pX_in.
+        p: давление, Па (массив numpy)
+        value: значения второго параметра (h, Дж/кг или s, Дж/кг/К)
+        X: 'h' или 's'
+        return: булев массив, True для точек, находящихся внутри области
+        """
+        mask = self.p_in(p)
+        p = np.where(mask, p, self.p_max)
+        T_lower, T_upper = self._get_T_edges(p)
+        T_lower = np.full(p.shape, T_lower)
+        value_lower = self.props_Tp(T_lower, p)[X]
+        value_upper = self.props_Tp(T_upper, p)[X]
+        return mask & (value_lower <= value) & (value <= value_upper) & ~self._wet_mask(p, value, X)
+
+    def _wet_mask(self, p, value, X):
+        """
+        Точки между линиями кипящей воды и сухого насыщенного пара (при p_s_marg <= p < pc)
+        p: давление, Па (массив numpy)
+        value: значения второго параметра (h, Дж/кг или s, Дж/кг/К)
+        X: 'h' или 's'
+        return: булев массив, True для точек в области влажного пара
+        """
+        wet = np.zeros(p.shape, dtype=bool)
+        sub = (self.p_s_marg <= p) & (p < self.pc)
+        if np.any(sub):
+            value_w, value_s = self.__sat_values(p[sub], X)
+            wet[sub] = (value_w < value[sub]) & (value[sub] < value_s)
+        return wet
+
+    def rho_Tp(self, T, p):
+        """
+        Определение плотности по температуре и давлению
+        T: температура, К (массив numpy)
+        p: давление, Па (массив numpy той же формы, что и T)
+        return: плотность, кг/м3 (массив numpy)
+        """
+        return self.__rho_Tp(T, p)
+
+    def __props_pX(self, p, value, X):
+        """
+        Расчёт теплофизических свойств по давлению и энтальпии или энтропии
+        p: давление, Па
+        value: значение второго параметра (h, Дж/кг или s, Дж/кг/К)
+        X: 'h' или 's'
+        return: словарь свойств
+        """
+        scalar = is_number(p, value) or not (np.ndim(p) or np.ndim(value))
+        p, value = (np.array(a, dtype=float) for a in np.broadcast_arrays(p, value))
+        shape = p.shape
+        T, rho = self.__T_pX(p.ravel(), value.ravel(), X)
+        self.__props_Trho(T.reshape(shape), rho.reshape(shape))
+        self.props['p'] = p
+        self.props[X] = value
+        if scalar:
+            return {key: float(value) for key, value in self.props.items()}
+        return self.props.copy()
+
+    def __T_pX(self, p, value, X):
+        """
+        Определение температуры и плотности по давлению и энтальпии или энтропии.
+        При постоянном давлении h и s монотонно убывают с ростом плотности и в околокритической
+        области зависят от неё почти линейно (в отличие от зависимости от температуры, имеющей резкий
+        излом вблизи псевдокритической точки), поэтому решение ищется методом Ньютона с делением отрезка
+        пополам по плотности: (dX/drho)_p = (dX/dT)_p / (drho/dT)_p, (dh/dT)_p = cp, (ds/dT)_p = cp / T.
+        Температура для каждого значения плотности определяется из уравнения p(rho, T) = p
+        (давление при постоянной плотности монотонно возрастает с температурой).
+        p: давление, Па (одномерный массив numpy)
+        value: значения второго параметра (h, Дж/кг или s, Дж/кг/К; массив той же формы, что и p)
+        X: 'h' или 's'
+        return: кортеж (T, rho): температура, К, и плотность, кг/м3 (массивы numpy)
+        """
+        # Отрезок плотностей [rho_lo; rho_hi] и температуры на его концах T_rlo > T_rhi
+        T_rhi = np.full(p.size, self.T_min)
+        T_rlo = self.bound23.T_p(p)
+        liquid = np.ones(p.size, dtype=bool)  # ветвь изотермы при T < Tc (при p >= pc - жидкость)
+        sub = np.flatnonzero(p < self.pc)
+        if sub.size:
+            Ts = self.sc.T_p(p[sub])
+            liquid[sub] = value[sub] <= self.__sat_values(p[sub], X)[0]
+            T_rlo[sub] = np.where(liquid[sub], Ts, T_rlo[sub])
+            T_rhi[sub] = np.where(liquid[sub], T_rhi[sub], Ts)
+        X_lo, rho_lo = self.__X_Tp(T_rlo, p, X, liquid)
+        X_hi, rho_hi = self.__X_Tp(T_rhi, p, X, liquid)
+        # Начальное приближение - линейная интерполяция между значениями на концах отрезка
+        with np.errstate(divide='ignore', invalid='ignore'):
+            w = np.clip((value - X_lo) / (X_hi - X_lo), 0., 1.)
+        w = np.where(np.isfinite(w), w, 0.)
+        rho = rho_lo + w * (rho_hi - rho_lo)
+        T = T_rlo + w * (T_rhi - T_rlo)
+        rest = np.arange(p.size)  # индексы точек, для которых плотность ещё не определена
+        for _ in range(self.max_iter):
+            r = rho[rest]
+            t = self.__T_rhop(r, p[rest], T[rest], T_rhi[rest], T_rlo[rest])
+            f, fd, fdd, ft, ftt, fdt = self.__helm_sums(r / self.rc, self.Tc / t)
+            cp = self.R * (-ftt + (fd - fdt) ** 2 / (2 * fd + fdd))
+            drho_dT = -r * (fd - fdt) / (t * (2 * fd + fdd))
+            if X == 'h':
+                dX = self.R * t * (ft + fd) - value[rest]
+                dX_drho = cp / drho_dT
+            else:
+                dX = self.R * (ft - f) - value[rest]
+                dX_drho = cp / t / drho_dT
+            # X убывает с ростом плотности
+            above = dX > 0
+            lo, hi = np.where(above, r, rho_lo[rest]), np.where(above, rho_hi[rest], r)
+            t_lo, t_hi = np.where(above, t, T_rlo[rest]), np.where(above, T_rhi[rest], t)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                r_new = r - dX / dX_drho
+            bisect = ~((lo < r_new) & (r_new < hi)) & (dX != 0)
+            r_new[bisect] = 0.5 * (lo[bisect] + hi[bisect])
+            rho[rest], T[rest] = r_new, t
+            rho_lo[rest], rho_hi[rest], T_rlo[rest], T_rhi[rest] = lo, hi, t_lo, t_hi
+            done = (np.abs(r_new - r) <= self.rtol * r) | (dX == 0) | (hi - lo <= self.rtol * r)
+            rest = rest[~done]
+            if not rest.size:
+                break
+        return self.__T_rhop(rho, p, T, T_rhi, T_rlo), rho
+
+    def __T_rhop(self, rho, p, T, T_min, T_max):
+        """
+        Определение температуры по плотности и давлению методом Ньютона с делением отрезка пополам
+        rho: плотность, кг/м3 (одномерный массив numpy)
+        p: давление, Па (массив той же формы, что и rho)
+        T: начальное приближение температуры, К
+        T_min, T_max: границы отрезка, содержащего решение, К
+        return: температура, К (массив numpy)
+        """
+        T, T_min, T_max = T.copy(), T_min.copy(), T_max.copy()
+        rest = np.arange(rho.size)
+        for _ in range(self.max_iter):
+            r, t = rho[rest], T[rest]
+            fd, fdt = self.__helm_sums(r / self.rc, self.Tc / t, (1, 5))
+            dp = r * self.R * t * fd - p[rest]
+            dp_dT = r * self.R * (fd - fdt)
+            lo = np.where(dp < 0, t, T_min[rest])
+            hi = np.where(dp > 0, t, T_max[rest])
+            t_new = t - dp / dp_dT
+            bisect = ~((lo < t_new) & (t_new < hi)) & (dp != 0)
+            t_new[bisect] = 0.5 * (lo[bisect] + hi[bisect])
+            T[rest], T_min[rest], T_max[rest] = t_new, lo, hi
+            done = (np.abs(t_new - t) <= self.rtol * t) | (dp == 0)
+            rest = rest[~done]
+            if not rest.size:
+                break
+        return T
+
+    def __X_Tp(self, T, p, X, liquid):
+        """
+        Энтальпия или энтропия и плотность по температуре и давлению
+        T: температура, К (массив numpy)
+        p: давление, Па (массив numpy той же формы, что и T)
+        X: 'h' или 's'
+        liquid: булев массив - ветвь изотермы при T < Tc (True - жидкость)
+        return: кортеж (X, rho)
+        """
+        rho = self.__rho_Tp(T, p, liquid)
+        f, fd, fdd, ft, ftt, fdt = self.__helm_sums(rho / self.rc, self.Tc / T)
+        if X == 'h':
+            return self.R * T * (ft + fd), rho
+        return self.R * (ft - f), rho
+
+    def __sat_values(self, p, X):
+        """
+        Энтальпия или энтропия кипящей воды и сухого насыщенного пара по уравнению области 3
+        p: давление, Па (массив numpy, p_s_marg <= p < pc)
+        X: 'h' или 's'
+        return: кортеж (X', X'') массивов numpy
+        """
+        Ts = self.sc.T_p(p)
+        return (self.__X_Tp(Ts, p, X, np.ones(p.shape, dtype=bool))[0],
+                self.__X_Tp(Ts, p, X, np.zeros(p.shape, dtype=bool))[0])
+
+    def __rho_Tp(self, T, p, liquid=None):
+        """
+        Определение плотности по температуре и давлению
+        T: температура, К (массив numpy)
+        p: давление, Па (массив numpy той же формы, что и T)
+        liquid: булев массив - ветвь изотермы при T < Tc (True - жидкость); None - по положению точки
+                относительно линии насыщения (p >= ps(T) - жидкость)
+        return: плотность, кг/м3 (массив numpy)
+        """
+        shape = T.shape
+        T, p = T.ravel(), p.ravel()
+        rho_lo = p / (self.R * T)  # фактор сжимаемости в области 3 меньше 1, поэтому p(rho_lo) < p
+        rho_hi = np.full(T.size, self.rho_max)
+        rho = 2 * rho_lo
+        sub = np.flatnonzero(T < self.Tc)
+        if sub.size:
+            rho_w, rho_s = self.__rho_sat(T[sub])
+            # Середины отрезков [rc, rho'] и [rho'', rc] лежат в неустойчивой части изотермы,
+            # где давление ниже (со стороны жидкости) или выше (со стороны пара) давления насыщения
+            liquid = p[sub] >= self.sc.p_T(T[sub]) if liquid is None else np.ravel(liquid)[sub]
+            rho_lo[sub] = np.where(liquid, 0.5 * (self.rc + rho_w), rho_lo[sub])
+            rho_hi[sub] = np.where(liquid, rho_hi[sub], 0.5 * (self.rc + rho_s))
+            rho[sub] = np.where(liquid, rho_w, rho_s)
+        rho = np.clip(rho, rho_lo, rho_hi)
+        rest = np.arange(T.size)  # индексы точек, для которых плотность ещё не определена
+        for _ in range(self.max_iter):
+            r, t = rho[rest], T[rest]
+            fd, fdd = self.__helm_sums(r / self.rc, self.Tc / t, (1, 2))
+            dp = r * self.R * t * fd - p[rest]
+            dp_drho = self.R * t * (2 * fd + fdd)
+            lo = np.where(dp < 0, r, rho_lo[rest])
+            hi = np.where(dp > 0, r, rho_hi[rest])
+            with np.errstate(divide='ignore', invalid='ignore'):
+                r_new = r - dp / dp_drho
+            # Шаг Ньютона, выходящий за пределы отрезка, заменяется делением отрезка пополам
+            bisect = ~((lo < r_new) & (r_new < hi)) & (dp != 0)
+            r_new[bisect] = 0.5 * (lo[bisect] + hi[bisect])
+            rho[rest], rho_lo[rest], rho_hi[rest] = r_new, lo, hi
+            done = (np.abs(r_new - r) <= self.rtol * r) | (dp == 0)
+            rest = rest[~done]
+            if not rest.size:
+                break
+        return rho.reshape(shape)
+
+    def __rho_Tp_point(self, T, p):
+        """
+        Определение плотности по температуре и давлению в одной точке (см. __rho_Tp)
+        T: температура, К (число float)
+        p: давление, Па (число float)
+        return: плотность, кг/м3 (число float)
+        """
+        rho_lo = p / (self.R * T)
+        rho_hi = self.rho_max
+        rho = 2 * rho_lo
+        if T < self.Tc:
+            rho_w, rho_s = (float(r) for r in self.__rho_sat(T))
+            if p >= self.sc.p_T(T):
+                rho_lo, rho = 0.5 * (self.rc + rho_w), rho_w
+            else:
+                rho_hi, rho = 0.5 * (self.rc + rho_s), rho_s
+        rho = min(max(rho, rho_lo), rho_hi)
+        RT = self.R * T
+        tau = self.Tc / T
+        for _ in range(self.max_iter):
+            fd, fdd = self.__helm_sums(rho / self.rc, tau, (1, 2))
+            dp = rho * RT * fd - p
+            if dp == 0:
+                break
+            if dp < 0:
+                rho_lo = rho
+            else:
+                rho_hi = rho
+            dp_drho = RT * (2 * fd + fdd)
+            rho_new = rho - dp / dp_drho if dp_drho else rho_lo
+            # Шаг Ньютона, выходящий за пределы отрезка, заменяется делением отрезка пополам
+            if not rho_lo < rho_new < rho_hi:
+                rho_new = 0.5 * (rho_lo + rho_hi)
+            done = abs(rho_new - rho) <= self.rtol * rho
+            rho = rho_new
+            if done:
+                break
+        return rho
+
+    def __props_Trho(self, T, rho):
+        """
+        Расчёт теплофизических свойств по температуре и плотности (результаты в self.props)
+        T: температура, К (массив numpy)
+        rho: плотность, кг/м3 (массив numpy той же формы, что и T)
+        return: None
+        """
+        f, fd, fdd, ft, ftt, fdt = self.__helm_sums(rho / self.rc, self.Tc / T)
+        RT = self.R * T
+        self.props['T'] = T
+        self.props['p'] = rho * RT * fd
+        self.props['v'] = 1 / rho
+        self.props['u'] = RT * ft
+        self.props['s'] = self.R * (ft - f)
+        self.props['h'] = RT * (ft + fd)
+        self.props['cv'] = -self.R * ftt
+        self.props['cp'] = self.R * (-ftt + (fd - fdt) ** 2 / (2 * fd + fdd))
+        self.props['w'] = (RT * (2 * fd + fdd - (fd - fdt) ** 2 / ftt)) ** 0.5
+        # Жидкоподобные состояния (плотность выше критической) - вода, остальные - пар
+        self.props['x'] = np.where(rho >= self.rc, -1, 2)
+
+    def __props_Trho_point(self, T, rho):
+        """
+        Расчёт теплофизических свойств по температуре и плотности в одной точке (результаты - числа float
+        в self.props)
+        T: температура, К (число float)
+        rho: плотность, кг/м3 (число float)
+        return: None
+        """
+        f, fd, fdd, ft, ftt, fdt = self.__helm_sums(rho / self.rc, self.Tc / T)
+        RT = self.R * T
+        self.props['T'] = T
+        self.props['p'] = rho * RT * fd
+        self.props['v'] = 1 / rho
+        self.props['u'] = RT * ft
+        self.props['s'] = self.R * (ft - f)
+        self.props['h'] = RT * (ft + fd)
+        self.props['cv'] = -self.R * ftt
+        self.props['cp'] = self.R * (-ftt + (fd - fdt) ** 2 / (2 * fd + fdd))
+        self.props['w'] = (RT * (2 * fd + fdd - (fd - fdt) ** 2 / ftt)) ** 0.5
+        self.props['x'] = -1. if rho >= self.rc else 2.
+
+    @classmethod
+    def __helm_sums(cls, delta, tau, needed=(0, 1, 2, 3, 4, 5)):
+        """
+        Расчёт безразмерной энергии Гельмгольца и её производных по delta и tau
+        Для чисел (не массивов) - методом ScalarPoly.sums, результаты - числа float.
+        delta: приведённая плотность rho / rc (число или массив numpy)
+        tau: приведённая температура Tc / T (число или массив numpy той же формы, что и delta)
+        needed: номера требуемых сумм: 0 - f, 1 - delta * f_d, 2 - delta^2 * f_dd, 3 - tau * f_t,
+                4 - tau^2 * f_tt, 5 - delta * tau * f_dt
+        return: список сумм (в порядке номеров needed)
+        """
+        scalar = is_number(delta, tau)
+        if scalar:
+            sums = cls._helm_scalar.sums(delta, tau, tuple(needed))
+        else:
+            terms = delta[..., None] ** cls.I * tau[..., None] ** cls.J
+            sums = list(np.moveaxis(terms @ cls._helm_coefs[:, list(needed)], -1, 0))
+        # Вклад слагаемого n1 * ln(delta)
+        for k, num in enumerate(needed):
+            if num == 0:
+                sums[k] = sums[k] + cls.n1 * (log(delta) if scalar else np.log(delta))
+            elif num == 1:
+                sums[k] = sums[k] + cls.n1
+            elif num == 2:
+                sums[k] = sums[k] - cls.n1
+        return sums
+
+    @classmethod
+    def __rho_sat(cls, T):
+        """
+        Приближённые плотности кипящей воды и сухого насыщенного пара (вспомогательные уравнения IAPWS SR1-86)
+        T: температура, К (массив numpy, T < Tc)
+        return: (rho', rho'') - плотности, кг/м3
+        """
+        theta = 1 - T / cls.Tc
+        rho_w = cls.rc * (1 + sum(b * theta ** e for b, e in cls._rho_w_coefs))
+        rho_s = cls.rc * np.exp(sum(c * theta ** e for c, e in cls._rho_s_coefs))
+        return rho_w, rho_s
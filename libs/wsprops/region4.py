@@ -11,23 +11,27 @@ https://medsv.github.io/dzen/
 __author__ = "Сергей Медведев"
 __copyright__ = "Сергей Медведев, 2021"
 __license__ = "GPL"
-__version__ = "1.0"
+__version__ = "1.1"
 __maintainer__ = "Сергей Медведев"
 __email__ = "engpython@yandex.ru"
 __status__ = "Production"
 
+import numpy as np
 from .paramsin import ParamsIn
 from .region1 import Region1
 from .region2 import Region2
+from .satcache import SaturationCache
+from .scalarpoly import is_number
 
 
 class Region4(ParamsIn):
     """
     Класс содержит методы для расчёта теплофизических свойств влажного пара (область 4)
     """
-    def __init__(self):
+    def __init__(self, cache_size=128):
         """
         Инициализация параметров
+        cache_size: максимальное количество состояний на линии насыщения, хранимых в кэше (0 - без кэширования)
         """
         ParamsIn.__init__(self)
         self.region1 = Region1()
@@ -38,6 +42,7 @@ class Region4(ParamsIn):
         self.p_max = self.region1.p_sc_marg  # Максимальное значение давления, Па
         self.props_w = None  # Свойства влажного пара при степени сухости x = 0 (кипящая вода)
         self.props_s = None  # Свойства влажного пара при степени сухости x = 1 (сухой насыщенный пар)
+        self.cache = SaturationCache(cache_size)  # Кэш свойств кипящей воды и сухого насыщенного пара
 
     def props_px(self, p, x):
         """
@@ -46,10 +51,39 @@ class Region4(ParamsIn):
         x: степень сухости влажного пара x=[0; 1]
         return: словарь с вычисленными значениями теплофизических свойств
         """
+        if not is_number(p, x) and (np.ndim(p) or np.ndim(x)):
+            p, x = (np.array(a, dtype=float) for a in np.broadcast_arrays(p, x))
         self.__calc_edges_points(p)
         self.__props_x(x)
         return self.props.copy()
 
+    def props_Tx(self, T, x):
+        """
+        Расчёт теплофизических свойств влажного пара по температуре и степени сухости
+        T: температура, К
+        x: степень сухости влажного пара x=[0; 1]
+        return: словарь с вычисленными значениями теплофизических свойств
+        """
+        if not is_number(T, x) and (np.ndim(T) or np.ndim(x)):
+            T, x = (np.array(a, dtype=float) for a in np.broadcast_arrays(T, x))
+            self.__calc_edges_points(self.sc.p_T(T))
+        else:
+            self.__calc_edges_points_T(T)
+        self.__props_x(x)
+        return self.props.copy()
+
+    def props_T(self, T):
+        """
+        Расчёт теплофизических свойств кипящей воды и сухого насыщенного пара при температуре T
+        T: температура, К
+        return: кортеж двух словарей: 0 - кипящая вода, 1 - сухой насыщенный пар
+        """
+        if not is_number(T) and np.ndim(T):
+            self.__calc_edges_points(self.sc.p_T(T))
+        else:
+            self.__calc_edges_points_T(T)
+        return self.props_w.copy(), self.props_s.copy()
+
     def __props_x(self, x):
         """
         Расчёт теплофизических свойств влажного пара степенью сухости x 
@@ -96,6 +130,8 @@ class Region4(ParamsIn):
         X: 'h' или 's'
         return: словарь с вычисленными значениями теплофизических свойств
         """     
+        if not is_number(p, value) and (np.ndim(p) or np.ndim(value)):
+            p, value = (np.array(a, dtype=float) for a in np.broadcast_arrays(p, value))
         self.__calc_edges_points(p)
         x = (value - self.props_w[X]) / (self.props_s[X] - self.props_w[X])
         self.__props_x(x)
@@ -113,13 +149,36 @@ class Region4(ParamsIn):
 
     def __calc_edges_points(self, p):
         """
-        Расчёт параметров на левой и правой границах области влажного пара для заданного p
+        Расчёт параметров на левой и правой границах области влажного пара для заданного p.
+        Для скалярного p результат сохраняется в кэше self.cache, повторный расчёт при том же
+        давлении сводится к выборке из кэша.
         p: давление, Па
         return: None
         """
-        T = self.sc.T_p(p)
-        self.props_w = self.region1.props_Tp(T, p)
-        self.props_s = self.region2.props_Tp(T, p)
+        if not is_number(p) and np.ndim(p):
+            T = self.sc.T_p(p)
+            self.props_w = self.region1.props_Tp(T, p)
+            self.props_s = self.region2.props_Tp(T, p)
+            return
+        entry = self.cache.get_p(p)
+        if entry is None:
+            T = self.sc.T_p(p)
+            entry = (T, self.region1.props_Tp(T, p), self.region2.props_Tp(T, p))
+            self.cache.put(p, *entry)
+        _, self.props_w, self.props_s = entry
+
+    def __calc_edges_points_T(self, T):
+        """
+        Расчёт параметров на левой и правой границах области влажного пара для заданного T
+        T: температура, К
+        return: None
+        """
+        entry = self.cache.get_T(T)
+        if entry is None:
+            p = self.sc.p_T(T)
+            entry = (p, self.region1.props_Tp(T, p), self.region2.props_Tp(T, p))
+            self.cache.put(p, T, *entry[1:], by_T=True)
+        _, self.props_w, self.props_s = entry
 
     def Tp_in(self, T, p):
         """
@@ -137,6 +196,26 @@ class Region4(ParamsIn):
         """
         return False
 
+    def Tp_mask(self, T, p):
+        """
+        Векторный аналог метода Tp_in.
+        T и p являются взаимозависимыми параметрами для Области 4.
+        return: булев массив, заполненный False
+        """
+        return np.zeros(np.broadcast(T, p).shape, dtype=bool)
+
+    def _pX_mask(self, p, value, X):
+        """
+        Векторный аналог метода _pX_in.
+        p: давление, Па (массив numpy)
+        value: значения второго параметра (h, Дж/кг или s, Дж/кг/К)
+        X: 'h' или 's'
+        return: булев массив, True для точек, находящихся внутри области
+        """
+        mask = self.p_in(p)
+        self.__calc_edges_points(np.where(mask, p, self.p_max))
+        return mask & (self.props_w[X] <= value) & (value <= self.props_s[X])
+
     def _pX_in(self, p, value, X):
         """
         Проверка нахождения пары параметров p, h или p, s в пределах области
@@ -167,7 +246,7 @@ class Region4(ParamsIn):
         x: степень сухости x = [0; 1]
         return: True если значение корректное, False в противном случае        
         """
-        return 0. <= x <= 1.
+        return (0. <= x) & (x <= 1.)
 
     def dh_p(self, p):
         """
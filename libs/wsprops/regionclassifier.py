@@ -0,0 +1,185 @@
+"""
+В модуле размещён класс RegionClassifier, определяющий область (1, 2, 4 или 3), в которой находится точка,
+заданная парой параметров [p, h] или [p, s], без расчёта свойств по уравнениям для энергии Гиббса.
+Отличие версии 1.1 от 1.0: добавлена область 3 (необязательный параметр region3).
+-------------------------------------------------
+'Инженерные расчёты на Python'
+https://zen.yandex.ru/id/5f33dcd5554adc5b33aaee83
+https://medsv.github.io/dzen/
+"""
+
+__author__ = "Сергей Медведев"
+__copyright__ = "Сергей Медведев, 2021"
+__license__ = "GPL"
+__version__ = "1.1"
+__maintainer__ = "Сергей Медведев"
+__email__ = "engpython@yandex.ru"
+__status__ = "Production"
+
+from math import log
+import numpy as np
+
+
+class RegionClassifier:
+    """
+    Определение области по паре параметров [p, h] или [p, s].
+    При создании объекта рассчитываются граничные кривые областей как функции давления:
+    X(T_min, p) и X'(p) (область 1, при p > p_sc_marg - изотерма 623,15 К),
+    X''(p) (при p > p_sc_marg - граница между областями 2 и 3, Boundary23) и X(T_max, p) (область 2),
+    где X - h или s. Кривые хранятся в узлах двух равномерных по ln(p) сеток (до и после p_sc_marg),
+    поэтому индекс интервала вычисляется без поиска, а значение на границе - линейной интерполяцией.
+    Для каждого интервала сетки и каждой кривой хранится ширина полосы погрешности интерполяции.
+    Точки, попавшие в полосу вокруг какой-либо границы, проверяются точно методами *_mask областей,
+    поэтому результат на границах совпадает с результатом ph_in / ps_in.
+    Область 3 (если задана) - точки при p > p_s_marg между кривыми X'(p) и X''(p), за исключением
+    области влажного пара (проверяется точно методом _wet_mask области 3). Граничные кривые берутся
+    по уравнениям областей 1 и 2, поэтому несогласованность уравнений на изотерме 623,15 К и на
+    границе Boundary23 не приводит к появлению точек, не отнесённых ни к одной области.
+    """
+    KEYS = ('h', 's')
+
+    def __init__(self, region1, region2, region4, region3=None, n=256):
+        """
+        region1, region2, region4: объекты областей 1, 2 и 4 (порядок определяет приоритет на общих границах)
+        region3: объект области 3 или None (область 3 не рассматривается)
+        n: количество интервалов сетки по давлению на каждом из двух участков
+        """
+        self.regions = (region1, region2, region4) if region3 is None else (region1, region2, region4, region3)
+        self.region3 = region3
+        self.p_min = max(region1.p_min, region2.p_min)  # Минимальное значение давления, Па
+        self.p_max = min(region1.p_max, region2.p_max)  # Максимальное значение давления, Па
+        self.p_sc_marg = region1.p_sc_marg  # Давление, разделяющее участки сетки, Па
+        self.p4_min = region4.p_min  # Диапазон давлений области 4, Па
+        self.p4_max = region4.p_max
+        self.n = n
+        self.x0 = log(self.p_min)
+        self.x1 = log(self.p_sc_marg)
+        self.x2 = log(self.p_max)
+        self.dx1 = (self.x1 - self.x0) / n
+        self.dx2 = (self.x2 - self.x1) / n
+        x = np.concatenate([np.linspace(self.x0, self.x1, n + 1), np.linspace(self.x1, self.x2, n + 1)[1:]])
+        self.curves = self.__calc_curves(np.exp(x))
+        # Погрешность интерполяции оценивается по середине каждого интервала (для линейной
+        # интерполяции гладкой функции она максимальна вблизи середины), ширина полосы берётся с запасом
+        xm = (x[:-1] + x[1:]) / 2
+        exact = self.__calc_curves(np.exp(xm))
+        self.band = {}
+        for X in self.KEYS:
+            lower, upper, _ = self.__interp(np.exp(xm), self.curves[X])
+            err = np.abs(lower + upper - exact[X])
+            self.band[X] = 4 * err + 1e-12 * np.abs(self.curves[X]).max()
+
+    def __calc_curves(self, p):
+        """
+        Расчёт граничных кривых областей 1 и 2 при давлениях p
+        p: массив давлений, Па
+        return: словарь {'h': массив (4, len(p)), 's': массив (4, len(p))},
+                строки: нижняя и верхняя границы области 1, нижняя и верхняя границы области 2
+        """
+        rows = {X: [] for X in self.KEYS}
+        for region in self.regions[:2]:
+            T_lower, T_upper = region._get_T_edges(p)
+            for T in (T_lower, T_upper):
+                props = region.props_Tp(T, p)
+                for X in self.KEYS:
+                    rows[X].append(props[X])
+        return {X: np.array(rows[X]) for X in self.KEYS}
+
+    def __interp(self, p, curves):
+        """
+        Значения граничных кривых в узлах, ограничивающих интервалы сетки, в которые попадают давления p
+        p: давление, Па (массив numpy)
+        curves: массив граничных кривых (4, количество узлов)
+        return: кортеж (curves[:, i] * (1 - w), curves[:, i + 1] * w, i), где i - номера интервалов,
+                w - положение точки в интервале; сумма первых двух элементов - значения кривых в точках p
+        """
+        x = np.log(p)
+        upper = x > self.x1
+        k = np.where(upper, (x - self.x1) / self.dx2, (x - self.x0) / self.dx1)
+        i = np.clip(np.floor(k).astype(int), 0, self.n - 1)
+        w = k - i
+        i = i + upper * self.n
+        return curves[:, i] * (1 - w), curves[:, i + 1] * w, i
+
+    def classify(self, p, value, X):
+        """
+        Определение областей для массивов точек [p, h] или [p, s]
+        p: давление, Па (массив numpy)
+        value: значения второго параметра (h, Дж/кг или s, Дж/кг/К)
+        X: 'h' или 's'
+        return: массив индексов областей в self.regions (0 - область 1, 1 - область 2, 2 - область 4,
+                3 - область 3), -1 для точек, лежащих вне областей
+        """
+        p, value = (np.array(a, dtype=float) for a in np.broadcast_arrays(p, value))
+        shape = p.shape
+        p, value = p.ravel(), value.ravel()
+        idx = np.full(p.size, -1)
+        inside = (self.p_min <= p) & (p <= self.p_max)
+        pi, vi = p[inside], value[inside]
+        lower, upper, i = self.__interp(pi, self.curves[X])
+        curves = lower + upper
+        lo1, up1, lo2, up2 = curves
+        res = np.full(pi.size, -1)
+        res[(lo1 <= vi) & (vi <= up1)] = 0
+        res[(res < 0) & (lo2 <= vi) & (vi <= up2)] = 1
+        res[(res < 0) & (self.p4_min <= pi) & (pi <= self.p4_max) & (up1 <= vi) & (vi <= lo2)] = 2
+        # Точки в окрестности границ проверяются точно
+        band = self.band[X][:, i]
+        near = np.any(np.abs(curves - vi) <= band, axis=0)
+        if np.any(near):
+            rest = np.flatnonzero(near)
+            res[rest] = -1
+            for num, region in enumerate(self.regions[:3]):
+                if not rest.size:
+                    break
+                mask = region._pX_mask(pi[rest], vi[rest], X)
+                res[rest[mask]] = num
+                rest = rest[~mask]
+        if self.region3 is not None:
+            # Точки, не отнесённые к областям 1 и 2, между кривыми X'(p) и X''(p) (с учётом полос)
+            rest = np.flatnonzero((res < 0) & (pi > self.p4_max) & (pi <= self.region3.p_max) &
+                                  (up1 - band[1] <= vi) & (vi <= lo2 + band[2]))
+            if rest.size:
+                res[rest[~self.region3._wet_mask(pi[rest], vi[rest], X)]] = 3
+        idx[inside] = res
+        return idx.reshape(shape)
+
+    def region_pX(self, p, value, X):
+        """
+        Определение области для точки [p, h] или [p, s]
+        p: давление, Па
+        value: значение второго параметра (h, Дж/кг или s, Дж/кг/К)
+        X: 'h' или 's'
+        return: объект области или None, если точка лежит вне областей
+        """
+        if not (self.p_min <= p <= self.p_max):
+            return None
+        x = log(p)
+        if x > self.x1:
+            k = (x - self.x1) / self.dx2
+            i = min(int(k), self.n - 1)
+            w = k - i
+            i += self.n
+        else:
+            k = (x - self.x0) / self.dx1
+            i = min(int(k), self.n - 1)
+            w = k - i
+        curves, band = self.curves[X], self.band[X]
+        lo1, up1, lo2, up2 = (curves[j, i] * (1 - w) + curves[j, i + 1] * w for j in range(4))
+        if (abs(lo1 - value) <= band[0, i] or abs(up1 - value) <= band[1, i] or
+                abs(lo2 - value) <= band[2, i] or abs(up2 - value) <= band[3, i]):
+            # Точка в окрестности границы - точная проверка
+            for region in self.regions[:3]:
+                if region._pX_in(p, value, X):
+                    return region
+        elif lo1 <= value <= up1:
+            return self.regions[0]
+        elif lo2 <= value <= up2:
+            return self.regions[1]
+        elif self.p4_min <= p <= self.p4_max and up1 <= value <= lo2:
+            return self.regions[2]
+        if (self.region3 is not None and self.p4_max < p <= self.region3.p_max and
+                up1 - band[1, i] <= value <= lo2 + band[2, i] and
+                not self.region3._wet_mask(np.array([p]), np.array([value]), X)[0]):
+            return self.region3
+        return None
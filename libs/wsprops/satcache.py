@@ -0,0 +1,111 @@
+"""
+В модуле размещён класс SaturationCache - ограниченный по размеру кэш состояний на линии насыщения
+(кипящая вода и сухой насыщенный пар), используемый классом Region4.
+-------------------------------------------------
+'Инженерные расчёты на Python'
+https://zen.yandex.ru/id/5f33dcd5554adc5b33aaee83
+https://medsv.github.io/dzen/
+"""
+
+__author__ = "Сергей Медведев"
+__copyright__ = "Сергей Медведев, 2021"
+__license__ = "GPL"
+__version__ = "1.0"
+__maintainer__ = "Сергей Медведев"
+__email__ = "engpython@yandex.ru"
+__status__ = "Production"
+
+from collections import OrderedDict
+from threading import Lock
+
+
+class SaturationCache:
+    """
+    Кэш состояний на линии насыщения с вытеснением давно не использовавшихся записей (LRU).
+    Запись содержит температуру насыщения и словари свойств кипящей воды и сухого насыщенного пара.
+    Ключом записи является давление; дополнительно запись может быть найдена по температуре,
+    если она была добавлена с указанием температуры, по которой рассчитывалась.
+    """
+
+    def __init__(self, maxsize=128):
+        """
+        maxsize: максимальное количество записей (0 - кэширование отключено)
+        """
+        self.maxsize = maxsize
+        self.hits = 0  # Количество найденных в кэше записей
+        self.misses = 0  # Количество обращений, для которых запись не найдена
+        self.__data = OrderedDict()  # p -> (T, props_w, props_s)
+        self.__T_index = {}  # T -> p
+        self.__lock = Lock()
+
+    def get_p(self, p):
+        """
+        Поиск записи по давлению
+        p: давление, Па
+        return: кортеж (T, props_w, props_s) или None, если запись не найдена
+        """
+        with self.__lock:
+            entry = self.__data.get(p)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.__data.move_to_end(p)
+            return entry
+
+    def get_T(self, T):
+        """
+        Поиск записи по температуре
+        T: температура, К
+        return: кортеж (p, props_w, props_s) или None, если запись не найдена
+        """
+        with self.__lock:
+            p = self.__T_index.get(T)
+            if p is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.__data.move_to_end(p)
+            return (p,) + self.__data[p][1:]
+
+    def put(self, p, T, props_w, props_s, by_T=False):
+        """
+        Добавление записи
+        p: давление, Па
+        T: температура насыщения, К
+        props_w: словарь свойств кипящей воды
+        props_s: словарь свойств сухого насыщенного пара
+        by_T: True, если состояние рассчитывалось по температуре (запись будет доступна и по T)
+        return: None
+        """
+        if self.maxsize <= 0:
+            return
+        with self.__lock:
+            old = self.__data.pop(p, None)
+            if old is not None:
+                self.__T_index.pop(old[0], None)
+            self.__data[p] = (T, props_w, props_s)
+            if by_T:
+                self.__T_index[T] = p
+            while len(self.__data) > self.maxsize:
+                _, (T_old, _, _) = self.__data.popitem(last=False)
+                if self.__T_index.get(T_old) is not None and self.__T_index[T_old] not in self.__data:
+                    del self.__T_index[T_old]
+
+    def clear(self):
+        """
+        Очистка кэша и сброс счётчиков
+        return: None
+        """
+        with self.__lock:
+            self.__data.clear()
+            self.__T_index.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """
+        Статистика использования кэша
+        return: словарь {'hits', 'misses', 'size', 'maxsize'}
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.__data), 'maxsize': self.maxsize}
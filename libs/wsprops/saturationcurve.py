@@ -12,11 +12,12 @@ https://medsv.github.io/dzen/
 """
 
 import numpy as np
+from .scalarpoly import is_number
 
 __author__ = "Sergey Medvedev"
 __copyright__ = "Sergey Medvedev, 2020"
 __license__ = "GPL"
-__version__ = "1.2"
+__version__ = "1.3"
 __maintainer__ = "Sergey Medvedev"
 __email__ = "engpython@yandex.ru"
 __status__ = "Production"
@@ -25,6 +26,8 @@ class SaturationCurve (object):
     """
     Линия насыщения водяного пара
     Отличие от версии 1.0: нижнее значение по давлению изменено с 611.213 на 611.212677
+    Отличие от версии 1.2: методы p_T, p_t, T_p, t_p принимают массивы numpy (списки) и, при errors='nan',
+    вместо генерации исключения возвращают NaN для значений вне допустимого диапазона и маску допустимых значений
     """
     n = np.array([0.11670521452767E4, -0.72421316703206E6, -0.17073846940092E2, 0.12020824702470E5,
         -0.32325550322333E7, 0.14915108613530E2, -0.48232657361591E4, 0.40511340542057E6,
@@ -39,52 +42,61 @@ class SaturationCurve (object):
         self.p_min = 611.212677  # Минимальное значение давления, Па
         self.p_max = 22.064e6  # Максимальное значение давления, Па
 
-    def p_T(self, T):
+    def p_T(self, T, errors='raise'):
         """
         Определение давления насыщения (Па) по заданной температуре (К)
-        T: температура, К
-        return: абсолютное давление, Па
+        T: температура, К (число или массив)
+        errors: 'raise' - генерация исключения, если значение лежит вне допустимого диапазона,
+                'nan' - для значений вне допустимого диапазона возвращается NaN
+        return: абсолютное давление, Па; при errors='nan' - кортеж (давление, маска допустимых значений)
         """
-        if not (self.T_in(T)):
-            raise ValueError(f"Значение температуры должно находиться в диапазоне [{self.T_min} K; {self.T_max} K]")
+        T, valid = self.__check(T, 'T', errors)
         T = T + self.n[8] / (T - self.n[9])
         A = T * T + self.n[0] * T + self.n[1]
         B = self.n[2] * T * T + self.n[3] * T + self.n[4]
         C = self.n[5] * T * T + self.n[6] * T + self.n[7]
         p = (2 * C / (-B + (B * B - 4 * A * C) ** 0.5)) ** 4 * 1e6
-        return p
+        return self.__result(p, valid, errors)
 
-    def p_t(self, t):
+    def p_t(self, t, errors='raise'):
         """
         Определение давления насыщения (Па) по заданной температуре (C)
-        t: температура, C
-        return: абсолютное давление, Па
+        t: температура, C (число или массив)
+        errors: 'raise' или 'nan' (см. p_T)
+        return: абсолютное давление, Па; при errors='nan' - кортеж (давление, маска допустимых значений)
         """
-        return self.p_T(t+273.15)
+        if not is_number(t) and np.ndim(t):
+            t = np.asarray(t, dtype=float)
+        return self.p_T(t + 273.15, errors)
 
-    def T_p(self, p):
+    def T_p(self, p, errors='raise'):
         """
         Определение температуры насыщения (К) по заданному давлению (Па)
-        p: абсолютное давление, Па
-        return: температура, К
+        p: абсолютное давление, Па (число или массив)
+        errors: 'raise' - генерация исключения, если значение лежит вне допустимого диапазона,
+                'nan' - для значений вне допустимого диапазона возвращается NaN
+        return: температура, К; при errors='nan' - кортеж (температура, маска допустимых значений)
         """
-        if not (self.p_in(p)):
-            raise ValueError(f"Значение давления должно находиться в диапазоне [{self.p_min} Па; {self.p_max/1e6} МПа]")
+        p, valid = self.__check(p, 'p', errors)
         betta = (p / 1e6) ** 0.25
         E = betta * betta + self.n[2] * betta + self.n[5]
         F = self.n[0] * betta * betta + self.n[3] * betta + self.n[6]
         G = self.n[1] * betta * betta + self.n[4] * betta + self.n[7]
         D = 2 * G / (-F - (F * F - 4 * E * G) ** 0.5)
         T = (self.n[9] + D - ((self.n[9] + D) ** 2 - 4 * (self.n[8] + self.n[9] * D)) ** 0.5) / 2
-        return T
+        return self.__result(T, valid, errors)
 
-    def t_p(self, p):
+    def t_p(self, p, errors='raise'):
         """
         Определение температуры насыщения (C) по заданному давлению (Па)
-        p: абсолютное давление, Па
-        return: температура, C
-        """
-        return self.T_p(p) - 273.15
+        p: абсолютное давление, Па (число или массив)
+        errors: 'raise' или 'nan' (см. T_p)
+        return: температура, C; при errors='nan' - кортеж (температура, маска допустимых значений)
+        """
+        if errors == 'nan':
+            T, valid = self.T_p(p, errors)
+            return T - 273.15, valid
+        return self.T_p(p, errors) - 273.15
 
     def p_in(self, p):
         """
@@ -92,7 +104,7 @@ class SaturationCurve (object):
         p: давление, Па
         return: True если давление находится внутри допустимого диапазона, False в противном сучае
         """
-        return self.p_min <= p <= self.p_max
+        return (self.p_min <= p) & (p <= self.p_max)
 
     def T_in(self, T):
         """
@@ -100,7 +112,7 @@ class SaturationCurve (object):
         T: температура, К
         return: True если температура находится внутри допустимого диапазона, False в противном сучае
         """
-        return self.T_min <= T <= self.T_max
+        return (self.T_min <= T) & (T <= self.T_max)
 
     def t_in(self, t):
         """
@@ -109,3 +121,42 @@ class SaturationCurve (object):
         return: True если температура находится внутри допустимого диапазона, False в противном сучае
         """
         return self.T_in(t + 273.15)
+
+    def __check(self, value, name, errors):
+        """
+        Проверка входного параметра
+        value: значение параметра (число или массив)
+        name: 'T' - температура, 'p' - давление
+        errors: 'raise' или 'nan'
+        return: кортеж (значение параметра, маска допустимых значений); при errors='nan' недопустимые значения
+                заменяются на нижнюю границу диапазона, чтобы расчёт по ним не приводил к ошибкам
+        """
+        if errors not in ('raise', 'nan'):
+            raise ValueError(f"Недопустимое значение параметра errors: {errors}")
+        value_in, substitute = (self.T_in, self.T_min) if name == 'T' else (self.p_in, self.p_min)
+        if not is_number(value) and np.ndim(value):
+            value = np.asarray(value, dtype=float)
+            valid = value_in(value)
+            if valid.all():
+                return value, valid
+        else:
+            valid = bool(value_in(value))
+            if valid:
+                return value, valid
+        if errors == 'raise':
+            if name == 'T':
+                raise ValueError(f"Значение температуры должно находиться в диапазоне [{self.T_min} K; {self.T_max} K]")
+            raise ValueError(f"Значение давления должно находиться в диапазоне [{self.p_min} Па; {self.p_max/1e6} МПа]")
+        return np.where(valid, value, substitute), valid
+
+    @staticmethod
+    def __result(value, valid, errors):
+        """
+        Формирование результата: при errors='nan' недопустимые значения заменяются на NaN
+        и возвращается кортеж (значение, маска допустимых значений)
+        """
+        if errors == 'raise':
+            return value
+        if not is_number(value) and np.ndim(value):
+            return np.where(valid, value, np.nan), valid
+        return (value if valid else np.nan), valid
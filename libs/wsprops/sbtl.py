@@ -0,0 +1,812 @@
+"""
+В модуле размещён класс SBTL - быстрый табличный (Spline-Based Table Look-up) расчёт теплофизических свойств
+воды и водяного пара в областях 1, 2 и 4. Таблицы рассчитываются по уравнениям классов Region1, Region2, Region4
+и могут быть сохранены на диск и открыты в режиме отображения в память (numpy.memmap), что позволяет
+нескольким процессам использовать одну копию таблиц.
+Используется классом HSDiag при создании объекта с параметром sbtl=True.
+-------------------------------------------------
+'Инженерные расчёты на Python'
+https://zen.yandex.ru/id/5f33dcd5554adc5b33aaee83
+https://medsv.github.io/dzen/
+"""
+
+__author__ = "Сергей Медведев"
+__copyright__ = "Сергей Медведев, 2021"
+__license__ = "GPL"
+__version__ = "1.2"
+__maintainer__ = "Сергей Медведев"
+__email__ = "engpython@yandex.ru"
+__status__ = "Production"
+
+import json
+import os
+import tempfile
+from math import exp, floor, log, sqrt
+import numpy as np
+from scipy.interpolate import CubicSpline
+from .scalarpoly import is_number
+
+# Свойства, хранящиеся в таблицах. Вместо v хранится ln(v): удельный объём пара меняется на несколько порядков
+FIELDS_TP = ('h', 's', 'cp', 'cv', 'v', 'u', 'w')  # таблицы по (p, T)
+FIELDS_PH = ('T', 's', 'cp', 'cv', 'v', 'u', 'w')  # таблицы по (p, h)
+FIELDS_SAT = ('h', 's', 'cp', 'cv', 'v', 'u', 'w')  # таблица линии насыщения (для воды и для пара)
+X_REGION = (-1, 2)  # Значения x в однофазных областях 1 и 2 (как в Region1, Region2)
+FORMAT_VERSION = 3  # Версия формата файлов таблиц
+# Значения ячейки двумерной таблицы - угловой узел (a, b) x [f, f_y, f_x, f_xy], т.е. (a, b, dx, dy):
+# номера базисных функций Эрмита по x и по y (см. _hermite) для каждого из 16 значений
+_A, _B, _DX, _DY = np.indices((2, 2, 2, 2)).reshape(4, -1)
+_IX, _IY = _A + 2 * _DX, _B + 2 * _DY
+
+
+def _hermite(t):
+    """
+    Базисные функции кубического полинома Эрмита на отрезке [0; 1]
+    t: положение точки на отрезке (число или массив numpy)
+    return: массив (4, ...): коэффициенты при значениях в узлах 0 и 1 и при производных в узлах 0 и 1
+    """
+    return np.array([(1 + 2 * t) * (1 - t) ** 2, t * t * (3 - 2 * t), t * (1 - t) ** 2, t * t * (t - 1)])
+
+
+def _hermite_point(t):
+    """
+    Базисные функции кубического полинома Эрмита для одной точки (см. _hermite)
+    t: положение точки на отрезке (число float)
+    return: кортеж чисел float
+    """
+    s = 1 - t
+    return (1 + 2 * t) * s * s, t * t * (3 - 2 * t), t * s * s, t * t * (t - 1)
+
+
+def _cell(f, n):
+    """
+    Определение ячейки сетки, в которую попадает точка, и положения точки в ячейке
+    f: положение точки в единицах шага сетки (массив numpy)
+    n: количество узлов сетки
+    return: (i, t) - номера левых узлов ячеек и положения точек в ячейках (в норме t = [0; 1])
+    """
+    i = np.clip(np.floor(f).astype(int), 0, n - 2)
+    return i, f - i
+
+
+def _spline_nodes(values, axis):
+    """
+    Производные кубического сплайна (условие not-a-knot) по номеру узла в узлах равномерной сетки
+    values: значения в узлах (массив numpy)
+    axis: ось, вдоль которой строится сплайн
+    return: массив производных формы values
+    """
+    nodes = np.arange(values.shape[axis])
+    return CubicSpline(nodes, values, axis=axis)(nodes, 1)
+
+
+def _to_grid(y, side):
+    """
+    Переход от относительной температуры (энтальпии) y к равномерной координате сетки.
+    Узлы сетки сгущаются к линии насыщения (y = eta**2 или y = 1 - (1 - eta)**2), где свойства меняются быстрее
+    y: относительная температура (энтальпия) (число или массив numpy)
+    side: сторона сгущения узлов: 0 - нижняя граница (область 2), 1 - верхняя граница (область 1)
+    return: eta = [0; 1]
+    """
+    if side == 0:
+        return np.sqrt(np.maximum(y, 0.))
+    return 1. - np.sqrt(np.maximum(1. - y, 0.))
+
+
+def _to_grid_point(y, side):
+    """
+    Переход к равномерной координате сетки для одной точки (см. _to_grid)
+    y: относительная температура (энтальпия) (число float)
+    side: сторона сгущения узлов
+    return: eta (число float)
+    """
+    if side == 0:
+        return sqrt(max(y, 0.))
+    return 1. - sqrt(max(1. - y, 0.))
+
+
+def _from_grid(eta, side):
+    """
+    Переход от равномерной координаты сетки eta к относительной температуре (энтальпии) y
+    (обратное преобразование к _to_grid)
+    """
+    if side == 0:
+        return eta ** 2
+    return 1. - (1. - eta) ** 2
+
+
+class SBTL:
+    """
+    Табличный расчёт теплофизических свойств воды и водяного пара.
+    Однофазные области 1 и 2 разбиты давлением p_sc_marg на два участка (a - ниже, b - выше), для каждого
+    участка строятся таблицы по координатам x = ln(p) и y = [0; 1] - относительному положению
+    температуры (энтальпии) между границами области при данном давлении. Поэтому границы областей
+    (линия насыщения, изотерма 623,15 К, Boundary23) совпадают с линиями сетки. Значения в точке
+    рассчитываются бикубическим сплайном (тензорное произведение кубических сплайнов по x и y,
+    непрерывны первые и вторые производные, в том числе на границах ячеек): в узлах таблиц хранятся
+    значения f и производные сплайна f_x, f_y, f_xy, внутри ячейки используется бикубический полином
+    Эрмита по четырём угловым узлам. Для области 4 используется одномерная таблица (кубический сплайн)
+    свойств на линии насыщения и правило рычага.
+
+    Максимальное отклонение от IF97 определяется при построении таблиц в центрах ячеек сетки и
+    доступно в атрибуте max_dev (относительное отклонение по каждому свойству для каждой таблицы;
+    для h, s, u - отнесённое к наибольшему по модулю значению в таблице).
+    Для размеров сетки по умолчанию (nx=200, ny=100) отклонение не превышает 2e-5 для T, h, s, u, v
+    и 2e-4 для cp, cv, w (наибольшие значения - вблизи линии насыщения).
+    Файлы таблиц записываются во временные файлы того же каталога и переименовываются (os.replace),
+    файл описания meta.json - последним, поэтому другой процесс не может открыть частично записанную таблицу.
+    Отличие от версии 1.0: кусочная интерполяция Лагранжа по 4 x 4 узлам (без непрерывности производных
+    на границах ячеек) заменена бикубическим сплайном; запись файлов таблиц атомарная.
+    Значения в узлах таблиц по (p, h) согласованы с прямыми уравнениями IF97, поэтому отличие от результата
+    HSDiag.props_ph в основном определяется погрешностью обратных уравнений T(p, h) (до 0,025 К).
+    Отличие от версии 1.1: границы областей по температуре (как и по энтальпии) - одномерные таблицы
+    (T_sat(p), Boundary23 и методы Tp_mask не вычисляются при расчёте), одномерные таблицы рассчитываются
+    по коэффициентам кубических полиномов ячеек; 16 значений ячейки двумерной таблицы выбираются из таблицы,
+    развёрнутой по строкам узлов, по номерам четырёх угловых узлов частями по chunk точек (промежуточные
+    массивы остаются в кэше процессора); одна точка рассчитывается над числами float (16 значений ячейки -
+    одним срезом таблицы); таблицы, рассчитанные без каталога, сохраняются в атрибуте класса и используются
+    всеми объектами SBTL с тем же размером сетки (повторное создание HSDiag(sbtl=True) не пересчитывает таблицы).
+    Время расчёта (около 98 тыс. точек областей 1 и 2; в скобках - HSDiag без SBTL): массивы по (p, T) - 27 мс
+    (34 мс), по (p, h) - 26 мс (67 мс); одна точка по (p, T) и по (p, h) - 7 мкс (9 мкс в области 1,
+    12 мкс в области 2). Расчёт массива ограничен выборкой значений ячеек из памяти (около 900 байт на точку).
+    """
+    chunk = 2048  # Количество точек, интерполируемых за один шаг (двумерные таблицы)
+    _built = {}  # Таблицы, рассчитанные без каталога: (nx, ny) -> (tables, meta)
+
+    def __init__(self, hs, path=None, nx=200, ny=100):
+        """
+        hs: объект HSDiag, по уравнениям которого рассчитываются таблицы
+        path: каталог таблиц. Если в каталоге есть таблицы, они открываются в режиме отображения в память,
+              в противном случае таблицы рассчитываются и сохраняются в каталог. None - таблицы только в памяти
+              (рассчитываются один раз для каждого размера сетки, около 2 с, и используются всеми объектами)
+        nx: количество узлов сетки по ln(p) на каждом участке
+        ny: количество узлов сетки по относительной температуре (энтальпии)
+        """
+        self.region1 = hs.region1
+        self.region2 = hs.region2
+        self.region4 = hs.region4
+        self.sc = hs.sc
+        self.p_min = max(self.region1.p_min, self.region2.p_min)  # Минимальное значение давления, Па
+        self.p_max = min(self.region1.p_max, self.region2.p_max)  # Максимальное значение давления, Па
+        self.p_sc_marg = self.region1.p_sc_marg  # Давление, разделяющее участки a и b, Па
+        self.tables = {}  # имя таблицы -> массив значений в узлах (узлы по x, [узлы по y,] свойства)
+        self.meta = {}  # имя таблицы -> {'x0', 'x1', 'side', 'fields', 'max_dev'}
+        self.__arrays = {}  # имя таблицы -> массив numpy (без подкласса numpy.memmap: индексация быстрее)
+        self.__rows = {}  # имя двумерной таблицы -> массив (nx * ny, 4 * количество свойств) - строки узлов
+        self.__cells = {}  # имя одномерной таблицы -> массив (4 * количество свойств, n - 1) - коэффициенты
+        # кубических полиномов ячеек (по степеням t)
+        self.__lists = {}  # имя одномерной таблицы -> коэффициенты ячеек (списки чисел float)
+        self.__grids = {}  # имя таблицы -> параметры сетки для расчёта одной точки (см. __index)
+        if path is not None and self.__saved_format(path) == FORMAT_VERSION:
+            self.load(path)
+        else:
+            self.nx, self.ny = nx, ny
+            built = SBTL._built.get((nx, ny))
+            if built is None:
+                self.__build()
+                for values in self.tables.values():
+                    values.flags.writeable = False  # таблицы общие для всех объектов
+                SBTL._built[(nx, ny)] = dict(self.tables), dict(self.meta)
+            else:
+                self.tables, self.meta = dict(built[0]), dict(built[1])
+                for name in self.tables:
+                    self.__index(name)
+            if path is not None:
+                self.save(path)
+        self.max_dev = {name: meta['max_dev'] for name, meta in self.meta.items() if meta['max_dev']}
+
+    # ---------- построение таблиц ----------
+
+    def __build(self):
+        """
+        Расчёт всех таблиц и оценка отклонения от IF97
+        return: None
+        """
+        for seg, (p0, p1) in (('a', (self.p_min, self.p_sc_marg)), ('b', (self.p_sc_marg, self.p_max))):
+            x0, x1 = log(p0), log(p1)
+            for num, region in ((1, self.region1), (2, self.region2)):
+                side = 1 if num == 1 else 0  # сторона линии насыщения
+                self.__build_2d(f'Tp{num}{seg}', self.__calc_Tp, region, x0, x1, side, FIELDS_TP)
+                self.__build_2d(f'ph{num}{seg}', self.__calc_ph, region, x0, x1, side, FIELDS_PH)
+            # Граничные значения температуры и энтальпии областей 1 и 2 для определения области
+            # и относительной координаты y по (p, T) и (p, h)
+            for X in ('T', 'h'):
+                fields = [f'{X}_lower1', f'{X}_upper1', f'{X}_lower2', f'{X}_upper2']
+                self.__build_1d(f'{X}{seg}', lambda x, X=X: self.__calc_edges(x, X), x0, x1, fields)
+        # Линия насыщения
+        fields = ['T'] + [f + '_w' for f in FIELDS_SAT] + [f + '_s' for f in FIELDS_SAT]
+        self.__build_1d('sat', self.__calc_sat, log(self.region4.p_min), log(self.region4.p_max), fields)
+
+    def __build_1d(self, name, calc, x0, x1, fields):
+        """
+        Расчёт одномерной таблицы и оценка отклонения интерполяции от IF97 в центрах ячеек
+        name: имя таблицы
+        calc: функция расчёта значений (массив (len(fields), len(x))) по ln(p)
+        x0, x1: границы таблицы по ln(p)
+        fields: имена хранимых значений
+        return: None
+        """
+        x = np.linspace(x0, x1, self.nx)
+        self.tables[name] = self.__spline1(calc(x).T)
+        self.meta[name] = {'x0': x0, 'x1': x1, 'fields': list(fields), 'max_dev': {}}
+        self.__index(name)
+        xm = (x[:-1] + x[1:]) / 2
+        self.meta[name]['max_dev'] = self.__deviation(fields, calc(xm), self.__interp1(name, xm).T)
+
+    def __build_2d(self, name, calc, region, x0, x1, side, fields):
+        """
+        Расчёт двумерной таблицы и оценка отклонения интерполяции от IF97 в центрах ячеек
+        name: имя таблицы
+        calc: функция расчёта значений в точках (__calc_Tp или __calc_ph)
+        region: объект области
+        x0, x1: границы участка по ln(p)
+        side: сторона сгущения узлов по y (см. _to_grid)
+        fields: имена хранимых свойств
+        return: None
+        """
+        x = np.linspace(x0, x1, self.nx)
+        eta = np.linspace(0., 1., self.ny)
+        self.tables[name] = self.__spline2(np.moveaxis(calc(region, x[:, None], _from_grid(eta, side)[None, :]), 0, -1))
+        self.meta[name] = {'x0': x0, 'x1': x1, 'side': side, 'fields': list(fields), 'max_dev': {}}
+        self.__index(name)
+        xm, ym = np.broadcast_arrays((x[:-1] + x[1:])[:, None] / 2, _from_grid((eta[:-1] + eta[1:]) / 2, side))
+        exact = calc(region, xm, ym)
+        approx = self.__interp2(name, xm.ravel(), ym.ravel()).T.reshape(exact.shape)
+        self.meta[name]['max_dev'] = self.__deviation(fields, exact, approx)
+
+    @staticmethod
+    def __spline1(values):
+        """
+        Одномерная таблица кубического сплайна
+        values: значения в узлах (узлы, свойства)
+        return: массив (узлы, 2, свойства): значения и производные по номеру узла
+        """
+        return np.stack([values, _spline_nodes(values, 0)], axis=1)
+
+    @staticmethod
+    def __spline2(values):
+        """
+        Двумерная таблица бикубического сплайна
+        values: значения в узлах (узлы по x, узлы по y, свойства)
+        return: массив (узлы по x, узлы по y, 2, 2, свойства): [f, f_y], [f_x, f_xy] (производные по номерам узлов)
+        """
+        fx = _spline_nodes(values, 0)
+        fy = _spline_nodes(values, 1)
+        fxy = _spline_nodes(fx, 1)
+        return np.stack([np.stack([values, fy], axis=2), np.stack([fx, fxy], axis=2)], axis=2)
+
+    @staticmethod
+    def __deviation(fields, exact, approx):
+        """
+        Максимальное относительное отклонение интерполированных значений от точных.
+        Для h, s и u, нулевой уровень которых выбран произвольно (тройная точка), отклонение отнесено
+        к наибольшему по модулю значению в таблице
+        fields: имена свойств
+        exact, approx: массивы (len(fields), ...) точных и интерполированных значений
+        return: словарь {свойство: отклонение}
+        """
+        dev = {}
+        for k, field in enumerate(fields):
+            e, a = exact[k], approx[k]
+            if field[0] == 'v':  # хранится ln(v)
+                e, a = np.exp(e), np.exp(a)
+            scale = np.abs(e).max() if field[0] in 'hsu' else np.abs(e)
+            dev[field] = float(np.max(np.abs(a - e) / scale))
+        return dev
+
+    def __p_T_edges(self, region, x):
+        """
+        Давления и граничные значения температуры в области в узлах сетки
+        region: объект области
+        x: ln(p) (массив numpy)
+        return: (p, T_lower, T_upper) - массивы формы x
+        """
+        p = np.clip(np.exp(x), self.p_min, self.p_max)
+        T_lower, T_upper = region._get_T_edges(p)
+        return p, np.broadcast_to(T_lower, p.shape), np.broadcast_to(T_upper, p.shape)
+
+    def __calc_edges(self, x, X):
+        """
+        Граничные значения температуры или энтальпии областей 1 и 2
+        x: ln(p) (одномерный массив numpy)
+        X: 'T' или 'h'
+        return: массив (4, len(x)) - нижняя и верхняя границы области 1, нижняя и верхняя границы области 2
+        """
+        edges = []
+        for region in (self.region1, self.region2):
+            p, T_lower, T_upper = self.__p_T_edges(region, x)
+            if X == 'T':
+                edges += [T_lower, T_upper]
+            else:
+                edges += [region.props_Tp(T, p, fields=('h',))['h'] for T in (T_lower, T_upper)]
+        return np.array(edges)
+
+    def __calc_Tp(self, region, x, y):
+        """
+        Расчёт значений свойств в узлах таблицы по (p, T)
+        region: объект области
+        x: ln(p); y: относительная температура (массивы numpy, допускающие broadcasting)
+        return: массив (len(FIELDS_TP), ...)
+        """
+        x, y = np.broadcast_arrays(x, y)
+        p, T_lower, T_upper = self.__p_T_edges(region, x)
+        return self.__pack(region.props_Tp(T_lower + y * (T_upper - T_lower), p), FIELDS_TP)
+
+    def __calc_ph(self, region, x, y):
+        """
+        Расчёт значений свойств в узлах таблицы по (p, h).
+        Температура в узле определяется по прямому уравнению методом Ньютона (dh/dT = cp) с защитой
+        делением отрезка пополам, поэтому значения в узлах согласованы с уравнениями IF97.
+        region: объект области
+        x: ln(p); y: относительная энтальпия (массивы numpy, допускающие broadcasting)
+        return: массив (len(FIELDS_PH), ...)
+        """
+        x, y = np.broadcast_arrays(x, y)
+        p, lo, hi = self.__p_T_edges(region, x)
+        h_lower = region.props_Tp(lo, p)['h']
+        h_upper = region.props_Tp(hi, p)['h']
+        h = h_lower + y * (h_upper - h_lower)
+        T = lo + y * (hi - lo)
+        for _ in range(50):
+            props = region.props_Tp(T, p)
+            dh = h - props['h']
+            lo = np.where(dh > 0, T, lo)
+            hi = np.where(dh < 0, T, hi)
+            T_new = T + dh / props['cp']
+            T_new = np.where((lo < T_new) & (T_new < hi), T_new, (lo + hi) / 2)
+            converged = np.max(np.abs(T_new - T)) < 1e-10
+            T = T_new
+            if converged:
+                break
+        return self.__pack(region.props_Tp(T, p), FIELDS_PH)
+
+    def __calc_sat(self, x):
+        """
+        Расчёт свойств на линии насыщения
+        x: ln(p) (одномерный массив numpy)
+        return: массив (1 + 2 * len(FIELDS_SAT), len(x))
+        """
+        p = np.clip(np.exp(x), self.region4.p_min, self.region4.p_max)
+        T = self.sc.T_p(p)
+        props_w = self.region1.props_Tp(T, p)
+        props_s = self.region2.props_Tp(T, p)
+        return np.concatenate([T[None], self.__pack(props_w, FIELDS_SAT), self.__pack(props_s, FIELDS_SAT)])
+
+    @staticmethod
+    def __pack(props, fields):
+        """
+        Преобразование словаря свойств в массив значений таблицы (v заменяется на ln(v))
+        """
+        return np.array([np.log(props[f]) if f == 'v' else props[f] for f in fields])
+
+    # ---------- сохранение и загрузка ----------
+
+    def save(self, path):
+        """
+        Сохранение таблиц в каталог (по одному файлу .npy на таблицу и файл описания meta.json).
+        Каждый файл записывается во временный файл и переименовывается, meta.json - последним
+        path: каталог
+        return: None
+        """
+        os.makedirs(path, exist_ok=True)
+        for name, values in self.tables.items():
+            self.__write(path, name + '.npy', lambda f: np.save(f, np.ascontiguousarray(values)))
+        meta = {'format': FORMAT_VERSION, 'nx': self.nx, 'ny': self.ny, 'tables': self.meta}
+        self.__write(path, 'meta.json', lambda f: f.write(json.dumps(meta).encode('utf-8')))
+
+    @staticmethod
+    def __write(path, name, write):
+        """
+        Атомарная запись файла: запись во временный файл в том же каталоге и замена (os.replace)
+        path: каталог
+        name: имя файла
+        write: функция write(f), записывающая данные в открытый двоичный файл f
+        return: None
+        """
+        fd, tmp = tempfile.mkstemp(dir=path, prefix='.' + name, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+            os.replace(tmp, os.path.join(path, name))
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+    @staticmethod
+    def __saved_format(path):
+        """
+        Версия формата таблиц, сохранённых в каталоге
+        path: каталог
+        return: версия формата или None, если таблиц в каталоге нет
+        """
+        try:
+            with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+                return json.load(f).get('format')
+        except FileNotFoundError:
+            return None
+
+    def load(self, path):
+        """
+        Открытие таблиц из каталога в режиме отображения в память (только чтение)
+        path: каталог
+        return: None
+        """
+        with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('format') != FORMAT_VERSION:
+            raise ValueError(f"Неподдерживаемая версия формата таблиц SBTL в каталоге {path}")
+        self.nx, self.ny = meta['nx'], meta['ny']
+        self.meta = meta['tables']
+        self.tables = {name: np.load(os.path.join(path, name + '.npy'), mmap_mode='r') for name in self.meta}
+        for name in self.tables:
+            self.__index(name)
+
+    def __index(self, name):
+        """
+        Подготовка таблицы к интерполяции: массив без подкласса numpy.memmap, для двумерной таблицы - строки узлов
+        (значения ячейки выбираются по номерам четырёх угловых узлов), для одномерной - коэффициенты
+        кубических полиномов ячеек c0 + c1 * t + c2 * t**2 + c3 * t**3 (массив и списки чисел float для расчёта
+        одной точки без numpy)
+        name: имя таблицы
+        return: None
+        """
+        values = self.__arrays[name] = np.asarray(self.tables[name])
+        meta = self.meta[name]
+        nx = values.shape[0]
+        # x0, число ячеек на единицу ln(p), наибольший номер ячейки по x
+        self.__grids[name] = meta['x0'], (nx - 1) / (meta['x1'] - meta['x0']), nx - 2
+        if values.ndim == 5:
+            _, ny, _, _, nf = values.shape
+            self.__rows[name] = values.reshape(nx * ny, 4 * nf)
+            # ... сторона сгущения узлов по y, число ячеек по y, количество свойств
+            self.__grids[name] += meta['side'], ny - 1, nf
+        else:
+            f0, f1, d0, d1 = values[:-1, 0], values[1:, 0], values[:-1, 1], values[1:, 1]
+            cells = np.concatenate([f0, d0, 3 * (f1 - f0) - 2 * d0 - d1, 2 * (f0 - f1) + d0 + d1], axis=1)
+            self.__cells[name] = np.ascontiguousarray(cells.T)
+            self.__lists[name] = cells.tolist()
+
+    # ---------- интерполяция ----------
+
+    def __interp1(self, name, x):
+        """
+        Интерполяция одномерной таблицы кубическим сплайном
+        name: имя таблицы
+        x: ln(p) (одномерный массив numpy)
+        return: массив (len(x), количество свойств)
+        """
+        cells, meta = self.__cells[name], self.meta[name]
+        n = cells.shape[1] + 1
+        i, t = _cell((x - meta['x0']) / (meta['x1'] - meta['x0']) * (n - 1), n)
+        return self.__horner(cells, i, t)
+
+    @staticmethod
+    def __horner(cells, i, t):
+        """
+        Расчёт кубических полиномов ячеек одномерной таблицы
+        cells: коэффициенты ячеек (см. __index)
+        i: номера ячеек; t: положение точек в ячейках (одномерные массивы numpy)
+        return: массив (len(t), количество свойств)
+        """
+        c = np.take(cells, i, axis=1).reshape(4, -1, t.size)
+        return (((c[3] * t + c[2]) * t + c[1]) * t + c[0]).T
+
+    def __interp2(self, name, x, y):
+        """
+        Интерполяция двумерной таблицы бикубическим сплайном
+        name: имя таблицы
+        x: ln(p); y: относительная температура (энтальпия) (одномерные массивы numpy)
+        return: массив (len(x), количество свойств)
+        """
+        rows, meta = self.__rows[name], self.meta[name]
+        nx, ny, _, _, nf = self.__arrays[name].shape
+        i, tx = _cell((x - meta['x0']) / (meta['x1'] - meta['x0']) * (nx - 1), nx)
+        j, ty = _cell(_to_grid(y, meta['side']) * (ny - 1), ny)
+        # Номера строк четырёх угловых узлов ячейки; строка узла - [f, f_y, f_x, f_xy] x свойства
+        nodes = (i * ny + j)[:, None] + np.array([0, 1, ny, ny + 1])
+        result = np.empty((x.size, nf))
+        for k in range(0, x.size, self.chunk):
+            sl = slice(k, k + self.chunk)
+            cells = np.take(rows, nodes[sl], axis=0).reshape(-1, 16, nf)
+            w = _hermite(tx[sl]).T[:, _IX] * _hermite(ty[sl]).T[:, _IY]
+            result[sl] = np.matmul(w[:, None, :], cells)[:, 0]
+        return result
+
+    def __point1(self, name, x):
+        """
+        Интерполяция одномерной таблицы кубическим сплайном в одной точке
+        name: имя таблицы
+        x: ln(p) (число float)
+        return: список значений свойств
+        """
+        x0, scale, i_max = self.__grids[name]
+        f = (x - x0) * scale
+        i = min(max(floor(f), 0), i_max)
+        t = f - i
+        c = self.__lists[name][i]
+        m = len(c) // 4
+        return [((c3 * t + c2) * t + c1) * t + c0
+                for c0, c1, c2, c3 in zip(c[:m], c[m:2 * m], c[2 * m:3 * m], c[3 * m:])]
+
+    def __point2(self, name, x, y):
+        """
+        Интерполяция двумерной таблицы бикубическим сплайном в одной точке
+        name: имя таблицы
+        x: ln(p); y: относительная температура (энтальпия) (числа float)
+        return: список значений свойств
+        """
+        x0, scale, i_max, side, ny1, nf = self.__grids[name]
+        f = (x - x0) * scale
+        i = min(max(floor(f), 0), i_max)
+        g = _to_grid_point(y, side) * ny1
+        j = min(max(floor(g), 0), ny1 - 1)
+        # Весовые коэффициенты 16 значений ячейки (узел по x, узел по y, производная по x, производная по y)
+        x0, x1, xd0, xd1 = _hermite_point(f - i)
+        y0, y1, yd0, yd1 = _hermite_point(g - j)
+        w = [x0 * y0, x0 * yd0, xd0 * y0, xd0 * yd0, x0 * y1, x0 * yd1, xd0 * y1, xd0 * yd1,
+             x1 * y0, x1 * yd0, xd1 * y0, xd1 * yd0, x1 * y1, x1 * yd1, xd1 * y1, xd1 * yd1]
+        return np.dot(w, self.__arrays[name][i:i + 2, j:j + 2].reshape(16, nf)).tolist()
+
+    @staticmethod
+    def __unpack(values, fields):
+        """
+        Преобразование результата интерполяции в словарь свойств (ln(v) заменяется на v)
+        values: массив (количество точек, количество свойств)
+        return: словарь свойств (непрерывные массивы numpy)
+        """
+        values = np.ascontiguousarray(values.T)
+        return {f: np.exp(values[k]) if f == 'v' else values[k] for k, f in enumerate(fields)}
+
+    @staticmethod
+    def __unpack_point(values, fields):
+        """
+        Преобразование результата интерполяции в одной точке в словарь свойств (ln(v) заменяется на v)
+        values: список значений свойств
+        """
+        return {f: exp(value) if f == 'v' else value for f, value in zip(fields, values)}
+
+    # ---------- расчёт свойств ----------
+
+    def props_Tp(self, T, p):
+        """
+        Расчёт теплофизических свойств воды и водяного пара по температуре и давлению.
+        T: температура, К
+        p: давление, Па
+        return: словарь свойств
+        """
+        if is_number(T, p) or not (np.ndim(T) or np.ndim(p)):
+            return self.__props_Tp_point(float(T), float(p))
+        T, p, shape = self.__flat(T, p)
+        props = self.__empty(T.size)
+        inside = (self.p_min <= p) & (p <= self.p_max)
+        x = np.log(np.where(inside, p, self.p_max))
+        seg_b = p > self.p_sc_marg
+        edges = self.__edges('T', x, seg_b)
+        nums = self.__classify(inside, edges, T)
+        self.__check(nums >= 0, "T={} К, p={} Па", T, p)
+        self.__fill(props, nums, seg_b, x, T, edges, 'Tp', FIELDS_TP)
+        props['T'], props['p'] = T, p
+        return {key: value.reshape(shape) for key, value in props.items()}
+
+    def props_tp(self, t, p):
+        """
+        Расчёт теплофизических свойств воды и водяного пара по температуре и давлению.
+        t: температура, C
+        p: давление, Па
+        return: словарь свойств
+        """
+        if not is_number(t) and np.ndim(t):
+            t = np.asarray(t, dtype=float)
+        return self.props_Tp(t + 273.15, p)
+
+    def props_ph(self, p, h):
+        """
+        Расчёт теплофизических свойств воды и водяного пара по давлению и энтальпии.
+        p: давление, Па
+        h: энтальпия, Дж/кг
+        return: словарь свойств
+        """
+        if is_number(p, h) or not (np.ndim(p) or np.ndim(h)):
+            return self.__props_ph_point(float(p), float(h))
+        p, h, shape = self.__flat(p, h)
+        props = self.__empty(p.size)
+        inside = (self.p_min <= p) & (p <= self.p_max)
+        x = np.log(np.where(inside, p, self.p_max))
+        seg_b = p > self.p_sc_marg
+        edges = self.__edges('h', x, seg_b)
+        nums = self.__classify(inside, edges, h)
+        nums[inside & (nums < 0) & ~seg_b & (edges[:, 1] < h) & (h < edges[:, 2])] = 2
+        self.__check(nums >= 0, "p={} Па, h={} Дж/кг", p, h)
+        self.__fill(props, nums, seg_b, x, h, edges, 'ph', FIELDS_PH)
+        idx = np.flatnonzero(nums == 2)
+        if idx.size:
+            T, props_w, props_s = self.__sat(self.__interp1('sat', x[idx]))
+            self.__mix(props, idx, T, props_w, props_s, (h[idx] - props_w['h']) / (props_s['h'] - props_w['h']))
+        props['p'], props['h'] = p, h
+        return {key: value.reshape(shape) for key, value in props.items()}
+
+    def props_px(self, p, x):
+        """
+        Расчёт теплофизических свойств влажного водяного пара по давлению и степени сухости.
+        p: давление, Па
+        x: степень сухости x = [0; 1]
+        return: словарь свойств
+        """
+        if is_number(p, x) or not (np.ndim(p) or np.ndim(x)):
+            p, x = float(p), float(x)
+            if not self.region4.px_in(p, x):
+                self.__check(np.array([False]), "p={} Па, x={}", [p], [x])
+            T, props_w, props_s = self.__sat_point(self.__point1('sat', log(p)))
+            props = {key: props_w[key] * (1 - x) + props_s[key] * x for key in FIELDS_SAT}
+            props.update(T=T, p=p, x=x)
+            return props
+        p, x, shape = self.__flat(p, x)
+        self.__check(self.region4.p_in(p) & self.region4.x_in(x), "p={} Па, x={}", p, x)
+        props = self.__empty(p.size)
+        T, props_w, props_s = self.__sat(self.__interp1('sat', np.log(p)))
+        self.__mix(props, slice(None), T, props_w, props_s, x)
+        props['p'] = p
+        return {key: value.reshape(shape) for key, value in props.items()}
+
+    def props_p(self, p):
+        """
+        Расчёт теплофизических свойств кипящей воды и сухого насыщенного пара при давлении p
+        p: давление, Па
+        return: кортеж двух словарей: 0 - кипящая вода, 1 - сухой насыщенный пар
+        """
+        return self.props_px(p, 0.), self.props_px(p, 1.)
+
+    def __edges(self, X, x, seg_b):
+        """
+        Граничные значения температуры или энтальпии областей 1 и 2 (по одномерным таблицам)
+        X: 'T' или 'h'
+        x: ln(p) (одномерный массив numpy)
+        seg_b: признак участка b (p > p_sc_marg)
+        return: массив (len(x), 4) - нижняя и верхняя границы области 1, нижняя и верхняя границы области 2
+        """
+        # Таблицы участков a и b имеют одинаковое количество ячеек: ячейки участка b следуют за ячейками участка a
+        cells = np.concatenate([self.__cells[X + 'a'], self.__cells[X + 'b']], axis=1)
+        n = self.__cells[X + 'a'].shape[1] + 1
+        f = [(x - meta['x0']) / (meta['x1'] - meta['x0']) * (n - 1) for meta in (self.meta[X + 'a'], self.meta[X + 'b'])]
+        i, t = _cell(np.where(seg_b, f[1], f[0]), n)
+        return self.__horner(cells, i + seg_b * (n - 1), t)
+
+    @staticmethod
+    def __classify(inside, edges, value):
+        """
+        Определение области по граничным значениям температуры (энтальпии)
+        inside: признак давления в допустимом диапазоне
+        edges: граничные значения (см. __edges)
+        value: температура (энтальпия)
+        return: номера областей: 0 - область 1, 1 - область 2, -1 - вне областей
+        """
+        nums = np.full(value.size, -1)
+        nums[inside & (edges[:, 0] <= value) & (value <= edges[:, 1])] = 0
+        nums[inside & (nums < 0) & (edges[:, 2] <= value) & (value <= edges[:, 3])] = 1
+        return nums
+
+    def __fill(self, props, nums, seg_b, x, value, edges, kind, fields):
+        """
+        Интерполяция двумерных таблиц областей 1 и 2 и запись результата в словарь свойств
+        (в точках вне областей 1 и 2 - NaN)
+        props: словарь свойств (массивы numpy)
+        nums: номера областей (см. __classify)
+        seg_b: признак участка b
+        x: ln(p); value: температура (энтальпия)
+        edges: граничные значения (см. __edges)
+        kind: 'Tp' или 'ph'
+        fields: имена свойств в таблицах
+        return: None
+        """
+        values = np.full((x.size, len(fields)), np.nan)
+        for num in (0, 1):
+            for seg in ('a', 'b'):
+                idx = np.flatnonzero((nums == num) & (seg_b == (seg == 'b')))
+                if not idx.size:
+                    continue
+                lower, upper = edges[idx, 2 * num], edges[idx, 2 * num + 1]
+                y = (value[idx] - lower) / np.where(upper > lower, upper - lower, 1.)
+                values[idx] = self.__interp2(f'{kind}{num + 1}{seg}', x[idx], y)
+                props['x'][idx] = X_REGION[num]
+        props.update(self.__unpack(values, fields))
+
+    def __props_Tp_point(self, T, p):
+        """
+        Расчёт свойств по температуре и давлению в одной точке
+        """
+        if not (self.p_min <= p <= self.p_max):
+            self.__check(np.array([False]), "T={} К, p={} Па", [T], [p])
+        x = log(p)
+        seg = 'b' if p > self.p_sc_marg else 'a'
+        edges = self.__point1('T' + seg, x)
+        for num in (0, 1):
+            T_lower, T_upper = edges[2 * num], edges[2 * num + 1]
+            if T_lower <= T <= T_upper:
+                break
+        else:
+            self.__check(np.array([False]), "T={} К, p={} Па", [T], [p])
+        y = (T - T_lower) / (T_upper - T_lower) if T_upper > T_lower else 0.
+        props = self.__unpack_point(self.__point2(f'Tp{num + 1}{seg}', x, y), FIELDS_TP)
+        props.update(T=T, p=p, x=float(X_REGION[num]))
+        return props
+
+    def __props_ph_point(self, p, h):
+        """
+        Расчёт свойств по давлению и энтальпии в одной точке
+        """
+        if not (self.p_min <= p <= self.p_max):
+            self.__check(np.array([False]), "p={} Па, h={} Дж/кг", [p], [h])
+        x = log(p)
+        seg = 'b' if p > self.p_sc_marg else 'a'
+        h1_lower, h1_upper, h2_lower, h2_upper = self.__point1('h' + seg, x)
+        if h1_lower <= h <= h1_upper:
+            num, h_lower, h_upper = 0, h1_lower, h1_upper
+        elif h2_lower <= h <= h2_upper:
+            num, h_lower, h_upper = 1, h2_lower, h2_upper
+        elif seg == 'a' and h1_upper < h < h2_lower:
+            T, props_w, props_s = self.__sat_point(self.__point1('sat', x))
+            q = (h - props_w['h']) / (props_s['h'] - props_w['h'])
+            props = {key: props_w[key] * (1 - q) + props_s[key] * q for key in FIELDS_SAT}
+            props.update(T=T, p=p, h=h, x=q)
+            return props
+        else:
+            self.__check(np.array([False]), "p={} Па, h={} Дж/кг", [p], [h])
+        y = (h - h_lower) / (h_upper - h_lower) if h_upper > h_lower else 0.
+        props = self.__unpack_point(self.__point2(f'ph{num + 1}{seg}', x, y), FIELDS_PH)
+        props.update(p=p, h=h, x=float(X_REGION[num]))
+        return props
+
+    def __sat_point(self, values):
+        """
+        Разбор результата интерполяции таблицы линии насыщения в одной точке
+        values: список значений свойств
+        return: (T, props_w, props_s)
+        """
+        n = len(FIELDS_SAT)
+        return (values[0], self.__unpack_point(values[1:1 + n], FIELDS_SAT),
+                self.__unpack_point(values[1 + n:], FIELDS_SAT))
+
+    def __sat(self, values):
+        """
+        Разбор результата интерполяции таблицы линии насыщения
+        values: массив (количество точек, количество свойств)
+        return: (T, props_w, props_s)
+        """
+        n = len(FIELDS_SAT)
+        return (values[..., 0], self.__unpack(values[..., 1:1 + n], FIELDS_SAT),
+                self.__unpack(values[..., 1 + n:], FIELDS_SAT))
+
+    @staticmethod
+    def __mix(props, idx, T, props_w, props_s, x):
+        """
+        Расчёт свойств влажного пара по правилу рычага (как в Region4)
+        """
+        for key in FIELDS_SAT:
+            props[key][idx] = props_w[key] * (1 - x) + props_s[key] * x
+        props['T'][idx] = T
+        props['x'][idx] = x
+
+    @staticmethod
+    def __flat(a, b):
+        """
+        Приведение пары входных параметров к одномерным массивам одинаковой длины
+        return: (a, b, форма результата)
+        """
+        a, b = (np.array(v, dtype=float) for v in np.broadcast_arrays(a, b))
+        return a.ravel(), b.ravel(), a.shape
+
+    @staticmethod
+    def __empty(size):
+        """
+        Словарь свойств, заполненный NaN
+        """
+        return {key: np.full(size, np.nan) for key in ('T', 'p', 'h', 's', 'cp', 'cv', 'v', 'u', 'w', 'x')}
+
+    @staticmethod
+    def __check(mask, descr, *args):
+        """
+        Генерация исключения, если хотя бы одна точка лежит вне допустимой области
+        """
+        if not np.all(mask):
+            i = np.flatnonzero(~mask)[0]
+            raise ValueError("Значения параметров " + descr.format(*(arg[i] for arg in args)) +
+                             " лежат вне допустимой области.")
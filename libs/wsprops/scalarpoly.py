@@ -0,0 +1,246 @@
+"""
+В модуле размещён класс ScalarPoly - вычисление полиномов вида sum(n * x^I * y^J) (и сумм с весами, например
+для производных) для одной точки.
+Для одной точки накладные расходы numpy (создание массивов коэффициентов при каждом вызове, промежуточные
+скаляры numpy.float64) превышают время самих вычислений, поэтому коэффициенты однократно (при создании объекта,
+т.е. при импорте модуля области) переводятся в кортежи чисел float и заранее подготовленные массивы,
+а результаты возвращаются обычными числами float.
+Отличие версии 1.1 от 1.0: добавлен расчёт полинома для массивов (метод values) и выбор способа расчёта
+по типу аргументов (вызов объекта).
+Отличие версии 1.2 от 1.1: значение полинома для одной точки вычисляется функцией, составленной при создании
+объекта (без циклов): степени аргументов - цепочками умножений, слагаемые сгруппированы по степени x.
+Время расчёта одной точки (timeit, Python 3.11, numpy 2.4; в скобках - ускорение относительно версии модулей
+областей без ScalarPoly): Region2.T_ph - 2.7 мкс (6x), Region2.T_ps - 3.2 мкс (5.6x), Region1.props_Tp - 9 мкс (8x),
+Region2.props_Tp - 11 мкс (9x), HSDiag.props_Tp - 20 мкс (6x).
+Суммы с весами (метод sums) по-прежнему вычисляются умножением на матрицу коэффициентов: для шести сумм
+энергии Гиббса (слагаемых 34-43) это быстрее расчёта без numpy (около 4 мкс против 6.5 мкс).
+Отличие версии 1.3 от 1.2: подмножество сумм (параметр needed метода sums, не более MAX_COMPILED_SUMS сумм)
+вычисляется функцией без numpy, составленной при первом обращении: для одной суммы энергии Гиббса
+(например, g_pi для удельного объёма) около 1.6 мкс (область 1) и 3.1 мкс (область 2) вместо 3.2 и 5.6 мкс.
+-------------------------------------------------
+'Инженерные расчёты на Python'
+https://zen.yandex.ru/id/5f33dcd5554adc5b33aaee83
+https://medsv.github.io/dzen/
+"""
+
+__author__ = "Sergey Medvedev"
+__copyright__ = "Sergey Medvedev, 2021"
+__license__ = "GPL"
+__version__ = "1.3"
+__maintainer__ = "Sergey Medvedev"
+__email__ = "engpython@yandex.ru"
+__status__ = "Production"
+
+from fractions import Fraction
+from itertools import groupby
+from math import lcm
+import numpy as np
+
+
+class ScalarPoly:
+    """
+    Полином sum(n * x^I * y^J) для скалярных аргументов (обычные числа float).
+    Показатели степени могут быть целыми или дробными.
+    Значение полинома (метод value) вычисляется над обычными числами float функцией без циклов, текст которой
+    составляется при создании объекта: степени x и y вычисляются цепочками умножений (для дробных показателей -
+    от x^(1/d), где d - общий знаменатель показателей), слагаемые сгруппированы по показателю степени x.
+    Несколько сумм с весами (метод sums, например энергия Гиббса и её производные) вычисляются одним
+    умножением вектора слагаемых на заранее подготовленную матрицу коэффициентов, результат сразу
+    переводится в числа float (для нескольких сумм это быстрее поэлементного расчёта).
+    Для массивов (метод values) полином вычисляется умножением матрицы слагаемых (точки x слагаемые)
+    на вектор коэффициентов.
+    """
+    MAX_COMPILED_SUMS = 3  # наибольшее количество сумм, вычисляемых функцией без numpy (иначе быстрее numpy)
+
+    def __init__(self, I, J, n, weights=None):
+        """
+        I, J: показатели степени x и y (последовательности одной длины)
+        n: коэффициенты
+        weights: последовательность весов (каждый - последовательность длины n); если задана, метод sums
+                 возвращает суммы sum(w * n * x^I * y^J) для каждого набора весов w
+        """
+        # Кортеж групп (i, ((j, n), ...)) слагаемых с одинаковым показателем степени x
+        self.groups = self.__groups(I, J, n)
+        self.__value = self.__compile([self.groups])
+        self.I = np.array(I, dtype=float)
+        self.J = np.array(J, dtype=float)
+        self.n = np.array(n, dtype=float)
+        # Нечётные показатели степени (None, если есть дробные): для отрицательных аргументов степени
+        # вычисляются от модуля с последующей сменой знака (возведение отрицательного числа в степень,
+        # заданную числом float, значительно медленнее)
+        self.__odd_I = self.__odd(self.I)
+        self.__odd_J = self.__odd(self.J)
+        if weights is not None:
+            self.coefs = np.array(n, dtype=float)[:, None] * np.array(weights, dtype=float).T
+        self.__sums_funcs = {}  # функции расчёта подмножеств сумм (номера сумм -> функция)
+
+    def value(self, x, y):
+        """
+        Значение полинома sum(n * x^I * y^J)
+        x, y: аргументы (числа float)
+        return: значение полинома (число float)
+        """
+        return self.__value(x, y)
+
+    def values(self, x, y):
+        """
+        Значения полинома sum(n * x^I * y^J) для массивов аргументов
+        x, y: аргументы (массивы numpy одной формы или числа)
+        return: массив значений полинома
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        return (self.__powers(x, self.I, self.__odd_I) * self.__powers(y, self.J, self.__odd_J)) @ self.n
+
+    def __call__(self, x, y):
+        """
+        Значение полинома: для чисел - метод value, для массивов - метод values
+        x, y: аргументы (числа float или массивы numpy)
+        return: число float или массив значений полинома
+        """
+        if is_number(x, y):
+            return self.__value(x, y)
+        return self.values(x, y)
+
+    def sums(self, x, y, needed=None):
+        """
+        Суммы слагаемых с весами weights: sum(w * n * x^I * y^J)
+        Все суммы вычисляются умножением вектора слагаемых на матрицу коэффициентов; подмножество сумм
+        (needed) - функцией без циклов, составляемой при первом обращении (только слагаемые с ненулевыми
+        весами, общие степени аргументов вычисляются один раз).
+        x, y: аргументы (числа float)
+        needed: кортеж номеров требуемых сумм; None - все суммы
+        return: список сумм (числа float): все суммы или суммы needed (в порядке номеров needed)
+        """
+        if needed is None or len(needed) > self.MAX_COMPILED_SUMS:
+            sums = (np.power(x, self.I) * np.power(y, self.J)).dot(self.coefs).tolist()
+            return sums if needed is None else [sums[k] for k in needed]
+        func = self.__sums_funcs.get(needed)
+        if func is None:
+            func = self.__sums_funcs[needed] = self.__compile(
+                [self.__groups(self.I, self.J, self.coefs[:, k]) for k in needed], as_list=True)
+        return func(x, y)
+
+    @classmethod
+    def __groups(cls, I, J, n):
+        """
+        Группировка слагаемых по показателю степени x (слагаемые с нулевыми коэффициентами отбрасываются)
+        I, J: показатели степени x и y
+        n: коэффициенты
+        return: кортеж групп (i, ((j, n), ...))
+        """
+        terms = sorted((cls.__exp(i), cls.__exp(j), float(c)) for i, j, c in zip(I, J, n) if c != 0)
+        return tuple((i, tuple((j, c) for _, j, c in group)) for i, group in groupby(terms, key=lambda term: term[0]))
+
+    @classmethod
+    def __compile(cls, groups_list, as_list=False):
+        """
+        Составление функции f(x, y) для расчёта значений полиномов без циклов (степени аргументов,
+        общие для всех полиномов, вычисляются один раз)
+        groups_list: список полиномов, каждый - группы слагаемых (i, ((j, n), ...)) с одинаковым
+                     показателем степени x
+        as_list: False - функция возвращает значение первого полинома, True - список значений всех полиномов
+        return: функция двух аргументов (числа float)
+        """
+        lines, x_names = cls.__power_chain('x', {i for groups in groups_list for i, _ in groups})
+        y_lines, y_names = cls.__power_chain('y', {j for groups in groups_list for _, row in groups for j, _ in row})
+        lines += y_lines
+        results = []
+        for groups in groups_list:
+            parts = []
+            for i, row in groups:
+                inner = ' + '.join(repr(c) if y_names[j] is None else f'{c!r} * {y_names[j]}' for j, c in row)
+                parts.append(f'({inner})' if x_names[i] is None else f'({inner}) * {x_names[i]}')
+            results.append(' + '.join(parts) or '0.')
+        source = 'def value(x, y):\n' + ''.join(f'    {line}\n' for line in lines)
+        source += f"    return [{', '.join(results)}]\n" if as_list else f"    return {results[0]}\n"
+        namespace = {}
+        exec(source, namespace)
+        return namespace['value']
+
+    @staticmethod
+    def __power_chain(v, exps):
+        """
+        Строки вычисления степеней аргумента цепочкой умножений (степени с целыми показателями k * (1/d) -
+        от основания v^(1/d), отрицательные - от 1 / v^(1/d))
+        v: имя аргумента ('x' или 'y')
+        exps: множество показателей степени
+        return: (список строк присваивания, словарь показатель -> имя переменной; для показателя 0 - None)
+        """
+        d = lcm(*(Fraction(e).limit_denominator(1000).denominator for e in exps))
+        base = v
+        lines = []
+        if d != 1:
+            base = f'{v}_u'
+            lines.append(f'{base} = {v} ** {1 / d!r}')
+        names = {e: None for e in exps if e == 0}
+        for sign, prefix in ((1, 'p'), (-1, 'm')):
+            ks = sorted(round(sign * e * d) for e in exps if sign * e > 0)
+            if not ks:
+                continue
+            first = base
+            if sign < 0:
+                first = f'{v}_inv'
+                lines.append(f'{first} = 1 / {base}')
+            chain = {1: first}  # показатель (в единицах 1/d) -> имя переменной
+            prev = 1
+            for k in ks:
+                if k not in chain:
+                    step = k - prev
+                    factor = chain.get(step, f'{first} ** {step}')
+                    chain[k] = f'{v}{prefix}{k}'
+                    lines.append(f'{chain[k]} = {chain[prev]} * {factor}')
+                prev = k
+            for e in exps:
+                if sign * e > 0:
+                    names[e] = chain[round(sign * e * d)]
+        return lines, names
+
+    @staticmethod
+    def __powers(x, exps, odd):
+        """
+        Степени аргумента (матрица точки x слагаемые)
+        x: аргумент (массив numpy)
+        exps: показатели степени (массив numpy)
+        odd: булев массив нечётных показателей степени или None (есть дробные показатели)
+        return: массив x^exps формы x.shape + exps.shape
+        """
+        negative = x < 0
+        if odd is None or not negative.any():
+            return x[..., None] ** exps
+        powers = np.abs(x)[..., None] ** exps
+        return np.where(negative[..., None] & odd, -powers, powers)
+
+    @staticmethod
+    def __odd(exps):
+        """
+        Нечётные показатели степени
+        exps: показатели степени (массив numpy)
+        return: булев массив (True - нечётный показатель) или None, если есть дробные показатели
+        """
+        if not np.all(exps == np.round(exps)):
+            return None
+        return exps % 2 == 1
+
+    @staticmethod
+    def __exp(e):
+        """
+        Показатель степени: целые значения - int (возведение в целую степень точнее и быстрее), иначе - float
+        e: показатель степени
+        return: int или float
+        """
+        e = float(e)
+        return int(e) if e.is_integer() else e
+
+
+def is_number(*values):
+    """
+    Проверка того, что все значения - числа (float, int, numpy.float64), а не массивы.
+    Быстрая проверка для выбора расчёта одной точки (np.ndim для чисел заметно медленнее)
+    values: проверяемые значения
+    return: True, если все значения - числа
+    """
+    for value in values:
+        if not isinstance(value, (float, int)):
+            return False
+    return True
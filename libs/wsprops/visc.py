@@ -7,13 +7,13 @@ https://medsv.github.io/
 """
 
 import numpy as np
-from math import exp
 from .hsdiag import HSDiag
+from .scalarpoly import is_number
 
 __author__ = "Сергей Медведев"
 __copyright__ = "Сергей Медведев, 2020"
 __license__ = "GPL"
-__version__ = "1.0"
+__version__ = "1.2"
 __maintainer__ = "Сергей Медведев"
 __email__ = "engpython@yandex.ru"
 __status__ = "Production"
@@ -25,19 +25,41 @@ class Visc():
     Методика расчёта взята из документа
     'Release on the IAPWS Formulation 2008 for the Viscosity of Ordinary Water Substance'
     http://www.iapws.org/relguide/visc.pdf
+    Все методы принимают как числа, так и массивы numpy.
+    Отличие от версии 1.0: μ0 и μ1 рассчитываются как полиномиальные (матричные) произведения над массивами
+    (T, ρ); добавлены методы calc_visc и visc_props (расчёт вязкости по уже рассчитанным свойствам HSDiag).
+    Отличие от версии 1.1: объект HSDiag создаётся не при импорте модуля, а при первом обращении к свойству hs
+    (или передаётся методом set_hs).
     """
-    hs = HSDiag()
+    _hs = None  # объект HSDiag, общий для всех экземпляров класса
     H = np.array([1.67752, 2.20462, 0.6366564, -0.241605])
-    Hij = [np.array([5.20094e-1, 2.22531e-1, -2.81378e-1, 1.61913e-1, -3.25372e-2, 0., 0.]),
-            np.array([8.50895e-2, 9.99115e-1, -9.06851e-1, 2.57399e-1, 0., 0., 0.]),
-            np.array([-1.08374, 1.88797, -7.72479e-1, 0., 0., 0., 0.]),
-            np.array([-2.89555e-1, 1.26613, -4.89837e-1, 0., 6.98452e-2, 0., -4.35673e-3]),
-            np.array([0., 0., -2.57040e-1, 0., 0., 8.72102e-3, 0.]),
-            np.array([0., 1.20573e-1, 0., 0., 0., 0., -5.93264e-4])]
-
+    Hij = np.array([[5.20094e-1, 2.22531e-1, -2.81378e-1, 1.61913e-1, -3.25372e-2, 0., 0.],
+                    [8.50895e-2, 9.99115e-1, -9.06851e-1, 2.57399e-1, 0., 0., 0.],
+                    [-1.08374, 1.88797, -7.72479e-1, 0., 0., 0., 0.],
+                    [-2.89555e-1, 1.26613, -4.89837e-1, 0., 6.98452e-2, 0., -4.35673e-3],
+                    [0., 0., -2.57040e-1, 0., 0., 8.72102e-3, 0.],
+                    [0., 1.20573e-1, 0., 0., 0., 0., -5.93264e-4]])
     
     def __init__(self):
         self.props = None  # теплофизические свойства, определяемые классом HSDiag
+
+    @property
+    def hs(self):
+        """
+        Объект HSDiag для расчёта свойств по температуре и давлению (создаётся при первом обращении)
+        """
+        if Visc._hs is None:
+            Visc._hs = HSDiag()
+        return Visc._hs
+
+    @classmethod
+    def set_hs(cls, hs):
+        """
+        Использование уже созданного объекта HSDiag
+        hs: объект HSDiag
+        return: None
+        """
+        cls._hs = hs
     
     def dvisc_Tp(self, T, p):
         """
@@ -81,7 +103,28 @@ class Visc():
         Получение теплофизических свойств воды или водяного пара для крайнего расчёта
         return: словарь теплофизических свойств
         """
-        return self.hs.curReg.props.copy()
+        return self.props.copy()
+
+    @classmethod
+    def visc_props(cls, props):
+        """
+        Определение динамической и кинематической вязкости по свойствам, рассчитанным HSDiag
+        (в том числе для массивов точек) без повторного расчёта состояния
+        props: словарь свойств (используются T и v)
+        return: кортеж (динамическая вязкость, Па*с; кинематическая вязкость, м2/с)
+        """
+        return cls.calc_visc(props['T'], 1 / props['v'])
+
+    @classmethod
+    def calc_visc(cls, T, dens):
+        """
+        Определение динамической и кинематической вязкости воды и водяного пара
+        T: температура, К
+        dens: плотность, кг/м3
+        return: кортеж (динамическая вязкость, Па*с; кинематическая вязкость, м2/с)
+        """
+        mu = cls.calc_dvisc(T, dens)
+        return mu, mu / dens
 
     @classmethod
     def calc_dvisc(cls, T, dens):
@@ -95,22 +138,18 @@ class Visc():
         В окрестности критической точки 645.91 K < T < 650.77 K, 245.8 kg/m3 < ρ < 405.3 kg/m3 функция не работает.
         (см. стр. 6, раздел 2.7 Critical enhancement).
         """
-        if not (273.15 <= T <= 1173.15):
+        if not is_number(T, dens) and (np.ndim(T) or np.ndim(dens)):
+            T, dens = (np.array(a, dtype=float) for a in np.broadcast_arrays(T, dens))
+        if not np.all((273.15 <= T) & (T <= 1173.15)):
             raise ValueError('Температура должна находится в диапазоне [273,15; 1173,15]')
-        if 645.91 < T < 650.77 and 245.8 < dens < 405.3:
+        if np.any((645.91 < T) & (T < 650.77) & (245.8 < dens) & (dens < 405.3)):
             raise ValueError('Окрестность критической точки находится вне допустимого диапазона входных параметров.')
         tau = T / 647.096
         delta = dens / 322.0
-        mu0 = 0
-        for i in range(cls.H.shape[0]):
-            mu0 += cls.H[i]/tau**i
-        mu0 = 100 * tau ** 0.5/mu0
-        a = 0
-        for i in range(len(cls.Hij)):
-            b = 0
-            for j in range(7):
-                b += cls.Hij[i][j] * (delta - 1) ** j
-            a += (1/tau - 1) ** i * b
-        mu1 = exp(delta * a)
-        mu = mu0 * mu1 * 1e-6
-        return mu
+        # μ0 = 100 * tau^0.5 / sum(H[i] / tau^i)
+        mu0 = 100 * tau ** 0.5 / (np.power.outer(1 / tau, np.arange(cls.H.size)) @ cls.H)
+        # μ1 = exp(delta * sum_i (1/tau - 1)^i * sum_j Hij[i, j] * (delta - 1)^j)
+        a = np.power.outer(1 / tau - 1, np.arange(cls.Hij.shape[0])) @ cls.Hij
+        a = np.sum(a * np.power.outer(delta - 1, np.arange(cls.Hij.shape[1])), axis=-1)
+        mu1 = np.exp(delta * a)
+        return mu0 * mu1 * 1e-6
@@ -1,15 +1,15 @@
 import streamlit as st
 #from libs.calcdryairdens import calc_dryair_dens
-from libs.calcdryairvisc import calc_dryair_visc
 from common.print_result import print_result
 from common.streamlit_components import create_unit_input, get_si_value
+from common.engines import get_cached_props
 
 st.set_page_config(
     page_title="Расчёт вязкости сухого воздуха",
 )
 # Заголовок страницы
 st.title("Расчёт вязкости сухого воздуха")
-st.markdown("Допустимые значения входных параметров: t = [-100; 1000] °С,  p = [0,1; 20] МПа.")
+st.markdown("Допустимые значения входных параметров: t = [-100; 700] °С,  p = [0,1; 20] МПа.")
 
 #t: float = st.number_input("Температура, °С", value=20., step=1., min_value=-100., max_value=1000., key ="t", width = 200)
 #p: float = st.number_input("Абсолютное давление, Па", value=101325.0, step=1., min_value=100000., max_value=20e6, key ="p", width = 200)
@@ -32,13 +32,14 @@ p_v, p_u = create_unit_input(
         unit="Па"
         )
 
+cached = get_cached_props()
 if st.button("Рассчитать"):
     try:
         t: float = get_si_value(t_v, t_u, "temperature")
         p: float = get_si_value(p_v, p_u, "pressure")
-        dvisc,  dens = calc_dryair_visc(t, p)
-        data ={"Температура сухого воздуха, °С": t, "Давление, Па": p, "Плотность, кг/м3": dens, 
-               "Динамическая вязкость, Па*с": dvisc, "Кинематическая вязкость, м2/с": dvisc / dens}
+        state = cached.calc_dryair_state(t, p)
+        data ={"Температура сухого воздуха, °С": t, "Давление, Па": p, "Плотность, кг/м3": state.dens, 
+               "Динамическая вязкость, Па*с": state.dvisc, "Кинематическая вязкость, м2/с": state.kvisc}
         #result = f"Плотность {dens} кг/м<sup>3</sup> \n\n Коэффициент сжимаемости {z}".replace(".", ",")
         #st.markdown(result, unsafe_allow_html=True)
         print_result(data)
@@ -1,8 +1,9 @@
 import streamlit as st
-from libs.wetairprops import calc_d, calc_t_wb, calc_t_dp_d, calc_dens, calc_p_s, calc_I, calc_RH_d, t_min, t_max, p_min, p_max
+from libs.wetairprops import t_min, t_max, p_min, p_max
 from common.footer import show_footer
 from common.print_result import print_result
 from common.streamlit_components import create_unit_input, get_si_value
+from common.engines import get_cached_props
 
 
 st.set_page_config(
@@ -58,6 +59,8 @@ p_v, p_u = create_unit_input(
     )
 
 
+cached = get_cached_props()
+
 
 def calc(t: float, RH_d : float, p: float, RH_d_sel: str):
     if p <= 0:
@@ -68,29 +71,14 @@ def calc(t: float, RH_d : float, p: float, RH_d_sel: str):
         RH = RH_d
         if not (0.<=RH<=1.):
             raise ValueError('Значение относительной влажности RH должно находиться в диапазоне (0%; 100%].')
-        d: float = calc_d(t, RH, p)
+        props = cached.calc_props(t, RH=RH, p=p)
     else:  # d
         if RH_d < 0:
             raise ValueError('Значение влагосодержания d должно быть больше нуля.')
-        RH: float = calc_RH_d(t, RH_d, p)
-        d = RH_d
-
-    p_s: float = calc_p_s(t) 
-    p_st: float = p_s * RH
-    
-    
-
-    d1: float = d / (1 + d / 1000.)  # на кг влажного воздуха
-    I: float = calc_I(t, RH, p)
-    I1: float = I / (1 + d / 1000.)  # на кг влажного воздуха
-    t_wb: float = calc_t_wb(t, RH, p)
-    t_dp: float = calc_t_dp_d(d, p)
-
-
-    dens: float = calc_dens(t, RH, p)
-    p_cond: float = p / RH
-    RH *= 100
-    return {"t": t, "RH": RH, "p": p, "d": d, "d1": d1, "dens": dens, "t_wb": t_wb, "t_dp": t_dp, "I": I, "I1": I1, "p_s": p_s, "p_st": p_st, "p_cond": p_cond}
+        props = cached.calc_props(t, d=RH_d, p=p)
+    result = props._asdict()
+    result["RH"] *= 100
+    return result
 
 
 
@@ -1,8 +1,8 @@
 import streamlit as st
-from libs.calcdryairdens import calc_dryair_dens
 from common.footer import show_footer
 from common.print_result import print_result
 from common.streamlit_components import create_unit_input, get_si_value
+from common.engines import get_cached_props
 
 st.set_page_config(
     page_title="Расчёт плотности сухого воздуха",
@@ -31,12 +31,13 @@ p_v, p_u = create_unit_input(
 
 #t: float = st.number_input("Температура, °С", value=20., step=1., min_value=-100., max_value=1000., key ="t", width = 200)
 #p: float = st.number_input("Абсолютное давление, Па", value=101325.0, step=1., min_value=100000., max_value=20e6, key ="p", width = 200)
+cached = get_cached_props()
 if st.button("Рассчитать"):
     try:
         t = get_si_value(t_v, t_u, "temperature")
         p = get_si_value(p_v, p_u, "pressure")
-        dens, z = calc_dryair_dens(t, p)
-        data ={"Температура сухого воздуха, °С": t, "Абсолютное давление, Па": p, "Коэффициент сжимаемости": z, "Плотность, кг/м3": dens}
+        state = cached.calc_dryair_state(t, p, visc=False)
+        data ={"Температура сухого воздуха, °С": t, "Абсолютное давление, Па": p, "Коэффициент сжимаемости": state.z, "Плотность, кг/м3": state.dens}
         #result = f"Плотность {dens} кг/м<sup>3</sup> \n\n Коэффициент сжимаемости {z}".replace(".", ",")
         #st.markdown(result, unsafe_allow_html=True)
         print_result(data)
@@ -1,11 +1,13 @@
 # boiling_calculator.py
 import streamlit as st
-from libs.wsprops import SaturationCurve as SC, Region4
 #from common.units_manager import UnitManager
 from common.streamlit_components import create_unit_input, get_si_value
 from common.print_result import print_result
+from common.engines import get_shared_engines, get_cached_props
 st.title("Параметры кипящей воды")
-sc = SC()
+engines = get_shared_engines()
+cached = get_cached_props()
+sc = engines.sc
 input_type = st.radio(
     "Выберите способ расчёта:",
     ["По давлению", "По температуре"],
@@ -39,8 +41,7 @@ if st.button("Рассчитать"):
         else:
             t: float = get_si_value(value, unit, "temperature")
             p: float = sc.p_t(t)
-        r4 = Region4()
-        dh: float = r4.dh_p(p)  # удельная скрытая теплота парообразования
+        dh: float = cached.wet_steam_dh_p(p)  # удельная скрытая теплота парообразования
         data = {"Температура кипения воды, °С": t, "Давление кипения воды, Па": p, 
                 "Удельная скрытая теплота парообразования, Дж/кг": dh}
         print_result(data)
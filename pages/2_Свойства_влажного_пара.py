@@ -1,16 +1,18 @@
 # boiling_calculator.py
 import streamlit as st
-from libs.wsprops import Region4
 #from common.units_manager import UnitManager
 from common.streamlit_components import create_unit_input, get_si_value
 from common.print_result import print_result
+from common.engines import get_shared_engines, get_cached_props
 st.title("Расчёт свойств влажного пара")
 input_type = st.radio(
     "Выберите способ расчёта:",
     ["По давлению", "По температуре"],
     horizontal=True
 )
-r4 = Region4()
+engines = get_shared_engines()
+cached = get_cached_props()
+r4 = engines.region4
 if input_type == "По давлению":
     st.markdown(f"Допустимые значения входных параметров: p = [{r4.p_min}; {r4.p_max}] Па".replace(".", ","))
     value, unit = create_unit_input(
@@ -51,8 +53,8 @@ if st.button("Рассчитать"):
         else:
             t: float = get_si_value(value, unit, "temperature")
             p = r4.sc.p_t(t)
-        props: dict[str, None | float] = r4.props_px(p, x)
-        dh: float = r4.dh_p(p)  # удельная скрытая теплота парообразования
+        props = cached.wet_steam_props_px(p, x)
+        dh: float = cached.wet_steam_dh_p(p)  # удельная скрытая теплота парообразования
         if props['v']:
             dens: float = 1. / props['v']
         data = {"Температура пара, °С": t, "Давление пара, Па": p, "Степень сухости, доля": x, 
@@ -1,8 +1,8 @@
 import streamlit as st
 from common.print_result import print_result
-from libs.wsprops.region1 import Region1
-from libs.calcwsdvisc import calc_ws_dvisc
+from libs.wsprops.visc import Visc
 from common.streamlit_components import create_unit_input, get_si_value
+from common.engines import get_shared_engines, get_cached_props
 
 st.set_page_config(
     page_title="Расчёт свойств воды",
@@ -30,7 +30,9 @@ p_v, p_u = create_unit_input(
         unit="Па"
         )
 
-water = Region1()
+engines = get_shared_engines()
+cached = get_cached_props()
+water = engines.region1
 if st.button("Рассчитать"):
     try:
         t: float = get_si_value(t_v, t_u, "temperature")
@@ -44,7 +46,7 @@ if st.button("Рассчитать"):
         else:
         #try:
             ts: None | float = None; ps: None | float = None  # для того, чтобы в результате расчётов выводилось none
-            props = water.props_tp(t, p)
+            props = cached.water_props_tp(t, p)
             # Validate that props['v'] exists and is not zero before division
             v: None | float = props.get('v')
             if v is None or v == 0.:
@@ -54,8 +56,7 @@ if st.button("Рассчитать"):
                 ps = water.sc.p_t(t)
             if 611.212677 <= p <= 22.064e6:
                 ts = water.sc.t_p(p)
-            dvisc: float = calc_ws_dvisc(t, dens)
-            kvisc: float = dvisc / dens
+            dvisc, kvisc = Visc.visc_props(props)
             data = {"Температура воды, °С": t, "Давление воды, Па": p, "Плотность воды, кг/м3": dens, 
                     "Кинематическая вязкость, м2/с": kvisc, "Динамическая вязкость, Па*с": dvisc, "Удельная энтальпия, Дж/кг": props['h'], 
                     "Удельная энтропия, Дж/кг/К": props['s'], "Удельная теплоёмкость при постоянном давлении, Дж/кг/К": props['cp'],
@@ -1,8 +1,8 @@
 import streamlit as st
 from common.print_result import print_result
-from libs.wsprops.region2 import Region2
-from libs.calcwsdvisc import calc_ws_dvisc
+from libs.wsprops.visc import Visc
 from common.streamlit_components import create_unit_input, get_si_value
+from common.engines import get_shared_engines, get_cached_props
 
 st.set_page_config(
     page_title="Расчёт свойств перегретого пара",
@@ -30,7 +30,9 @@ p_v, p_u = create_unit_input(
         unit="Па"
         )
 
-steam = Region2()
+engines = get_shared_engines()
+cached = get_cached_props()
+steam = engines.region2
 if st.button("Рассчитать"):
     t: float = get_si_value(t_v, t_u, "temperature")
     p: float = get_si_value(p_v, p_u, "pressure")
@@ -41,7 +43,7 @@ if st.button("Рассчитать"):
     else:
         try:
             ts: None | float = None; ps: None | float = None  # для того, чтобы в результате расчётов выводилось none
-            props = steam.props_tp(t, p)
+            props = cached.steam_props_tp(t, p)
             # Validate that props['v'] exists and is not zero before division
             v = props.get('v')
             if v is None or v == 0:
@@ -51,8 +53,7 @@ if st.button("Рассчитать"):
                 ps = steam.sc.p_t(t)
             if 611.212677 <= p <= 22.064e6:
                 ts = steam.sc.t_p(p)
-            dvisc: float = calc_ws_dvisc(t, dens)
-            kvisc: float = dvisc / dens            
+            dvisc, kvisc = Visc.visc_props(props)
             data = {"Температура пара, °С": t, "Давление пара, Па": p, "Плотность пара, кг/м3": dens, 
                     "Кинематическая вязкость, м2/с": kvisc, "Динамическая вязкость, Па*с": dvisc, "Удельная энтальпия, Дж/кг": props['h'], 
                     "Удельная энтропия, Дж/кг/К": props['s'], "Удельная теплоёмкость при постоянном давлении, Дж/кг/К": props['cp'],
@@ -1,7 +1,7 @@
 import streamlit as st
-from libs.wsprops.region1 import Region1
 from common.streamlit_components import create_unit_input, get_si_value
 from common.print_result import print_result
+from common.engines import get_shared_engines, get_cached_props
 
 st.set_page_config(
     page_title="Расчёт кавитационного запаса",
@@ -40,7 +40,9 @@ t_v, t_u = create_unit_input(
 #t: float = st.number_input("Температура, °С", value=20., step=1., min_value=0., max_value= 623.15-273.15, key ="t", width = 200)
 H: float = st.number_input("Подпор, м", value=0., step=1., min_value=-1000., max_value=1000., key ="H", width = 200)
 dH: float = st.number_input("Потери давления (напора), м", value=0., step=1., min_value=0., max_value=1000., key ="dH", width = 200)
-water = Region1()
+engines = get_shared_engines()
+cached = get_cached_props()
+water = engines.region1
 if st.button("Рассчитать"):
     t: float = get_si_value(t_v, t_u, "temperature")
     p: float = get_si_value(p_v, p_u, "pressure")
@@ -54,7 +56,7 @@ if st.button("Рассчитать"):
             st.error(mes, icon="⚠️")
         else:
         
-            props: dict[str, float] = water.props_tp(t,p) # type: ignore
+            props = cached.water_props_tp(t, p, fields=('v',))
             ps: float = water.sc.p_t(t)
             NPSH: float = H + (p - ps) * props["v"] / 9.81 - dH
             #data={"Кавитационный запас (NPSH), м": NPSH}
@@ -0,0 +1,9 @@
+"""
+Общие настройки тестов: корень репозитория добавляется в sys.path (пакет libs импортируется так же,
+как из страниц приложения)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
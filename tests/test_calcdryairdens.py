@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from libs.calcdryairdens import calc_dryair_dens, calc_dryair_dens_arr, calc_z, ERR_OK, ERR_T, ERR_P, ERR_Z
+
+
+def test_scalar_matches_array():
+    """Скалярный расчёт совпадает с расчётом для массивов"""
+    t = np.linspace(-100., 1000., 12)
+    p = np.linspace(0.1e6, 20e6, 12)
+    dens, z = calc_dryair_dens_arr(t, p)
+    for k in range(t.size):
+        assert calc_dryair_dens(t[k], p[k]) == pytest.approx((dens[k], z[k]), rel=1e-14)
+    assert calc_dryair_dens(20.) == pytest.approx((1.2044, 0.99961), rel=1e-4)
+
+
+def test_not_converged():
+    """Точки, в которых метод Ньютона не сошёлся, отмечаются NaN и кодом ERR_Z"""
+    T = np.array([173.15, 293.15])
+    z, _, _ = calc_z(T, np.array([20e6, 0.1e6]), maxiter=3)
+    assert np.isnan(z[0]) and not np.isnan(z[1])
+    dens, z, reason = calc_dryair_dens_arr([-100., 20.], [20e6, 0.1e6], maxiter=3, errors='nan')
+    assert reason.tolist() == [ERR_Z, ERR_OK]
+    assert np.isnan(dens[0]) and np.isnan(z[0]) and np.isfinite(dens[1])
+    with pytest.raises(ValueError):
+        calc_dryair_dens_arr(-100., 20e6, maxiter=3)
+
+
+def test_range_reasons():
+    """Коды причин для значений вне диапазонов"""
+    dens, z, reason = calc_dryair_dens_arr([1100., 20., 20.], [1e5, 30e6, 1e5], errors='nan')
+    assert reason.tolist() == [ERR_T, ERR_P, ERR_OK]
+    assert np.isnan(dens[:2]).all() and np.isfinite(dens[2])
+    with pytest.raises(ValueError):
+        calc_dryair_dens_arr(1100., 1e5)
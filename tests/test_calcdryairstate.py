@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from libs import calcdryairstate
+from libs.calcdryairstate import calc_dryair_state, ERR_VISC
+from libs.calcdryairdens import calc_dryair_dens, ERR_OK, ERR_T
+from libs.memo import Memo
+
+
+def test_visc_range():
+    """Диапазон температуры для вязкости проверяется в функции calc_dryair_state"""
+    state = calc_dryair_state(700., 1e6)
+    assert np.isfinite(state.dvisc)
+    with pytest.raises(ValueError):
+        calc_dryair_state(700.5, 1e6)
+    state = calc_dryair_state(1000., 1e6, visc=False)
+    assert np.isnan(state.dvisc) and state.dens == pytest.approx(calc_dryair_dens(1000., 1e6)[0], rel=1e-14)
+    with pytest.raises(ValueError):
+        calc_dryair_state(1000.5, 1e6, visc=False)
+
+
+def test_errors_nan():
+    """При errors='nan' возвращаются коды причин, вязкость выше 700 С - NaN"""
+    state, reason = calc_dryair_state([20., 800., 1200.], 1e6, errors='nan')
+    assert reason.tolist() == [ERR_OK, ERR_VISC, ERR_T]
+    assert np.isfinite(state.dvisc[0]) and np.isnan(state.dvisc[1:]).all()
+    assert np.isfinite(state.h[:2]).all() and np.isnan(state.h[2])
+    state, reason = calc_dryair_state(800., 1e6, visc=False, errors='nan')
+    assert reason == ERR_OK and np.isfinite(state.cp)
+
+
+def test_memo_kwargs():
+    """Параметры visc и errors входят в ключ кэша"""
+    func = Memo().wrap(calc_dryair_state)
+    assert np.isfinite(func(20., 1e6).dvisc)
+    assert np.isnan(func(20., 1e6, visc=False).dvisc)
+
+
+def test_ideal_gas_cp():
+    """Отклонение cp0 от табличных значений для воздуха в идеально-газовом состоянии - не более 0.15%"""
+    calc_ideal_gas = getattr(calcdryairstate, '__calc_ideal_gas')
+    T = np.array([250., 300., 400., 500., 600., 700., 800., 900., 1000.])
+    cp_tab = np.array([1.003, 1.005, 1.013, 1.029, 1.051, 1.075, 1.099, 1.121, 1.142]) * 1e3
+    h, s, cp = calc_ideal_gas(T)
+    assert np.abs(cp / cp_tab - 1).max() < 1.5e-3
+    # Согласованность h0 и s0 с cp0, в том числе на границе диапазонов полиномов (1000 К)
+    T = np.array([990., 1010.])
+    h, s, cp = calc_ideal_gas(T)
+    cp_mean = calc_ideal_gas(np.linspace(990., 1010., 2001))[2].mean()
+    assert (h[1] - h[0]) / 20. == pytest.approx(cp_mean, rel=1e-6)
+    assert calc_ideal_gas(np.array([273.15]))[0][0] == 0.
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from libs.wsprops.hsdiag import HSDiag
+
+hs = HSDiag()
+solver = hs.hs_solver
+
+# Контрольные значения обратных уравнений (Supp-PHS12): h, кДж/кг; s, кДж/кг/К; p, МПа или T, К
+P1_HS = [(0.001, 0., 9.800980612e-4), (90., 0., 91.92954727), (1500., 3.4, 58.68294423)]
+P2_HS = [(2800., 6.5, 1.371012767), (2800., 9.5, 1.879743844e-3), (4100., 9.5, 1.024788997e-1),  # 2a
+         (2800., 6., 4.793911442), (3600., 6., 83.95519209), (3600., 7., 7.527161441),  # 2b
+         (2800., 5.1, 94.39202060), (2800., 5.8, 8.414574124), (3400., 5.8, 83.76903879)]  # 2c
+T4_HS = [(1800., 5.3, 346.8475498), (2400., 6., 425.1373305), (2500., 5.5, 522.5579013)]
+# Контрольные значения граничных уравнений (Supp-phs3): s, кДж/кг/К; h, кДж/кг
+H1_S = [(1., 308.5509647), (2., 700.6304472), (3., 1198.359754)]
+H2_S = [(7., 2723.729985), (8., 2599.047210), (9., 2511.861477),  # h''2ab
+        (5.5, 2687.693850), (5., 2451.623609), (4.5, 2144.360448)]  # h''2c3b
+HB13_S = [(3.7, 1632.525047), (3.6, 1593.027214), (3.5, 1566.104611)]
+# h, кДж/кг; s, кДж/кг/К; T, К
+TB23_HS = [(2600., 5.1, 713.5259364), (2700., 5.15, 768.5345532), (2800., 5.2, 817.6202120)]
+
+
+@pytest.mark.parametrize('method, table, scale', [(solver.p1_hs, P1_HS, 1e6), (solver.p2_hs, P2_HS, 1e6),
+                                                  (solver.Tsat_hs, T4_HS, 1.)])
+def test_backward_equations(method, table, scale):
+    """Обратные уравнения p(h, s) и T_sat(h, s): одна точка и массив"""
+    h, s, expected = (np.array(column) for column in zip(*table))
+    for k in range(len(table)):
+        assert method(h[k] * 1e3, s[k] * 1e3) == pytest.approx(expected[k] * scale, rel=1e-9)
+    assert method(h * 1e3, s * 1e3) == pytest.approx(expected * scale, rel=1e-9)
+
+
+@pytest.mark.parametrize('method, table', [(solver.h1_s, H1_S), (solver.h2_s, H2_S), (solver.hB13_s, HB13_S)])
+def test_boundary_equations(method, table):
+    """Граничные уравнения h(s): одна точка и массив"""
+    s, expected = (np.array(column) for column in zip(*table))
+    for k in range(len(table)):
+        assert method(s[k] * 1e3) == pytest.approx(expected[k] * 1e3, rel=1e-9)
+    assert method(s * 1e3) == pytest.approx(expected * 1e3, rel=1e-9)
+
+
+def test_boundary_T_B23():
+    """Граничное уравнение T_B23(h, s)"""
+    h, s, expected = (np.array(column) for column in zip(*TB23_HS))
+    assert solver.TB23_hs(float(h[0]) * 1e3, float(s[0]) * 1e3) == pytest.approx(expected[0], rel=1e-9)
+    assert solver.TB23_hs(h * 1e3, s * 1e3) == pytest.approx(expected, rel=1e-9)
+
+
+def _points():
+    """Точки областей 1, 2 и 4 (T, p и индекс области в HSDiag.regions)"""
+    rng = np.random.default_rng(0)
+    r1, r2, r4 = hs.region1, hs.region2, hs.region4
+    T = rng.uniform(273.15, 623.15, 300)
+    p = np.exp(rng.uniform(np.log(1e3), np.log(100e6), 300))
+    m = r1.Tp_mask(T, p)
+    props1 = r1.props_Tp(T[m], p[m])
+    T = rng.uniform(273.15, 1073.15, 300)
+    p = np.exp(rng.uniform(np.log(700.), np.log(100e6), 300))
+    m = r2.Tp_mask(T, p)
+    props2 = r2.props_Tp(T[m], p[m])
+    props4 = r4.props_Tx(rng.uniform(273.16, 623.15, 200), rng.uniform(0., 1., 200))
+    return [(0, props1), (1, props2), (2, props4)]
+
+
+@pytest.mark.parametrize('num, props', _points())
+def test_round_trip(num, props):
+    """Расчёт по h, s (exact=True) восстанавливает T и p; одна точка и массив дают одну область и одно решение"""
+    h, s = props['h'], props['s']
+    nums, T, p = solver.solve(h, s, exact=True)
+    assert np.all(nums == num)
+    assert T == pytest.approx(props['T'], abs=1e-9)
+    assert p == pytest.approx(props['p'], rel=1e-8)
+    for k in range(0, h.size, 7):
+        num_k, T_k, p_k = solver.solve_point(float(h[k]), float(s[k]), exact=True)
+        assert num_k == num and T_k == pytest.approx(T[k], abs=1e-9) and p_k == pytest.approx(p[k], rel=1e-8)
+        assert hs.props_hs(float(h[k]), float(s[k]), exact=True)['T'] == pytest.approx(T[k], abs=1e-9)
+
+
+@pytest.mark.parametrize('num, props', _points())
+def test_backward(num, props):
+    """Расчёт по h, s по обратным уравнениям (exact=False): область и T, p с погрешностью обратных уравнений"""
+    h, s = props['h'], props['s']
+    nums, T, p = solver.solve(h, s)
+    assert np.all(nums == num)
+    assert T == pytest.approx(props['T'], abs=solver.T_tol_backward)
+    assert p == pytest.approx(props['p'], rel=solver.p_rtol_backward)
+    for k in range(0, h.size, 7):
+        num_k, T_k, p_k = solver.solve_point(float(h[k]), float(s[k]))
+        assert num_k == num and T_k == pytest.approx(T[k], rel=1e-12) and p_k == pytest.approx(p[k], rel=1e-9)
+        assert hs.props_hs(float(h[k]), float(s[k]))['T'] == pytest.approx(T[k], rel=1e-12)
+
+
+@pytest.mark.parametrize('exact', [False, True])
+def test_outside(exact):
+    """Точки вне областей 1, 2 и 4 (область 3, p > p_max в области 1, T < T_min)"""
+    h, s = np.array([1863.43e3, 1902.9e3, 1e5]), np.array([4.0543e3, 814., -1e3])
+    for k in range(h.size):
+        assert solver.solve_point(float(h[k]), float(s[k]), exact)[0] == -1
+    nums, T, p = solver.solve(h, s, exact)
+    assert np.all(nums == -1) and np.isnan(T).all()
+    with pytest.raises(ValueError):
+        hs.props_hs(1863.43e3, 4.0543e3, exact)
@@ -0,0 +1,37 @@
+"""
+Проверка построения изолиний I-d диаграммы
+"""
+
+import numpy as np
+from libs import idchart
+
+sample = getattr(idchart, '__sample')
+
+
+def test_sample_gap_separated():
+    """Линия, выходящая из области построения и возвращающаяся в неё, разделяется точкой (NaN, NaN)"""
+    def func(s):
+        return s, s ** 2, np.abs(s - 0.5) > 0.1
+
+    d, I = sample(func, 0., 1., (0., 1., 0., 1.), 1e-3)
+    gaps = np.flatnonzero(np.isnan(d))
+    assert gaps.size == 1 and np.isnan(I[gaps[0]])
+    left, right = d[:gaps[0]], d[gaps[0] + 1:]
+    assert left.max() < 0.4 + 1e-3 and right.min() > 0.6 - 1e-3
+    assert np.all(np.diff(left) > 0) and np.all(np.diff(right) > 0)
+
+
+def test_sample_no_gap():
+    """Непрерывная линия внутри области построения не содержит разделителей"""
+    d, I = sample(lambda s: (s, s ** 2, s >= 0.), 0., 1., (0., 1., 0., 1.), 1e-3)
+    assert not np.isnan(d).any()
+    assert np.allclose(I, d ** 2)
+
+
+def test_chart_lines_inside():
+    """Все точки изолиний (кроме разделителей) лежат внутри диапазонов диаграммы"""
+    chart = idchart.calc_id_chart(d_range=(5., 12.))
+    for group in (chart.RH, chart.t, chart.t_wb, chart.dens, chart.I):
+        for line in group:
+            d = line.d[~np.isnan(line.d)]
+            assert np.all((5. - 1e-9 <= d) & (d <= 12. + 1e-9))
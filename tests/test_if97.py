@@ -0,0 +1,163 @@
+"""
+Проверка по контрольным значениям IAPWS-IF97 (http://www.iapws.org/relguide/IF97-Rev.pdf): расчёт одной точки
+(ScalarPoly) и массивов должны давать табличные значения
+"""
+import numpy as np
+import pytest
+
+from libs.wsprops.region1 import Region1
+from libs.wsprops.region2 import Region2
+from libs.wsprops.region3 import Region3
+from libs.wsprops.hsdiag import HSDiag
+from libs.wsprops.saturationcurve import SaturationCurve
+
+# T, К; p, МПа; v, м3/кг; h, кДж/кг; u, кДж/кг; s, кДж/кг/К; cp, кДж/кг/К; w, м/с
+REGION1 = [  # Table 5
+    (300., 3., 0.100215168e-2, 115.331273, 112.324818, 0.392294792, 4.17301218, 1507.73921),
+    (300., 80., 0.971180894e-3, 184.142828, 106.448356, 0.368563852, 4.01008987, 1634.69054),
+    (500., 3., 0.120241800e-2, 975.542239, 971.934985, 2.58041912, 4.65580682, 1240.71337),
+]
+REGION2 = [  # Table 15
+    (300., 0.0035, 39.4913866, 2549.91145, 2411.69160, 8.52238967, 1.91300162, 427.920172),
+    (700., 0.0035, 92.3015898, 3335.68375, 3012.62819, 10.1749996, 2.08141274, 644.289068),
+    (700., 30., 0.542946619e-2, 2631.49474, 2468.61076, 5.17540298, 10.3505092, 480.386523),
+]
+# p, МПа; h, кДж/кг или s, кДж/кг/К; T, К
+REGION1_T_PH = [(3., 500., 391.798509), (80., 500., 378.108626), (80., 1500., 611.041229)]  # Table 7
+REGION1_T_PS = [(3., 0.5, 307.842258), (80., 0.5, 309.979785), (80., 3., 565.899909)]  # Table 9
+REGION2_T_PH = [(0.001, 3000., 534.433241), (3., 3000., 575.373370), (3., 4000., 1010.77577),  # Table 24
+                (5., 3500., 801.299102), (5., 4000., 1015.31583), (25., 3500., 875.279054),
+                (40., 2700., 743.056411), (60., 2700., 791.137067), (60., 3200., 882.756860)]
+REGION2_T_PS = [(0.1, 7.5, 399.517097), (0.1, 8., 514.127081), (2.5, 8., 1039.84917),  # Table 29
+                (8., 6., 600.484040), (8., 7.5, 1064.95556), (90., 6., 1038.01126),
+                (20., 5.75, 697.992849), (80., 5.25, 854.011484), (80., 5.75, 949.017998)]
+# T, К; rho, кг/м3; p, МПа; h, кДж/кг; u, кДж/кг; s, кДж/кг/К; cp, кДж/кг/К; w, м/с
+REGION3 = [  # Table 33
+    (650., 500., 25.5837018, 1863.43019, 1812.26279, 4.05427273, 13.8935717, 502.005554),
+    (650., 200., 22.2930643, 2375.12401, 2263.65868, 4.85438792, 44.6579342, 383.444594),
+    (750., 500., 78.3095639, 2258.68845, 2102.06932, 4.46971906, 6.34165359, 760.696041),
+]
+REGION4_P_T = [(300., 0.353658941e-2), (500., 0.263889776e1), (600., 0.123443146e2)]  # Table 35
+REGION4_T_P = [(0.1, 372.755919), (1., 453.035632), (10., 584.149488)]  # Table 36
+
+NAMES = ('v', 'h', 'u', 's', 'cp', 'w')
+SCALES = (1., 1e3, 1e3, 1e3, 1e3, 1.)
+
+
+@pytest.mark.parametrize('region, table', [(Region1(), REGION1), (Region2(), REGION2)])
+def test_props_Tp(region, table):
+    """Свойства по T и p: одна точка и массив"""
+    T, p = (np.array(column) for column in list(zip(*table))[:2])
+    arr = region.props_Tp(T, p * 1e6)
+    for k, (T_k, p_k, *expected) in enumerate(table):
+        props = region.props_Tp(T_k, p_k * 1e6)
+        for name, scale, value in zip(NAMES, SCALES, expected):
+            assert type(props[name]) is float
+            assert props[name] == pytest.approx(value * scale, rel=1e-8)
+            assert arr[name][k] == pytest.approx(props[name], rel=1e-13)
+
+
+@pytest.mark.parametrize('region, table', [(Region1(), REGION1), (Region2(), REGION2)])
+def test_props_Tp_fields(region, table):
+    """Свойства по T и p для заданного списка свойств (fields): одна точка и массив совпадают с полным расчётом"""
+    T, p = (np.array(column) for column in list(zip(*table))[:2])
+    full = region.props_Tp(T, p * 1e6)
+    for fields in (('v',), ('h',), ('s', 'cp'), ('w', 'u')):
+        arr = region.props_Tp(T, p * 1e6, fields=fields)
+        assert set(arr) == {'T', 'p', *fields}
+        for k in range(len(table)):
+            point = region.props_Tp(float(T[k]), float(p[k]) * 1e6, fields=fields)
+            for name in fields:
+                assert type(point[name]) is float
+                assert point[name] == pytest.approx(full[name][k], rel=1e-13)
+                assert arr[name][k] == pytest.approx(full[name][k], rel=1e-13)
+
+
+@pytest.mark.parametrize('method, table, scale', [
+    (Region1().T_ph, REGION1_T_PH, 1e3), (Region1().T_ps, REGION1_T_PS, 1e3),
+    (Region2().T_ph, REGION2_T_PH, 1e3), (Region2().T_ps, REGION2_T_PS, 1e3),
+])
+def test_backward(method, table, scale):
+    """Обратные уравнения T(p, h) и T(p, s): одна точка и массив"""
+    p, x, T = (np.array(column) for column in zip(*table))
+    arr = method(p * 1e6, x * scale)
+    for k in range(len(table)):
+        assert method(p[k] * 1e6, x[k] * scale) == pytest.approx(T[k], rel=1e-8)
+    assert arr == pytest.approx(T, rel=1e-8)
+
+
+def test_saturation():
+    """Линия насыщения p(T) и T(p)"""
+    sc = SaturationCurve()
+    for T, p in REGION4_P_T:
+        assert sc.p_T(T) == pytest.approx(p * 1e6, rel=1e-8)
+    for p, T in REGION4_T_P:
+        assert sc.T_p(p * 1e6) == pytest.approx(T, rel=1e-8)
+    T, p = (np.array(column) for column in zip(*REGION4_P_T))
+    assert sc.p_T(T) == pytest.approx(p * 1e6, rel=1e-8)
+
+
+def test_region3_props_Trho():
+    """Область 3: свойства по T и rho (Table 33) и плотность по T и p"""
+    region = Region3()
+    T, rho = (np.array(column) for column in list(zip(*REGION3))[:2])
+    arr = region.props_Trho(T, rho)
+    names = ('p', 'h', 'u', 's', 'cp', 'w')
+    scales = (1e6, 1e3, 1e3, 1e3, 1e3, 1.)
+    for k, (T_k, rho_k, *expected) in enumerate(REGION3):
+        props = region.props_Trho(T_k, rho_k)
+        for name, scale, value in zip(names, scales, expected):
+            assert type(props[name]) is float
+            assert props[name] == pytest.approx(value * scale, rel=1e-8)
+            assert arr[name][k] == pytest.approx(props[name], rel=1e-13)
+        assert region.props_Tp(T_k, props['p'])['v'] == pytest.approx(1 / rho_k, rel=1e-12)
+    assert region.rho_Tp(T, arr['p']) == pytest.approx(rho, rel=1e-12)
+
+
+def test_region3_point_matches_array():
+    """Область 3: расчёт одной точки по (T, p) над числами float совпадает с расчётом массива"""
+    region = Region3()
+    rng = np.random.default_rng(1)
+    p = np.concatenate([[22.0e6, 22.1e6, 25.5837018e6], rng.uniform(16.6e6, 100e6, 200)])
+    T = np.concatenate([[640., 647.2, 650.], rng.uniform(623.15, region.bound23.T_p(p[3:]))])
+    arr = region.props_Tp(T, p)
+    for k in range(T.size):
+        point = region.props_Tp(float(T[k]), float(p[k]))
+        for key, value in point.items():
+            assert type(value) is float
+            assert value == pytest.approx(arr[key][k], rel=1e-10)
+
+
+def test_region3_ph_ps():
+    """Область 3: расчёт по [p, h] и [p, s] (одна точка и массив), определение области"""
+    hs = HSDiag()
+    rng = np.random.default_rng(0)
+    T = np.concatenate([[650., 650., 750., 647.2], rng.uniform(623.15, 863.15, 400)])
+    p = np.concatenate([[25.5837018e6, 22.2930643e6, 78.3095639e6, 22.1e6], rng.uniform(16.6e6, 100e6, 400)])
+    m = hs.region3.Tp_mask(T, p)
+    T, p = T[m], p[m]
+    props = hs.region3.props_Tp(T, p)
+    for X in ('h', 's'):
+        inner = hs.classifier.classify(p, props[X], X) == 3
+        # Точки на изотерме 623,15 К могут быть отнесены к области 1 (приоритет на общей границе)
+        assert inner.sum() > 0.9 * T.size
+        arr = getattr(hs, 'props_p' + X)(p[inner], props[X][inner])
+        assert arr['T'] == pytest.approx(T[inner], rel=1e-12)
+        assert arr['v'] == pytest.approx(props['v'][inner], rel=1e-10)
+        for k in range(4):
+            point = getattr(hs, 'props_p' + X)(p[k], props[X][k])
+            assert hs.curReg is hs.region3
+            assert type(point['T']) is float
+            assert point['T'] == pytest.approx(T[k], rel=1e-12)
+
+
+def test_region3_wet():
+    """Точки между линиями кипящей воды и сухого насыщенного пара при T > 623,15 К вне областей"""
+    hs = HSDiag()
+    p = 20e6
+    T_s = hs.sc.T_p(p)
+    h_w = hs.region3.props_Tp(T_s - 1e-3, p)['h']
+    h_s = hs.region3.props_Tp(T_s + 1e-3, p)['h']
+    assert hs.classifier.classify(np.array([p]), np.array([(h_w + h_s) / 2]), 'h')[0] == -1
+    with pytest.raises(ValueError):
+        hs.props_ph(p, (h_w + h_s) / 2)
@@ -0,0 +1,139 @@
+import importlib
+import pickle
+import pkgutil
+import sqlite3
+
+import numpy as np
+import pytest
+
+from libs import wsprops
+from libs.memo import Memo, DiskCache, props_version
+
+
+def test_disk_cache_versions(tmp_path):
+    """Записи других версий не удаляются при открытии базы, не читаются и удаляются методом clear(stale=True)"""
+    path = tmp_path / 'props.sqlite3'
+    old = DiskCache(path, 'v1')
+    old.put(('f', 1.), 1.)
+    old.close()
+    new = DiskCache(path, 'v2')
+    assert new.get(('f', 1.)) == (False, None) and len(new) == 0
+    assert DiskCache(path, 'v1').get(('f', 1.)) == (True, 1.)
+    new.put(('f', 2.), 2.)
+    new.clear(stale=True)
+    assert DiskCache(path, 'v1').get(('f', 1.)) == (False, None)
+    assert new.get(('f', 2.)) == (True, 2.) and len(new) == 1
+    new.clear()
+    assert len(new) == 0
+
+
+def test_disk_cache_store(tmp_path):
+    """DiskCache как кэш второго уровня Memo: результат берётся с диска без повторного расчёта"""
+    calls = []
+
+    def func(x):
+        calls.append(x)
+        return {'x': np.array([x])}
+
+    path = tmp_path / 'props.sqlite3'
+    Memo(store=DiskCache(path, 'v1')).wrap(func)(1.)
+    memo = Memo(store=DiskCache(path, 'v1'))
+    value = memo.wrap(func)(1.)
+    assert calls == [1.] and value['x'][0] == 1. and memo.stats().store_hits == 1
+    # Повреждённая запись считается отсутствующей
+    con = sqlite3.connect(path)
+    con.execute('UPDATE props SET value = ?', (pickle.dumps(1.)[:5],))
+    con.commit()
+    con.close()
+    memo = Memo(store=DiskCache(path, 'v1'))
+    memo.wrap(func)(1.)
+    assert calls == [1., 1.] and memo.stats().store_hits == 0
+
+
+def test_lru():
+    """Вытеснение давно не использовавшихся записей"""
+    calls = []
+    memo = Memo(maxsize=2)
+    func = memo.wrap(lambda x: calls.append(x) or x, name='f')
+    func(1.), func(2.), func(1.), func(3.)  # вытесняется 2.
+    func(1.), func(2.)
+    assert calls == [1., 2., 3., 2.]
+    stats = memo.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.currsize) == (2, 4, 2, 2)
+
+
+def test_ttl():
+    """Записи с истёкшим временем жизни рассчитываются заново"""
+    now = [0.]
+    calls = []
+    memo = Memo(ttl=10., timer=lambda: now[0])
+    func = memo.wrap(lambda x: calls.append(x) or x, name='f')
+    func(1.)
+    now[0] = 9.9
+    func(1.)
+    now[0] = 10.
+    func(1.)
+    assert calls == [1., 1.] and memo.stats().expirations == 1
+
+
+def test_keys():
+    """Массивы и NaN не кэшируются; целые и float с одним значением - один ключ; kwargs входят в ключ"""
+    calls = []
+    memo = Memo()
+    func = memo.wrap(lambda x, p=1.: calls.append(x) or x * p, name='f')
+    func(np.array([1.])), func(np.array([1.])), func(float('nan')), func(float('nan'))
+    assert len(calls) == 4 and len(memo) == 0
+    func(2), func(2.), func(2., p=3.)
+    assert len(calls) == 6 and len(memo) == 2
+
+
+def test_keys_bool_kwargs():
+    """bool и число с тем же значением - разные ключи; именованный параметр не совпадает с позиционными"""
+    calls = []
+    memo = Memo()
+    func = memo.wrap(lambda *args, **kwargs: calls.append((args, kwargs)) or len(calls), name='f')
+    assert func(True) != func(1.)
+    assert func(1) == func(1.)
+    assert func(2., p=3.) != func(2., 'p', 3.)
+    assert func(2., p=3., q=1.) == func(2., q=1., p=3.)
+    assert len(calls) == 5 and len(memo) == 5
+
+
+def test_freeze():
+    """Результаты неизменяемые: словари - MappingProxyType, массивы - только для чтения"""
+    func = Memo().wrap(lambda x: {'v': np.array([x]), 't': (np.array([x]), x)}, name='f')
+    value = func(1.)
+    with pytest.raises(TypeError):
+        value['v'] = 0
+    with pytest.raises(ValueError):
+        value['v'][0] = 0.
+    with pytest.raises(ValueError):
+        value['t'][0][0] = 0.
+    assert func(1.) is value
+
+
+def test_exceptions_not_cached():
+    """Исключения не кэшируются, недопустимые параметры Memo - ValueError"""
+    calls = []
+
+    def func(x):
+        calls.append(x)
+        raise ValueError(x)
+
+    func = Memo().wrap(func)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            func(1.)
+    assert calls == [1., 1.]
+    with pytest.raises(ValueError):
+        Memo(maxsize=0)
+    with pytest.raises(ValueError):
+        Memo(ttl=0.)
+
+
+def test_props_version_modules():
+    """В версию расчётных модулей входят все модули пакета wsprops"""
+    version = props_version()
+    for info in pkgutil.iter_modules(wsprops.__path__):
+        module = importlib.import_module(f'{wsprops.__name__}.{info.name}')
+        assert f'{info.name}={module.__version__}' in version.split(';')
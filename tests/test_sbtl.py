@@ -0,0 +1,126 @@
+"""
+Проверка табличного расчёта (SBTL): отклонение от IF97, непрерывность производных сплайна на границах
+ячеек, сохранение и загрузка таблиц, повторное использование таблиц, ускорение по сравнению с IF97
+"""
+
+import os
+import timeit
+import numpy as np
+import pytest
+from libs.wsprops import HSDiag
+from libs.wsprops.sbtl import SBTL, _from_grid
+
+# Допустимые отклонения, указанные в описании класса SBTL
+DEV_LIMITS = {'T': 2e-5, 'h': 2e-5, 's': 2e-5, 'u': 2e-5, 'v': 2e-5, 'cp': 2e-4, 'cv': 2e-4, 'w': 2e-4}
+
+
+@pytest.fixture(scope='module')
+def hs():
+    return HSDiag()
+
+
+@pytest.fixture(scope='module')
+def sbtl(hs):
+    return SBTL(hs)
+
+
+def test_max_dev(sbtl):
+    """Отклонение в центрах ячеек, определённое при построении таблиц, не превышает заявленного"""
+    for name, dev in sbtl.max_dev.items():
+        for field, value in dev.items():
+            assert value <= DEV_LIMITS[field.split('_')[0]], (name, field, value)
+
+
+def test_random_points_Tp(hs, sbtl):
+    """Отклонение от IF97 в случайных точках областей 1 и 2 по (T, p)"""
+    rng = np.random.default_rng(1)
+    p = np.exp(rng.uniform(np.log(sbtl.p_min), np.log(sbtl.p_max), 20000))
+    T = rng.uniform(273.15, 1073.15, p.size)
+    keep = hs.region1.Tp_mask(T, p) | hs.region2.Tp_mask(T, p)
+    T, p = T[keep], p[keep]
+    exact, approx = hs.props_Tp(T, p), sbtl.props_Tp(T, p)
+    for field in ('h', 's', 'u'):
+        assert np.max(np.abs(approx[field] - exact[field])) <= DEV_LIMITS[field] * np.abs(exact[field]).max()
+    for field in ('v', 'cp', 'cv', 'w'):
+        assert np.max(np.abs(approx[field] / exact[field] - 1)) <= DEV_LIMITS[field]
+    assert np.array_equal(approx['x'], exact['x'])
+
+
+def test_random_points_ph(hs, sbtl):
+    """Температура по (p, h) согласована с прямыми уравнениями IF97"""
+    rng = np.random.default_rng(2)
+    p = np.exp(rng.uniform(np.log(sbtl.p_min), np.log(sbtl.p_max), 5000))
+    T = rng.uniform(273.15, 1073.15, p.size)
+    keep = hs.region1.Tp_mask(T, p) | hs.region2.Tp_mask(T, p)
+    T, p = T[keep], p[keep]
+    h = hs.props_Tp(T, p)['h']
+    assert np.max(np.abs(sbtl.props_ph(p, h)['T'] / T - 1)) <= DEV_LIMITS['T']
+
+
+def test_scalar_matches_array(sbtl):
+    """Расчёт одной точки совпадает с расчётом массива"""
+    T, p = np.array([300., 500., 700.]), np.array([1e5, 5e6, 30e6])
+    arr = sbtl.props_Tp(T, p)
+    for k in range(T.size):
+        point = sbtl.props_Tp(float(T[k]), float(p[k]))
+        for key, value in point.items():
+            assert value == pytest.approx(arr[key][k], rel=1e-12)
+
+
+def test_derivative_continuity(sbtl):
+    """Первая производная интерполянта непрерывна на линиях сетки (бикубический сплайн)"""
+    meta, ny, eps = sbtl.meta['Tp1a'], sbtl.ny, 1e-5
+    x = np.full(4, (meta['x0'] + meta['x1']) / 2)
+    for k in (10, 50, 90):
+        g = np.array([k - 2 * eps, k - eps, k + eps, k + 2 * eps]) / (ny - 1)
+        values = sbtl._SBTL__interp2('Tp1a', x, _from_grid(g, meta['side']))
+        left, right = values[1] - values[0], values[3] - values[2]
+        assert np.allclose(left, right, rtol=1e-3, atol=1e-9 * np.abs(values[0]).max())
+
+
+def test_save_load(hs, sbtl, tmp_path):
+    """Таблицы, сохранённые в каталог, открываются без пересчёта; временные файлы не остаются"""
+    sbtl.save(tmp_path)
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+    loaded = SBTL(hs, tmp_path)
+    assert isinstance(loaded.tables['Tp1a'], np.memmap)
+    T, p = np.array([300., 700.]), np.array([1e6, 1e6])
+    for key, value in sbtl.props_Tp(T, p).items():
+        assert np.array_equal(loaded.props_Tp(T, p)[key], value)
+
+
+def test_built_once(hs, sbtl):
+    """Таблицы, рассчитанные без каталога, используются всеми объектами с тем же размером сетки"""
+    other = SBTL(hs)
+    assert other.tables['Tp1a'] is sbtl.tables['Tp1a']
+    assert HSDiag(sbtl=True).sbtl.tables['ph2b'] is sbtl.tables['ph2b']
+
+
+def _best(func, number):
+    """Наименьшее время одного вызова из пяти повторов"""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number
+
+
+@pytest.mark.parametrize('mode', ['Tp', 'ph'])
+def test_faster_arrays(hs, sbtl, mode):
+    """Расчёт массивов по таблицам быстрее расчёта по уравнениям IF97"""
+    rng = np.random.default_rng(3)
+    p = np.exp(rng.uniform(np.log(sbtl.p_min), np.log(sbtl.p_max), 50000))
+    T = rng.uniform(273.15, 1073.15, p.size)
+    keep = hs.region1.Tp_mask(T, p) | hs.region2.Tp_mask(T, p)
+    T, p = T[keep], p[keep]
+    if mode == 'Tp':
+        args = T, p
+    else:
+        args = p, hs.props_Tp(T, p)['h']
+    method = 'props_' + mode
+    assert _best(lambda: getattr(sbtl, method)(*args), 5) < _best(lambda: getattr(hs, method)(*args), 5)
+
+
+@pytest.mark.parametrize('mode', ['Tp', 'ph'])
+@pytest.mark.parametrize('T, p', [(400., 1e6), (800., 5e6)])
+def test_faster_point(hs, sbtl, mode, T, p):
+    """Расчёт одной точки по таблицам быстрее расчёта по уравнениям IF97 (области 1 и 2)"""
+    args = (T, p) if mode == 'Tp' else (p, hs.props_Tp(T, p)['h'])
+    method = 'props_' + mode
+    assert _best(lambda: getattr(sbtl, method)(*args), 2000) < _best(lambda: getattr(hs, method)(*args), 2000)
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from common.units_manager import UnitManager
+
+um = UnitManager()
+
+
+@pytest.mark.parametrize('category', ['pressure', 'temperature', 'flow', 'density', 'length', 'enthalpy',
+                                      'percent', 'mass_content'])
+def test_round_trip(category):
+    """to_si / from_si / convert - взаимно обратные преобразования (числа и массивы)"""
+    values = np.array([-40., 0., 1.5, 300.])
+    for unit_from in um.get_units(category):
+        assert um.from_si(um.to_si(values, unit_from, category), unit_from, category) == pytest.approx(values)
+        for unit_to in um.get_units(category):
+            if um.is_mass_flow(unit_from) != um.is_mass_flow(unit_to):
+                continue
+            converted = um.convert(values, unit_from, unit_to, category)
+            assert converted == pytest.approx(um.from_si(um.to_si(values, unit_from, category), unit_to, category))
+            assert um.convert(converted, unit_to, unit_from, category) == pytest.approx(values)
+            assert um.convert(1.5, unit_from, unit_to, category) == pytest.approx(converted[2])
+
+
+def test_temperature_offsets():
+    """Пересчёт температуры со смещением: °C - базовая единица"""
+    assert um.to_si(273.15, 'K', 'temperature') == pytest.approx(0.)
+    assert um.to_si(212., '°F', 'temperature') == pytest.approx(100.)
+    assert um.from_si(-40., '°F', 'temperature') == pytest.approx(-40.)
+    assert um.convert(32., '°F', 'K', 'temperature') == pytest.approx(273.15)
+    assert um.convert([0., 100.], 'K', '°F', 'temperature') == pytest.approx([-459.67, -279.67])
+
+
+def test_flow_kinds():
+    """Объёмный и массовый расходы в категории flow не пересчитываются друг в друга"""
+    assert um.convert(3600., 'м³/ч', 'л/с', 'flow') == pytest.approx(1000.)
+    assert um.convert(1., 'т/ч', 'кг/ч', 'flow') == pytest.approx(1000.)
+    with pytest.raises(ValueError):
+        um.convert(1., 'м³/ч', 'т/ч', 'flow')
+    with pytest.raises(ValueError):
+        um.convert(1., 'кг/с', 'л/с', 'flow')
+    with pytest.raises(ValueError):
+        um.convert(1., 'кг/с', 'т/ч', 'volume_flow')